@@ -0,0 +1,47 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# flake8: noqa
+# fmt: off
+
+"""index_event_create_time
+
+Revision ID: 7e2a9d4c1b58
+Revises: 9c4e1f7a2b63
+Create Date: 2026-10-19 09:21:47.103652
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7e2a9d4c1b58'
+down_revision = '9c4e1f7a2b63'
+branch_labels = None
+depends_on = None
+
+TABLES = (
+    'rsm_participants', 'rsm', 'rsi_event', 'rsi_cwm', 'rsi_clc', 'rsi_sds', 'rsi_dnp',
+    'cgw', 'osw', 'ssw', 'rdw',
+)
+
+
+def upgrade():
+    for table in TABLES:
+        op.create_index(op.f(f'ix_{table}_create_time'), table, ['create_time'], unique=False)
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(op.f(f'ix_{table}_create_time'), table_name=table)
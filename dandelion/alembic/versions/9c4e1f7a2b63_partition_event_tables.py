@@ -0,0 +1,72 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# flake8: noqa
+# fmt: off
+
+"""partition_event_tables
+
+Partition the event tables by day of create_time on MySQL, so that the
+retention drops whole partitions instead of deleting rows. Only run with
+`alembic -x partition=true upgrade head`, otherwise nothing is changed.
+Tables referenced by or referencing a foreign key cannot be partitioned,
+rsm, rsm_participants and rsi_event are purged row by row.
+
+Revision ID: 9c4e1f7a2b63
+Revises: 5d2f8e3b1c47
+Create Date: 2026-10-18 19:02:11.581204
+
+"""
+from datetime import date, timedelta
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision = '9c4e1f7a2b63'
+down_revision = '5d2f8e3b1c47'
+branch_labels = None
+depends_on = None
+
+TABLES = ('rsi_cwm', 'rsi_clc', 'rsi_sds', 'rsi_dnp', 'cgw', 'osw', 'ssw', 'rdw')
+
+
+def _enabled():
+    partition = context.get_x_argument(as_dictionary=True).get('partition', '')
+    return partition.lower() == 'true' and op.get_bind().dialect.name == 'mysql'
+
+
+def upgrade():
+    if not _enabled():
+        return
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    for table in TABLES:
+        # The partitioning column has to be part of the primary key
+        op.execute(
+            f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, create_time)"
+        )
+        op.execute(
+            f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS(create_time)) ("
+            f"PARTITION p{today:%Y%m%d} VALUES LESS THAN (TO_DAYS('{tomorrow}')), "
+            f"PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        )
+
+
+def downgrade():
+    if not _enabled():
+        return
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
@@ -31,6 +31,7 @@ from dandelion.api.api_v1.endpoints import (
     login,
     map_rsus,
     maps,
+    metrics,
     mngs,
     osw,
     provinces,
@@ -119,3 +120,5 @@ api_router.include_router(
 )
 api_router.include_router(services.router, prefix="/services", tags=["Service"])
 api_router.include_router(service_types.router, prefix="/service_types", tags=["Service"])
+
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
@@ -27,11 +27,27 @@ from dandelion.api import deps
 from dandelion.api.deps import OpenV2XHTTPException as HTTPException, error_handle
 from dandelion.crud import utils
 from dandelion.mqtt.service.rsu.rsu_algo import algo_publish
-from dandelion.util import ALGO_CONFIG, DEFAULT_VERSION_DATA, get_all_algo_config
+from dandelion.util import (
+    ALGO_CONFIG,
+    ALGO_CONFIG_DIGEST,
+    DEFAULT_VERSION_DATA,
+    get_all_algo_config,
+)
 
 router = APIRouter()
 LOG: LoggerAdapter = log.getLogger(__name__)
 
+# Tables the algos and their endpoint configs are read from
+ALGO_TABLES = (
+    "algo_module",
+    "algo_name",
+    "algo_version",
+    "endpoint",
+    "endpoint_metadata",
+    "service",
+    "service_type",
+)
+
 
 @router.post(
     "/version",
@@ -136,8 +152,9 @@ def get_all(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag(*ALGO_TABLES, salt=ALGO_CONFIG_DIGEST)),
 ) -> schemas.AlgoNames:
-    _, data = crud.algo_name.get_multi_by_algo_name(db, algo=algo)
+    _, _, data = crud.algo_name.get_multi_by_algo_name(db, algo=algo)
     response_data = get_all_algo_config(data=data)
     data_list = (
         list(response_data.values())
@@ -165,8 +182,9 @@ def get_all_version(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag(*ALGO_TABLES, salt=ALGO_CONFIG_DIGEST)),
 ) -> schemas.AlgoVersions:
-    total, data = crud.algo_version.get_multi_by_version(db, version=version)
+    total, _, data = crud.algo_version.get_multi_by_version(db, version=version)
     data_list = [obj_in.to_all_dict() for obj_in in data]
     data_list.extend(DEFAULT_VERSION_DATA)
     if version:
@@ -223,6 +241,7 @@ Get module algo.
 def get_all_module_algo(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("algo_module", "algo_name", salt=ALGO_CONFIG_DIGEST)),
 ) -> List[Dict[str, Any]]:
     data = crud.algo_module.get_all(db)
     response_data = {}
@@ -46,6 +46,7 @@ def get_all(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("area")),
 ) -> List[schemas.Area]:
     areas = crud.area.get_multi_by_city_code(db, city_code)
     return [area.to_dict() for area in areas if area.intersections]
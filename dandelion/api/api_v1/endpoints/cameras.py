@@ -125,7 +125,7 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.Cameras:
     skip = page_size * (page_num - 1)
-    total, data = crud.camera.get_multi_with_total(
+    total, exact, data = crud.camera.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
@@ -133,7 +133,9 @@ def get_all(
         name=name,
         rsu_id=rsu_id,
     )
-    return schemas.Cameras(total=total, data=[camera.to_dict() for camera in data])
+    return schemas.Cameras(
+        total=total, totalExact=exact, data=[camera.to_dict() for camera in data]
+    )
 
 
 @router.patch(
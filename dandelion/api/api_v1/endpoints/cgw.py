@@ -42,11 +42,21 @@ def get_all(
     cgw_level: Optional[int] = Query(None, alias="cgwLevel", description="CWG Level"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.CGWs:
     skip = page_size * (page_num - 1)
-    total, data = crud.cgw.get_multi_with_total(
-        db, skip=skip, limit=page_size, cgw_level=cgw_level
+    total, exact, data = crud.cgw.get_multi_with_total(
+        db, skip=skip, limit=page_size, after=deps.decode_cursor(after), cgw_level=cgw_level
+    )
+    return schemas.CGWs(
+        total=total,
+        totalExact=exact,
+        data=[cgw.to_all_dict() for cgw in data],
+        nextCursor=deps.next_cursor(data, page_size),
     )
-    return schemas.CGWs(total=total, data=[cgw.to_all_dict() for cgw in data])
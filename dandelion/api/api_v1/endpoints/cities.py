@@ -46,6 +46,7 @@ def get_all(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("city")),
 ) -> List[schemas.City]:
     cities = crud.city.get_multi_by_province_code(db, province_code)
     return [city for city in cities]
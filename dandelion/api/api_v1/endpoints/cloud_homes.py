@@ -48,8 +48,8 @@ def online_rate(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.OnlineRate:
     rsu_online_rate = {
-        "online": crud.rsu.get_multi_with_total(db, online_status=True)[0],
-        "offline": crud.rsu.get_multi_with_total(db, online_status=False)[0],
+        "online": crud.rsu.get_multi_with_total(db, online_status=True, profile=None)[0],
+        "offline": crud.rsu.get_multi_with_total(db, online_status=False, profile=None)[0],
         "notRegister": crud.rsu_tmp.get_multi_with_total(db)[0],
     }
     # temporarily unavailable data
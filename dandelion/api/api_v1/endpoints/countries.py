@@ -15,15 +15,15 @@
 from __future__ import annotations
 
 from logging import LoggerAdapter
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
 from dandelion.api import deps
-from dandelion.crud.utils import pca_data
+from dandelion.crud.utils import PCD_TABLES, pca_data
 
 router = APIRouter()
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -43,13 +43,22 @@ Get all countries.
     },
 )
 def get_all(
+    request: Request,
+    response: Response,
     cascade: Optional[bool] = Query(
         None, alias="cascade", description="Cascade to list all countries."
     ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
-) -> List[schemas.Country]:
-    countries = crud.country.get_multi(db)
+    etag: None = Depends(deps.etag(*PCD_TABLES)),
+) -> Any:
     if cascade:
-        return pca_data(db)
+        # Served as encoded once, with the ETag set on `response` by deps.etag
+        pcd = pca_data(db)
+        headers = {**response.headers, "Vary": "Accept-Encoding"}
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=pcd.gzip, media_type="application/json", headers=headers)
+        return Response(content=pcd.data, media_type="application/json", headers=headers)
+    countries = crud.country.get_multi(db)
     return [country.to_dict() for country in countries]
@@ -57,10 +57,12 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.EdgeSites:
     skip = page_size * (page_num - 1)
-    total, data = crud.edge_site.get_multi_with_total(
+    total, exact, data = crud.edge_site.get_multi_with_total(
         db, skip=skip, limit=page_size, name=name, area_code=area_code
     )
-    return schemas.EdgeSites(total=total, data=[node.to_all_dict() for node in data])
+    return schemas.EdgeSites(
+        total=total, totalExact=exact, data=[node.to_all_dict() for node in data]
+    )
 
 
 @router.post(
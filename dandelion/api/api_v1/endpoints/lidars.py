@@ -125,7 +125,7 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.Lidars:
     skip = page_size * (page_num - 1)
-    total, data = crud.lidar.get_multi_with_total(
+    total, exact, data = crud.lidar.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
@@ -133,7 +133,7 @@ def get_all(
         name=name,
         rsu_id=rsu_id,
     )
-    return schemas.Lidars(total=total, data=[lidar.to_dict() for lidar in data])
+    return schemas.Lidars(total=total, totalExact=exact, data=[lidar.to_dict() for lidar in data])
 
 
 @router.patch(
@@ -119,5 +119,11 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.MapRSUs:
     skip = page_size * (page_num - 1)
-    total, data = crud.map_rsu.get_multi_with_total(db, skip=skip, limit=page_size, map_id=map_id)
-    return schemas.MapRSUs(total=total, data=[map_rsu.to_dict() for map_rsu in data])
+    total, exact, data = crud.map_rsu.get_multi_with_total(
+        db, skip=skip, limit=page_size, map_id=map_id
+    )
+    return schemas.MapRSUs(
+        total=total,
+        totalExact=exact,
+        data=[map_rsu.to_dict() for map_rsu in data],
+    )
@@ -23,6 +23,7 @@ from fastapi import APIRouter, Depends, Query, UploadFile, status
 from fastapi.responses import FileResponse
 from oslo_log import log
 from sqlalchemy import exc as sql_exc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from dandelion import constants, crud, models, schemas
@@ -45,12 +46,17 @@ Get a Map.
         **deps.RESPONSE_ERROR,
     },
 )
-def get(
+async def get(
     map_id: int,
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_async_current_user),
+    etag: None = Depends(deps.etag("map", "map_rsu")),
 ) -> schemas.Map:
+    return await db.run_sync(_get, map_id)
+
+
+def _get(db: Session, map_id: int) -> Dict[str, Any]:
     map_in_db = deps.crud_get(db=db, obj_id=map_id, crud_model=crud.map, detail="Map")
     return map_in_db.to_dict()
 
@@ -68,18 +74,22 @@ Get all Maps.
         **deps.RESPONSE_ERROR,
     },
 )
-def get_all(
+async def get_all(
     name: Optional[str] = Query(
         None, alias="name", description="Filter by map name. Fuzzy prefix query is supported"
     ),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_async_current_user),
 ) -> schemas.Maps:
     skip = page_size * (page_num - 1)
-    total, data = crud.map.get_multi_with_total(db, skip=skip, limit=page_size, name=name)
-    return schemas.Maps(total=total, data=[map.to_dict() for map in data])
+    return await db.run_sync(_get_all, skip=skip, limit=page_size, name=name)
+
+
+def _get_all(db: Session, **filters: Any) -> schemas.Maps:
+    total, exact, data = crud.map.get_multi_with_total(db, **filters)
+    return schemas.Maps(total=total, totalExact=exact, data=[map.to_dict() for map in data])
 
 
 @router.patch(
@@ -0,0 +1,44 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import os
+
+from fastapi import APIRouter, Depends, status
+
+from dandelion import models, schemas
+from dandelion.api import deps
+from dandelion.core import metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=schemas.Metrics,
+    status_code=status.HTTP_200_OK,
+    description="""
+Get the runtime metrics of the current worker process.
+""",
+    responses={
+        status.HTTP_200_OK: {"model": schemas.Metrics, "description": "OK"},
+        **deps.RESPONSE_ERROR,
+    },
+)
+def get(
+    current_user: models.User = Depends(deps.get_current_user),
+) -> schemas.Metrics:
+    return schemas.Metrics(pid=os.getpid(), metrics=metrics.snapshot())
@@ -56,10 +56,10 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.MNGs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu.get_multi_with_total(
-        db, skip=skip, limit=page_size, rsu_name=rsu_name, rsu_esn=rsu_esn
+    total, exact, data = crud.rsu.get_multi_with_total(
+        db, skip=skip, limit=page_size, rsu_name=rsu_name, rsu_esn=rsu_esn, profile="mng"
     )
-    return schemas.MNGs(total=total, data=[rsu.mng.all_dict() for rsu in data])
+    return schemas.MNGs(total=total, totalExact=exact, data=[rsu.mng.all_dict() for rsu in data])
 
 
 @router.put(
@@ -46,6 +46,7 @@ def get_all(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("province")),
 ) -> List[schemas.Province]:
     provinces = crud.province.get_multi_by_country_code(db, country_code)
     return [province for province in provinces]
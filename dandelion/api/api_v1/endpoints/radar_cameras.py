@@ -126,7 +126,7 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RadarCameras:
     skip = page_size * (page_num - 1)
-    total, data = crud.radar_camera.get_multi_with_total(
+    total, exact, data = crud.radar_camera.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
@@ -135,7 +135,9 @@ def get_all(
         rsu_id=rsu_id,
     )
     return schemas.RadarCameras(
-        total=total, data=[radar_camera.to_all_dict() for radar_camera in data]
+        total=total,
+        totalExact=exact,
+        data=[radar_camera.to_all_dict() for radar_camera in data],
     )
 
 
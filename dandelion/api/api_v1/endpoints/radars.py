@@ -125,7 +125,7 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.Radars:
     skip = page_size * (page_num - 1)
-    total, data = crud.radar.get_multi_with_total(
+    total, exact, data = crud.radar.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
@@ -133,7 +133,7 @@ def get_all(
         name=name,
         rsu_id=rsu_id,
     )
-    return schemas.Radars(total=total, data=[radar.to_dict() for radar in data])
+    return schemas.Radars(total=total, totalExact=exact, data=[radar.to_dict() for radar in data])
 
 
 @router.patch(
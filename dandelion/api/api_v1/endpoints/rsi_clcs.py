@@ -14,18 +14,55 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
-from dandelion.api import deps
-from dandelion.schemas.utils import Sort
+from dandelion.api import deps, streaming
+from dandelion.schemas.utils import ExportFormat, Sort
 
 router = APIRouter()
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export RSI CLCs",
+    description="""
+Export RSI CLCs created within a time range, streamed as NDJSON or CSV.
+""",
+    responses={**streaming.RESPONSE_EXPORT, **deps.RESPONSE_ERROR},
+)
+def export(
+    info: Optional[int] = Query(None, alias="info", description="UseCase type"),
+    start_time: Optional[datetime] = Query(
+        None, alias="startTime", description="Filter by create time from, included"
+    ),
+    end_time: Optional[datetime] = Query(
+        None, alias="endTime", description="Filter by create time to, excluded"
+    ),
+    sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias="format", description="Export format(ndjson/csv)"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    rows = crud.rsi_clc.export(
+        db,
+        sort=sort_dir,
+        start_time=start_time,
+        end_time=end_time,
+        info=info,
+    )
+    return streaming.stream((clc.to_all_dict() for clc in rows), export_format, "rsi_clcs")
+
+
 @router.get(
     "",
     response_model=schemas.RSICLCs,
@@ -44,15 +81,26 @@ def get_all(
     info: Optional[int] = Query(None, alias="info", description="UseCase type"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSICLCs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsi_clc.get_multi_with_total(
+    total, exact, data = crud.rsi_clc.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
+        after=deps.decode_cursor(after),
         sort=sort_dir,
         info=info,
     )
-    return schemas.RSICLCs(total=total, data=[clc.to_all_dict() for clc in data])
+    return schemas.RSICLCs(
+        total=total,
+        totalExact=exact,
+        data=[clc.to_all_dict() for clc in data],
+        nextCursor=deps.next_cursor(data, page_size),
+    )
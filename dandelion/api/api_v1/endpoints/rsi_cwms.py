@@ -14,18 +14,59 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
-from dandelion.api import deps
-from dandelion.schemas.utils import Sort
+from dandelion.api import deps, streaming
+from dandelion.schemas.utils import ExportFormat, Sort
 
 router = APIRouter()
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export RSI CWMs",
+    description="""
+Export RSI CWMs created within a time range, streamed as NDJSON or CSV.
+""",
+    responses={**streaming.RESPONSE_EXPORT, **deps.RESPONSE_ERROR},
+)
+def export(
+    event_type: Optional[int] = Query(None, alias="eventType", description="Event Type"),
+    collision_type: Optional[int] = Query(
+        None, alias="collisionType", description="Collision Type"
+    ),
+    start_time: Optional[datetime] = Query(
+        None, alias="startTime", description="Filter by create time from, included"
+    ),
+    end_time: Optional[datetime] = Query(
+        None, alias="endTime", description="Filter by create time to, excluded"
+    ),
+    sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias="format", description="Export format(ndjson/csv)"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    rows = crud.rsi_cwm.export(
+        db,
+        sort=sort_dir,
+        start_time=start_time,
+        end_time=end_time,
+        event_type=event_type,
+        collision_type=collision_type,
+    )
+    return streaming.stream((cwm.to_all_dict() for cwm in rows), export_format, "rsi_cwms")
+
+
 @router.get(
     "",
     response_model=schemas.RSICWMs,
@@ -47,16 +88,27 @@ def get_all(
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSICWMs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsi_cwm.get_multi_with_total(
+    total, exact, data = crud.rsi_cwm.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
+        after=deps.decode_cursor(after),
         sort=sort_dir,
         event_type=event_type,
         collision_type=collision_type,
     )
-    return schemas.RSICWMs(total=total, data=[cwm.to_all_dict() for cwm in data])
+    return schemas.RSICWMs(
+        total=total,
+        totalExact=exact,
+        data=[cwm.to_all_dict() for cwm in data],
+        nextCursor=deps.next_cursor(data, page_size),
+    )
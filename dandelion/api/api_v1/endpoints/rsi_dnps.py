@@ -44,15 +44,26 @@ def get_all(
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSIDNPs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsi_dnp.get_multi_with_total(
+    total, exact, data = crud.rsi_dnp.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
+        after=deps.decode_cursor(after),
         sort=sort_dir,
         info=info,
     )
-    return schemas.RSIDNPs(total=total, data=[dnp.to_all_dict() for dnp in data])
+    return schemas.RSIDNPs(
+        total=total,
+        totalExact=exact,
+        data=[dnp.to_all_dict() for dnp in data],
+        nextCursor=deps.next_cursor(data, page_size),
+    )
@@ -14,21 +14,61 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from logging import LoggerAdapter
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from oslo_log import log
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
-from dandelion.api import deps
-from dandelion.schemas.utils import Sort
+from dandelion.api import deps, streaming
+from dandelion.schemas.utils import ExportFormat, Sort
 
 router = APIRouter()
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export RSI Events",
+    description="""
+Export RSI Events created within a time range, streamed as NDJSON or CSV.
+""",
+    responses={**streaming.RESPONSE_EXPORT, **deps.RESPONSE_ERROR},
+)
+def export(
+    event_type: Optional[int] = Query(None, alias="eventType", description="Filter by eventType"),
+    start_time: Optional[datetime] = Query(
+        None, alias="startTime", description="Filter by create time from, included"
+    ),
+    end_time: Optional[datetime] = Query(
+        None, alias="endTime", description="Filter by create time to, excluded"
+    ),
+    sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias="format", description="Export format(ndjson/csv)"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    rows = crud.rsi_event.export(
+        db,
+        sort=sort_dir,
+        start_time=start_time,
+        end_time=end_time,
+        event_type=event_type,
+    )
+    return streaming.stream(
+        (rsi_event.to_all_dict() for rsi_event in rows), export_format, "rsi_events"
+    )
+
+
 @router.get(
     "/{event_id}",
     response_model=schemas.RSIEvent,
@@ -41,12 +81,16 @@ Get a RSIEvent.
         **deps.RESPONSE_ERROR,
     },
 )
-def get(
+async def get(
     event_id: int,
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_async_current_user),
 ) -> schemas.RSIEvent:
+    return await db.run_sync(_get, event_id)
+
+
+def _get(db: Session, event_id: int) -> Dict[str, Any]:
     rsi_event_in_db = deps.crud_get(
         db=db, obj_id=event_id, crud_model=crud.rsi_event, detail="RSIEvent"
     )
@@ -71,20 +115,35 @@ Get all RSI Events.
         status.HTTP_404_NOT_FOUND: {"model": schemas.ErrorMessage, "description": "Not Found"},
     },
 )
-def get_all(
+async def get_all(
     event_type: Optional[int] = Query(None, alias="eventType", description="Filter by eventType"),
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_async_current_user),
 ) -> schemas.RSIEvents:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsi_event.get_multi_with_total(
-        db,
+    return await db.run_sync(
+        _get_all,
         skip=skip,
         limit=page_size,
+        after=deps.decode_cursor(after),
         sort=sort_dir,
         event_type=event_type,
     )
-    return schemas.RSIEvents(total=total, data=[rsi_event.to_all_dict() for rsi_event in data])
+
+
+def _get_all(db: Session, **filters: Any) -> schemas.RSIEvents:
+    total, exact, data = crud.rsi_event.get_multi_with_total(db, **filters)
+    return schemas.RSIEvents(
+        total=total,
+        totalExact=exact,
+        data=[rsi_event.to_all_dict() for rsi_event in data],
+        nextCursor=deps.next_cursor(data, filters["limit"]),
+    )
@@ -14,18 +14,57 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
-from dandelion.api import deps
-from dandelion.schemas.utils import Sort
+from dandelion.api import deps, streaming
+from dandelion.schemas.utils import ExportFormat, Sort
 
 router = APIRouter()
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export RSI SDSs",
+    description="""
+Export RSI SDSs created within a time range, streamed as NDJSON or CSV.
+""",
+    responses={**streaming.RESPONSE_EXPORT, **deps.RESPONSE_ERROR},
+)
+def export(
+    equipment_type: Optional[int] = Query(
+        None, alias="equipmentType", description="Equipment Type"
+    ),
+    start_time: Optional[datetime] = Query(
+        None, alias="startTime", description="Filter by create time from, included"
+    ),
+    end_time: Optional[datetime] = Query(
+        None, alias="endTime", description="Filter by create time to, excluded"
+    ),
+    sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias="format", description="Export format(ndjson/csv)"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    rows = crud.rsi_sds.export(
+        db,
+        sort=sort_dir,
+        start_time=start_time,
+        end_time=end_time,
+        equipment_type=equipment_type,
+    )
+    return streaming.stream((sds.to_all_dict() for sds in rows), export_format, "rsi_sdss")
+
+
 @router.get(
     "",
     response_model=schemas.RSISDSs,
@@ -46,15 +85,26 @@ def get_all(
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSISDSs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsi_sds.get_multi_with_total(
+    total, exact, data = crud.rsi_sds.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
+        after=deps.decode_cursor(after),
         sort=sort_dir,
         equipment_type=equipment_type,
     )
-    return schemas.RSISDSs(total=total, data=[sds.to_all_dict() for sds in data])
+    return schemas.RSISDSs(
+        total=total,
+        totalExact=exact,
+        data=[sds.to_all_dict() for sds in data],
+        nextCursor=deps.next_cursor(data, page_size),
+    )
@@ -14,21 +14,61 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from logging import LoggerAdapter
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from oslo_log import log
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
-from dandelion.api import deps
-from dandelion.schemas.utils import Sort
+from dandelion.api import deps, streaming
+from dandelion.schemas.utils import ExportFormat, Sort
 
 router = APIRouter()
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export RSMs",
+    description="""
+Export RSMs created within a time range, streamed as NDJSON or CSV.
+""",
+    responses={**streaming.RESPONSE_EXPORT, **deps.RESPONSE_ERROR},
+)
+def export(
+    ptc_type: Optional[str] = Query(None, alias="ptcType", description="Filter by ptcType"),
+    start_time: Optional[datetime] = Query(
+        None, alias="startTime", description="Filter by create time from, included"
+    ),
+    end_time: Optional[datetime] = Query(
+        None, alias="endTime", description="Filter by create time to, excluded"
+    ),
+    sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias="format", description="Export format(ndjson/csv)"
+    ),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    rows = crud.rsm_participant.export(
+        db,
+        sort=sort_dir,
+        start_time=start_time,
+        end_time=end_time,
+        ptc_type=ptc_type,
+    )
+    return streaming.stream(
+        (rsm_participant.to_dict() for rsm_participant in rows), export_format, "rsm_participants"
+    )
+
+
 @router.get(
     "",
     response_model=schemas.RSMParticipants,
@@ -42,18 +82,35 @@ Get all RSMs.
         **deps.RESPONSE_ERROR,
     },
 )
-def get_all(
+async def get_all(
     ptc_type: Optional[str] = Query(None, alias="ptcType", description="Filter by ptcType"),
     sort_dir: Sort = Query(Sort.desc, alias="sortDir", description="Sort by ID(asc/desc)"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_async_current_user),
 ) -> schemas.RSMParticipants:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsm_participant.get_multi_with_total(
-        db, skip=skip, limit=page_size, sort=sort_dir, ptc_type=ptc_type
+    return await db.run_sync(
+        _get_all,
+        skip=skip,
+        limit=page_size,
+        after=deps.decode_cursor(after),
+        sort=sort_dir,
+        ptc_type=ptc_type,
     )
+
+
+def _get_all(db: Session, **filters: Any) -> schemas.RSMParticipants:
+    total, exact, data = crud.rsm_participant.get_multi_with_total(db, **filters)
     return schemas.RSMParticipants(
-        total=total, data=[rsm_participant.to_dict() for rsm_participant in data]
+        total=total,
+        totalExact=exact,
+        data=[rsm_participant.to_dict() for rsm_participant in data],
+        nextCursor=deps.next_cursor(data, filters["limit"]),
     )
@@ -151,8 +151,14 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSUConfigs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu_config.get_multi_with_total(db, skip=skip, limit=page_size, name=name)
-    return schemas.RSUConfigs(total=total, data=[rsu_config.to_dict() for rsu_config in data])
+    total, exact, data = crud.rsu_config.get_multi_with_total(
+        db, skip=skip, limit=page_size, name=name
+    )
+    return schemas.RSUConfigs(
+        total=total,
+        totalExact=exact,
+        data=[rsu_config.to_dict() for rsu_config in data],
+    )
 
 
 @router.put(
@@ -132,8 +132,12 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSULogs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu_log.get_multi_with_total(db, skip=skip, limit=page_size)
-    return schemas.RSULogs(total=total, data=[rsu_log.to_all_dict() for rsu_log in data])
+    total, exact, data = crud.rsu_log.get_multi_with_total(db, skip=skip, limit=page_size)
+    return schemas.RSULogs(
+        total=total,
+        totalExact=exact,
+        data=[rsu_log.to_all_dict() for rsu_log in data],
+    )
 
 
 @router.put(
@@ -98,6 +98,7 @@ def get(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("rsu_model")),
 ) -> schemas.RSUModel:
     rsu_model_in_db = deps.crud_get(
         db=db,
@@ -134,12 +135,17 @@ def get_all(
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("rsu_model")),
 ) -> schemas.RSUModels:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu_model.get_multi_with_total(
+    total, exact, data = crud.rsu_model.get_multi_with_total(
         db, skip=skip, limit=page_size, name=name, manufacturer=manufacturer
     )
-    return schemas.RSUModels(total=total, data=[rsu_model.to_dict() for rsu_model in data])
+    return schemas.RSUModels(
+        total=total,
+        totalExact=exact,
+        data=[rsu_model.to_dict() for rsu_model in data],
+    )
 
 
 @router.put(
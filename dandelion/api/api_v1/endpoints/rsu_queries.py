@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 from logging import LoggerAdapter
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query, Response, status
 from oslo_log import log
@@ -112,10 +112,14 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSUQueries:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu_query.get_multi_with_total(
+    total, exact, data = crud.rsu_query.get_multi_with_total(
         db, skip=skip, limit=page_size, rsu_id=rsu_id
     )
-    return schemas.RSUQueries(total=total, data=[rsu_query.to_dict() for rsu_query in data])
+    return schemas.RSUQueries(
+        total=total,
+        totalExact=exact,
+        data=[rsu_query.to_dict() for rsu_query in data],
+    )
 
 
 @router.delete(
@@ -140,10 +144,26 @@ def delete(
         crud_model=crud.rsu_query,
         detail="RSU Query",
     )
+    crud.rsu_query.remove_multi(db, ids=[rsu_query_id])
+    return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
 
-    results = crud.rsu_query_result.get_multi_by_query_id(db, query_id=rsu_query_id)
-    for result in results:
-        crud.rsu_query_result_data.remove_by_result_id(db, result_id=result.id)
-        crud.rsu_query_result.remove(db, id=result.id)
-    crud.rsu_query.remove(db, id=rsu_query_id)
+
+@router.delete(
+    "",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="""
+Delete the selected RSU Queries, with their results, in one transaction.
+Ids of RSU Queries that do not exist are ignored.
+""",
+    responses=deps.RESPONSE_ERROR,
+    response_class=Response,
+    response_description="No Content",
+)
+def delete_multi(
+    *,
+    ids: List[int] = Query(..., alias="ids", min_items=1, description="RSU Query ids to delete"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Response:
+    crud.rsu_query.remove_multi(db, ids=ids)
     return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
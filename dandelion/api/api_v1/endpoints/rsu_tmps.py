@@ -52,10 +52,14 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSUTMPs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu_tmp.get_multi_with_total(
+    total, exact, data = crud.rsu_tmp.get_multi_with_total(
         db, skip=skip, limit=page_size, rsu_name=rsu_name, rsu_esn=rsu_esn
     )
-    return schemas.RSUTMPs(total=total, data=[rsu_tmp.to_dict() for rsu_tmp in data])
+    return schemas.RSUTMPs(
+        total=total,
+        totalExact=exact,
+        data=[rsu_tmp.to_dict() for rsu_tmp in data],
+    )
 
 
 @router.delete(
@@ -14,25 +14,47 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import math
+import time
 from logging import LoggerAdapter
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from oslo_log import log
 from redis import Redis
 from sqlalchemy import exc as sql_exc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from dandelion import crud, models, schemas
 from dandelion.api import deps
 from dandelion.api.deps import OpenV2XHTTPException as HTTPException, error_handle
+from dandelion.db import timeseries
 from dandelion.mqtt.service.rsu.rsu_info import rsu_info_publish
 from dandelion.util import Optional as Optional_util
 
 router = APIRouter()
 LOG: LoggerAdapter = log.getLogger(__name__)
 
+RUNNING_INFO_FIELDS = ["cpu", "mem", "disk", "net"]
+MAX_RUNNING_BUCKETS: int = 1000
+MAX_RUNNING_CHUNKS: int = 1000
+FLEET_CACHE_EXPIRE: int = 15
+FLEET_METRICS = dict(
+    cpu_uti="cpuUti",
+    cpu_load="cpuLoad",
+    mem_total="memTotal",
+    mem_used="memUsed",
+    net_rx="netRx",
+    net_tx="netTx",
+    disk_read="diskRead",
+    disk_write="diskWrite",
+)
+
 
 @router.post(
     "",
@@ -84,7 +106,7 @@ Get all RSUs.
         **deps.RESPONSE_ERROR,
     },
 )
-def get_all(
+async def get_all(
     rsu_name: Optional[str] = Query(
         None, alias="rsuName", description="Filter by rsuName. Fuzzy prefix query is supported"
     ),
@@ -98,12 +120,12 @@ def get_all(
     rsu_status: Optional[str] = Query(None, alias="rsuStatus", description="Filter by rsuStatus"),
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_async_current_user),
 ) -> schemas.RSUs:
     skip = page_size * (page_num - 1)
-    total, data = crud.rsu.get_multi_with_total(
-        db,
+    return await db.run_sync(
+        _get_all,
         skip=skip,
         limit=page_size,
         rsu_name=rsu_name,
@@ -112,7 +134,119 @@ def get_all(
         rsu_status=rsu_status,
         enabled=enabled,
     )
-    return schemas.RSUs(total=total, data=[rsu.to_all_dict() for rsu in data])
+
+
+def _get_all(db: Session, **filters: Any) -> schemas.RSUs:
+    total, exact, data = crud.rsu.get_multi_with_total(db, **filters)
+    return schemas.RSUs(total=total, totalExact=exact, data=[rsu.to_all_dict() for rsu in data])
+
+
+@router.get(
+    "/running/fleet",
+    response_model=schemas.RSUFleetRunning,
+    status_code=status.HTTP_200_OK,
+    summary="Fleet RSU Running Info",
+    description="""
+Get statistics of the running info over the RSUs matching the filters.
+
+Every RSU is averaged over the window from `start` to `end`, then the min, max,
+average, median and 95th percentile of these averages are computed for every
+metric, along with the RSUs far above the others. Results are cached for a few
+seconds.
+""",
+    responses={
+        status.HTTP_200_OK: {"model": schemas.RSUFleetRunning, "description": "OK"},
+        **deps.RESPONSE_ERROR,
+    },
+)
+def get_fleet_running(
+    rsu_name: Optional[str] = Query(
+        None, alias="rsuName", description="Filter by rsuName. Fuzzy prefix query is supported"
+    ),
+    rsu_esn: Optional[str] = Query(
+        None, alias="rsuEsn", description="Filter by rsuEsn. Fuzzy prefix query is supported"
+    ),
+    online_status: Optional[bool] = Query(
+        None, alias="onlineStatus", description="Filter by onlineStatus"
+    ),
+    enabled: Optional[bool] = Query(None, alias="enabled", description="Filter by enabled"),
+    rsu_status: Optional[str] = Query(None, alias="rsuStatus", description="Filter by rsuStatus"),
+    start: Optional[int] = Query(
+        None, alias="start", ge=0, description="Start timestamp, one hour ago by default"
+    ),
+    end: Optional[int] = Query(
+        None, alias="end", ge=0, description="End timestamp, now by default"
+    ),
+    outlier_limit: int = Query(
+        10, alias="outlierLimit", ge=0, le=100, description="Maximum outliers per metric"
+    ),
+    db: Session = Depends(deps.get_db),
+    redis_conn: Redis = Depends(deps.get_redis_conn),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> schemas.RSUFleetRunning:
+    params = dict(
+        rsu_name=rsu_name,
+        rsu_esn=rsu_esn,
+        online_status=online_status,
+        enabled=enabled,
+        rsu_status=rsu_status,
+        start=start,
+        end=end,
+        outlier_limit=outlier_limit,
+    )
+    cache_key = (
+        "RSU_FLEET_RUNNING_"
+        + hashlib.md5(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+    )
+    cached = redis_conn.get(cache_key)
+    if cached:
+        return schemas.RSUFleetRunning.parse_raw(cached)
+
+    now = int(time.time())
+    end = now if end is None else end
+    start = end - 60 * 60 if start is None else start
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start"
+        )
+    _, _, rsus = crud.rsu.get_multi_with_total(
+        db,
+        limit=-1,
+        rsu_name=rsu_name,
+        rsu_esn=rsu_esn,
+        online_status=online_status,
+        rsu_status=rsu_status,
+        enabled=enabled,
+        profile=None,
+    )
+    tier = timeseries.pick_tier(start, max(1, (end - start) // 10), now)
+    read_start, read_end = _read_window(tier, start, end, now)
+    averages = timeseries.fleet_averages(
+        redis_conn, tier, [rsu.rsu_esn for rsu in rsus], read_start, read_end
+    )
+    sampled = ~np.isnan(averages[:, 0])
+    sampled_rsus = [rsu for rsu, is_sampled in zip(rsus, sampled) if is_sampled]
+    averages = averages[sampled]
+
+    stats = {}
+    if len(sampled_rsus):
+        for column, metric in enumerate(timeseries.METRICS):
+            stat = timeseries.fleet_stats(averages[:, column], outlier_limit)
+            stat["outliers"] = [
+                schemas.FleetOutlier(
+                    id=sampled_rsus[index].id,
+                    rsuEsn=sampled_rsus[index].rsu_esn,
+                    rsuName=sampled_rsus[index].rsu_name,
+                    value=float(averages[index, column]),
+                )
+                for index in stat["outliers"]
+            ]
+            stats[FLEET_METRICS[metric]] = schemas.FleetStats(**stat)
+    fleet_running = schemas.RSUFleetRunning(
+        start=start, end=end, total=len(rsus), sampled=len(sampled_rsus), stats=stats
+    )
+    redis_conn.set(cache_key, fleet_running.json(by_alias=True), ex=FLEET_CACHE_EXPIRE)
+    return fleet_running
 
 
 @router.get(
@@ -127,32 +261,29 @@ Get a RSU.
         **deps.RESPONSE_ERROR,
     },
 )
-def get(
+async def get(
     rsu_id: int,
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     redis_conn: Redis = Depends(deps.get_redis_conn),
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: models.User = Depends(deps.get_async_current_user),
 ) -> schemas.RSUDetail:
+    result = await db.run_sync(_get, rsu_id)
+    key = f"RSU_RUNNING_INFO_{result['rsuEsn']}"
+    # Off the event loop, as the Redis client is blocking
+    values = await run_in_threadpool(redis_conn.hmget, key, RUNNING_INFO_FIELDS)
+    result["runningInfo"] = {
+        field: Optional_util.none(value).map(lambda v: json.loads(v)).orElse({})
+        for field, value in zip(RUNNING_INFO_FIELDS, values)
+    }
+    return result
+
+
+def _get(db: Session, rsu_id: int) -> Dict[str, Any]:
     rsu_in_db = deps.crud_get(db=db, obj_id=rsu_id, crud_model=crud.rsu, detail="RSU")
     result = rsu_in_db.to_info_dict()
     rsu_config_rsus: List[models.RSUConfigRSU] = result["config"]
     result["config"] = [rsu_config_rsu.to_config_dict() for rsu_config_rsu in rsu_config_rsus]
-    key = f"RSU_RUNNING_INFO_{rsu_in_db.rsu_esn}"
-    result["runningInfo"] = dict(
-        cpu=Optional_util.none(redis_conn.hget(key, "cpu"))
-        .map(lambda v: json.loads(v))
-        .orElse({}),
-        mem=Optional_util.none(redis_conn.hget(key, "mem"))
-        .map(lambda v: json.loads(v))
-        .orElse({}),
-        disk=Optional_util.none(redis_conn.hget(key, "disk"))
-        .map(lambda v: json.loads(v))
-        .orElse({}),
-        net=Optional_util.none(redis_conn.hget(key, "net"))
-        .map(lambda v: json.loads(v))
-        .orElse({}),
-    )
     return result
 
 
@@ -177,7 +308,7 @@ def update(
 ) -> schemas.RSU:
     rsu_in_db = deps.crud_get(db=db, obj_id=rsu_id, crud_model=crud.rsu, detail="RSU")
     try:
-        new_rsu_in_db = crud.rsu.update_with_location(db, db_obj=rsu_in_db, obj_in=rsu_in)
+        new_rsu_in_db = crud.rsu.update(db, db_obj=rsu_in_db, obj_in=rsu_in)
     except (sql_exc.DataError, sql_exc.IntegrityError) as ex:
         raise error_handle(ex, ["rsu_esn", "rsu_name"], [rsu_in.rsu_esn, rsu_in.rsu_name])
     rsu_info_publish()
@@ -201,12 +332,29 @@ def delete(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Response:
     deps.crud_get(db=db, obj_id=rsu_id, crud_model=crud.rsu, detail="RSU")
-    results = crud.rsu_query_result.get_multi_by_rsu_id(db, rsu_id=rsu_id)
-    for result in results:
-        crud.rsu_query_result_data.remove_by_result_id(db, result_id=result.id)
-        crud.rsu_query_result.remove(db, id=result.id)
-    crud.mng.remove_by_rsu_id(db, rsu_id=rsu_id)
-    crud.rsu.remove(db, id=rsu_id)
+    crud.rsu.remove_multi(db, ids=[rsu_id])
+    rsu_info_publish()
+    return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete(
+    "",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="""
+Delete the selected RSUs, with their query results and MNG, in one transaction.
+Ids of RSUs that do not exist are ignored.
+""",
+    responses=deps.RESPONSE_ERROR,
+    response_class=Response,
+    response_description="No Content",
+)
+def delete_multi(
+    *,
+    ids: List[int] = Query(..., alias="ids", min_items=1, description="RSU ids to delete"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Response:
+    crud.rsu.remove_multi(db, ids=ids)
     rsu_info_publish()
     return Response(content=None, status_code=status.HTTP_204_NO_CONTENT)
 
@@ -244,6 +392,11 @@ def get_location(
     status_code=status.HTTP_200_OK,
     description="""
 Get a RSU Running Info.
+
+Without `start`, the latest samples are returned. With `start`, the samples from
+`start` to `end` are grouped in buckets of `step` seconds, and the min, max,
+average and 95th percentile of every bucket are returned in `buckets`, the
+averages also in `cpu`, `mem`, `disk` and `net`.
 """,
     responses={
         status.HTTP_200_OK: {"model": schemas.RSURunning, "description": "OK"},
@@ -252,47 +405,96 @@ Get a RSU Running Info.
 )
 def get_running(
     rsu_id: int,
+    start: Optional[int] = Query(None, alias="start", ge=0, description="Start timestamp"),
+    end: Optional[int] = Query(
+        None, alias="end", ge=0, description="End timestamp, now by default"
+    ),
+    step: Optional[int] = Query(
+        None,
+        alias="step",
+        ge=1,
+        description="Seconds of every bucket, 1/100 of the window by default",
+    ),
     *,
     db: Session = Depends(deps.get_db),
     redis_conn: Redis = Depends(deps.get_redis_conn),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.RSURunning:
     rsu_in_db = deps.crud_get(db=db, obj_id=rsu_id, crud_model=crud.rsu, detail="RSU")
-    rsu_running = schemas.RSURunning()
-    rsu_running.cpu = []
-    for cpu in redis_conn.zrevrange(f"RSU_RUNNING_CPU_{rsu_in_db.rsu_esn}", start=0, end=6):
-        data = json.loads(cpu)
-        cpu_ = schemas.RunningCPU()
-        cpu_.time = data.get("time")
-        cpu_.uti = data.get("uti", 0)
-        cpu_.load = data.get("load", 0)
-        rsu_running.cpu.append(cpu_)
-
-    rsu_running.mem = []
-    for mem in redis_conn.zrevrange(f"RSU_RUNNING_MEM_{rsu_in_db.rsu_esn}", start=0, end=6):
-        data = json.loads(mem)
-        mem_ = schemas.RunningMEM()
-        mem_.time = data.get("time")
-        mem_.total = data.get("total", 0)
-        mem_.used = data.get("used", 0)
-        rsu_running.mem.append(mem_)
-
-    rsu_running.disk = []
-    for disk in redis_conn.zrevrange(f"RSU_RUNNING_DISK_{rsu_in_db.rsu_esn}", start=0, end=6):
-        data = json.loads(disk)
-        disk_ = schemas.RunningDisk()
-        disk_.time = data.get("time")
-        disk_.rx_byte = data.get("rxByte", 0)
-        disk_.wx_byte = data.get("wxByte", 0)
-        rsu_running.disk.append(disk_)
-
-    rsu_running.net = []
-    for net in redis_conn.zrevrange(f"RSU_RUNNING_NET_{rsu_in_db.rsu_esn}", start=0, end=6):
-        data = json.loads(net)
-        net_ = schemas.RunningNet()
-        net_.time = data.get("time")
-        net_.read = data.get("read", 0)
-        net_.write = data.get("write", 0)
-        rsu_running.net.append(net_)
+    now = int(time.time())
+    if start is None:
+        samples = timeseries.latest(redis_conn, timeseries.RAW, rsu_in_db.rsu_esn, now, count=7)
+        samples.reverse()
+        return _running(samples)
 
+    end = now if end is None else end
+    step = step or max(1, math.ceil((end - start) / 100))
+    if end <= start or (end - start) / step > MAX_RUNNING_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be after start, with at most {MAX_RUNNING_BUCKETS} buckets",
+        )
+    tier = timeseries.pick_tier(start, step, now)
+    read_start, read_end = _read_window(tier, start, end, now)
+    buckets = timeseries.aggregate(
+        timeseries.read_array(redis_conn, tier, rsu_in_db.rsu_esn, read_start, read_end),
+        start,
+        step,
+    )
+    rsu_running = _running(
+        [
+            timeseries.Sample(
+                bucket["time"], *(bucket[metric]["avg"] for metric in timeseries.METRICS)
+            )
+            for bucket in buckets
+        ]
+    )
+    rsu_running.step = step
+    rsu_running.buckets = [
+        schemas.RunningBucket(
+            time=bucket["time"],
+            count=bucket["count"],
+            cpuUti=bucket["cpu_uti"],
+            cpuLoad=bucket["cpu_load"],
+            memTotal=bucket["mem_total"],
+            memUsed=bucket["mem_used"],
+            netRx=bucket["net_rx"],
+            netTx=bucket["net_tx"],
+            diskRead=bucket["disk_read"],
+            diskWrite=bucket["disk_write"],
+        )
+        for bucket in buckets
+    ]
+    return rsu_running
+
+
+def _read_window(tier: timeseries.Tier, start: int, end: int, now: int) -> Tuple[int, int]:
+    """Part of the window the tier still holds, rejected if it spans too many chunks."""
+    read_start, read_end = timeseries.window(tier, start, end, now)
+    if timeseries.chunk_count(tier, read_start, read_end) > MAX_RUNNING_CHUNKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window too large, it spans more than {MAX_RUNNING_CHUNKS} chunks",
+        )
+    return read_start, read_end
+
+
+def _running(samples: List[timeseries.Sample]) -> schemas.RSURunning:
+    rsu_running = schemas.RSURunning()
+    rsu_running.cpu = [
+        schemas.RunningCPU(time=sample.time, uti=sample.cpu_uti, load=sample.cpu_load)
+        for sample in samples
+    ]
+    rsu_running.mem = [
+        schemas.RunningMEM(time=sample.time, total=sample.mem_total, used=sample.mem_used)
+        for sample in samples
+    ]
+    rsu_running.disk = [
+        schemas.RunningDisk(time=sample.time, rxByte=sample.disk_read, wxByte=sample.disk_write)
+        for sample in samples
+    ]
+    rsu_running.net = [
+        schemas.RunningNet(time=sample.time, read=sample.net_rx, write=sample.net_tx)
+        for sample in samples
+    ]
     return rsu_running
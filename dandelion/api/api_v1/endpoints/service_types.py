@@ -103,6 +103,7 @@ def get(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("service_type")),
 ) -> schemas.ServiceTypeGET:
     service_type = crud.service_type.get(db, id=service_type_id)
     if not service_type:
@@ -161,6 +162,7 @@ def get_all(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    etag: None = Depends(deps.etag("service_type")),
 ) -> schemas.ServiceTypes:
     service_types = crud.service_type.get_all(db, name)
     return schemas.ServiceTypes(total=len(service_types), data=service_types)
@@ -132,7 +132,7 @@ def get_all(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.Spats:
     skip = page_size * (page_num - 1)
-    total, data = crud.spat.get_multi_with_total(
+    total, exact, data = crud.spat.get_multi_with_total(
         db,
         skip=skip,
         limit=page_size,
@@ -140,7 +140,7 @@ def get_all(
         name=name,
         rsu_id=rsu_id,
     )
-    return schemas.Spats(total=total, data=[spat.to_dict() for spat in data])
+    return schemas.Spats(total=total, totalExact=exact, data=[spat.to_dict() for spat in data])
 
 
 @router.patch(
@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
@@ -39,9 +41,21 @@ Get all SSW.
 def get_all(
     page_num: int = Query(1, alias="pageNum", ge=1, description="Page number"),
     page_size: int = Query(10, alias="pageSize", ge=-1, description="Page size"),
+    after: Optional[str] = Query(
+        None,
+        alias="after",
+        description="Cursor from nextCursor of the previous page, pageNum is then ignored",
+    ),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> schemas.SSWs:
     skip = page_size * (page_num - 1)
-    total, data = crud.ssw.get_multi_with_total(db, skip=skip, limit=page_size)
-    return schemas.SSWs(total=total, data=[ssw.to_all_dict() for ssw in data])
+    total, exact, data = crud.ssw.get_multi_with_total(
+        db, skip=skip, limit=page_size, after=deps.decode_cursor(after)
+    )
+    return schemas.SSWs(
+        total=total,
+        totalExact=exact,
+        data=[ssw.to_all_dict() for ssw in data],
+        nextCursor=deps.next_cursor(data, page_size),
+    )
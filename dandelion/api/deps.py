@@ -14,26 +14,31 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
 import importlib.util
 import os
 import re
 from importlib._bootstrap import ModuleSpec
 from logging import LoggerAdapter
-from typing import Any, Dict, Generator, Optional, Union
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, List, Optional, Union
 
 import requests
 import sqlalchemy.exc
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from oslo_config import cfg
 from oslo_log import log
 from pydantic import ValidationError
 from redis import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from dandelion import conf, constants, crud, models, schemas
-from dandelion.db import redis_pool, session
+from dandelion import conf, constants, crud, models, schemas, version
+from dandelion.db import generation, redis_pool, session
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 CONF: cfg = conf.CONF
@@ -66,14 +71,66 @@ class OpenV2XHTTPException(HTTPException):
         super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 
-def get_db() -> Generator:
+# Requests which do not write, whose reads may be sent to a replica
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def get_db(request: Request) -> Generator:
     try:
-        db: Session = session.DB_SESSION_LOCAL()
+        # The reads checking a write, which may follow a create, need the primary
+        db: Session = session.DB_SESSION_LOCAL(
+            info={session.REPLICA_READS: request.method in SAFE_METHODS}
+        )
         yield db
     finally:
         db.close()
 
 
+async def get_async_db(request: Request) -> AsyncGenerator:
+    db: AsyncSession = session.ASYNC_SESSION_LOCAL(
+        info={session.REPLICA_READS: request.method in SAFE_METHODS}
+    )
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+class NotModified(Exception):
+    """The client already has the current version of the resource."""
+
+    def __init__(self, headers: Dict[str, str]) -> None:
+        self.headers = headers
+
+
+def etag(*tables: str, salt: str = "") -> Callable[[Request, Response], None]:
+    """Dependency answering conditional GETs of a resource stored in the tables.
+
+    The ETag is derived from the generations of the tables, which are bumped on
+    every committed write, so that revalidating costs one Redis round trip and
+    no query. `salt` stands for any other data the resource is built from.
+    Raises `NotModified` if the request has a matching `If-None-Match`.
+    """
+
+    def dependency(request: Request, response: Response) -> None:
+        try:
+            stamp = generation.stamp(tables)
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to get generations of tables {list(tables)}: {ex}")
+            return None
+        resource = f"{version.version_string()}:{request.url.path}?{request.url.query}"
+        digest = hashlib.sha1(f"{resource}:{salt}:{stamp}".encode("utf-8")).hexdigest()
+        headers = {"ETag": f'W/"{digest}"', "Cache-Control": "private, no-cache"}
+        tags = {tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")}
+        # Weak comparison, as for GET a strong ETag of the same value matches too
+        if tags & {f'W/"{digest}"', f'"{digest}"', "*"}:
+            raise NotModified(headers)
+        response.headers.update(headers)
+        return None
+
+    return dependency
+
+
 def get_redis_conn() -> Redis:
     return redis_pool.REDIS_CONN
 
@@ -94,14 +151,10 @@ def check_token(db, token):
     return user
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
-    try:
-        return check_token(db=db, token=token)
-    except OpenV2XHTTPException as e:
-        error = e
-    system_config = crud.system_config.get(db=db, id=1)
+def check_center_token(
+    system_config: Optional[models.SystemConfig], token: str, error: OpenV2XHTTPException
+) -> Any:
+    """User of a token issued by the center, raise `error` if it is not."""
     if not system_config:
         raise error
     res = requests.get(
@@ -117,12 +170,42 @@ def get_current_user(
     return res.json()
 
 
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    try:
+        return check_token(db=db, token=token)
+    except OpenV2XHTTPException as e:
+        error = e
+    system_config = crud.system_config.get(db=db, id=1)
+    return check_center_token(system_config, token, error)
+
+
+async def get_async_current_user(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    """`get_current_user` of the async endpoints, on their async session."""
+    try:
+        return await db.run_sync(check_token, token)
+    except OpenV2XHTTPException as e:
+        error = e
+    system_config = await db.run_sync(lambda db_: crud.system_config.get(db=db_, id=1))
+    return await run_in_threadpool(check_center_token, system_config, token, error)
+
+
 def get_current_user_no_auth(db: Session = Depends(get_db), token: str = "") -> models.User:
     return crud.user.get(db, id=1) or models.User()
 
 
+async def get_async_current_user_no_auth(
+    db: AsyncSession = Depends(get_async_db), token: str = ""
+) -> models.User:
+    return await db.run_sync(lambda db_: crud.user.get(db_, id=1)) or models.User()
+
+
 if os.getenv("OPENV2X_DANDELION_NO_AUTH", "") == "true":
     get_current_user = get_current_user_no_auth  # noqa F811
+    get_async_current_user = get_async_current_user_no_auth  # noqa F811
 
 
 def get_token(host: str) -> str:
@@ -171,6 +254,25 @@ def crud_get(db, obj_id, crud_model, detail):
     return data
 
 
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """ID of the last row of the previous page, from its opaque cursor."""
+    if cursor is None:
+        return None
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii"))
+    except (ValueError, binascii.Error):
+        raise OpenV2XHTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor [after: {cursor}]"
+        )
+
+
+def next_cursor(data: List[Any], limit: int) -> Optional[str]:
+    """Cursor of the page following `data`, None if `data` is the last page."""
+    if limit == -1 or not data or len(data) < limit:
+        return None
+    return base64.urlsafe_b64encode(str(data[-1].id).encode("ascii")).decode("ascii")
+
+
 def get_gunicorn_port():
     spec: ModuleSpec = importlib.util.spec_from_file_location(
         "gunicorn_config", "/etc/dandelion/gunicorn.py"
@@ -0,0 +1,94 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator
+
+from fastapi import status
+from fastapi.responses import StreamingResponse
+from oslo_config import cfg
+from pydantic.json import pydantic_encoder
+
+from dandelion.schemas.utils import ExportFormat
+
+CONF: cfg = cfg.CONF
+
+MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+RESPONSE_EXPORT: Dict = {
+    status.HTTP_200_OK: {
+        "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        "description": "OK",
+    },
+}
+
+
+def stream(
+    rows: Iterable[Dict[str, Any]], export_format: ExportFormat, name: str
+) -> StreamingResponse:
+    """Response streaming the rows as NDJSON or CSV, one batch of rows per chunk."""
+    lines = ndjson(rows) if export_format == ExportFormat.ndjson else csv_lines(rows)
+    return StreamingResponse(
+        chunks(lines, CONF.database.export_batch_size),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'},
+    )
+
+
+def chunks(lines: Iterator[str], size: int) -> Iterator[bytes]:
+    """Join the lines by `size`, as every chunk is sent from a thread of the pool."""
+    while True:
+        chunk = "".join(itertools.islice(lines, size))
+        if not chunk:
+            return
+        yield chunk.encode("utf-8")
+
+
+def ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=pydantic_encoder) + "\n"
+
+
+def csv_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """CSV lines of the rows, headed by the fields of the first row.
+
+    Nested values are written as JSON.
+    """
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow({field: csv_value(value) for field, value in row.items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=pydantic_encoder)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,62 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import signal
+import sys
+import threading
+from logging import LoggerAdapter
+from typing import Any
+
+from oslo_config import cfg
+from oslo_log import log
+
+from dandelion import conf, constants, ingest, version
+from dandelion.db import redis_pool, session as db_session
+
+CONF: cfg = conf.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+
+def main() -> None:
+    """Run the MQTT consumers and the periodic tasks without the API server."""
+    log.register_options(CONF)
+    CONF(
+        args=sys.argv[1:],
+        project=constants.PROJECT_NAME,
+        version=version.version_string(),
+        default_config_files=[constants.CONFIG_FILE_PATH],
+    )
+    log.setup(CONF, constants.PROJECT_NAME)
+
+    db_session.setup_db()
+    redis_pool.setup_redis()
+    ingest.start()
+
+    stopped = threading.Event()
+
+    def _on_signal(signum: int, frame: Any) -> None:
+        LOG.info(f"Received signal {signum}, stopping...")
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, _on_signal)
+    signal.signal(signal.SIGINT, _on_signal)
+    while not stopped.wait(1.0):
+        pass
+    ingest.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,19 @@ from __future__ import annotations
 
 from oslo_config import cfg
 
-from dandelion.conf import cors, database, iam, mode, mqtt, redis, token, user
+from dandelion.conf import (
+    cors,
+    database,
+    iam,
+    ingest,
+    mode,
+    mqtt,
+    redis,
+    retention,
+    timeseries,
+    token,
+    user,
+)
 
 CONF: cfg = cfg.CONF
 
@@ -29,3 +41,6 @@ token.register_opts(CONF)
 mode.register_opts(CONF)
 user.register_opts(CONF)
 iam.register_opts(CONF)
+ingest.register_opts(CONF)
+timeseries.register_opts(CONF)
+retention.register_opts(CONF)
@@ -45,6 +45,80 @@ Setting a value of 0 indicates no limit.
         default=1000,
         help="""
 If set, use this value for max_overflow with sqlalchemy.
+""",
+    ),
+    cfg.IntOpt(
+        "write_batch_size",
+        default=500,
+        min=0,
+        help="""
+Number of buffered event rows that triggers a multi-row INSERT.
+Setting a value of 0 writes every event row immediately.
+""",
+    ),
+    cfg.IntOpt(
+        "write_batch_interval",
+        default=50,
+        min=1,
+        help="""
+Maximum time in milliseconds an event row is buffered before it is written.
+""",
+    ),
+    cfg.IntOpt(
+        "write_batch_max_pending",
+        default=10000,
+        min=1,
+        help="""
+Maximum number of buffered event rows. Producers wait for the next flush once
+this limit is reached.
+""",
+    ),
+    cfg.IntOpt(
+        "count_cache_ttl",
+        default=300,
+        min=0,
+        help="""
+Seconds the totals of the list queries are cached. Cached totals are dropped
+as soon as the tables they count are written. Setting a value of 0 disables
+the cache.
+""",
+    ),
+    cfg.IntOpt(
+        "count_estimate_threshold",
+        default=100000,
+        min=0,
+        help="""
+Number of rows beyond which the totals of the list queries are estimated from
+the table statistics instead of counted, when the database supports it.
+Setting a value of 0 always counts exactly.
+""",
+    ),
+    cfg.IntOpt(
+        "export_batch_size",
+        default=1000,
+        min=1,
+        help="""
+Number of rows fetched at a time by the export endpoints, which stream the rows
+of a query through a server-side cursor instead of loading them all.
+""",
+    ),
+    cfg.ListOpt(
+        "replica_connections",
+        default=[],
+        help="""
+Connections of read replicas of the database. Within GET requests, the reads of
+the CRUD read methods (get, get_multi_with_total, get_by_*) are sent to a
+random replica, unless the request has already written to the database. Other
+reads, the reads of the other requests and all writes go to the primary.
+""",
+    ),
+    cfg.IntOpt(
+        "replica_max_lag",
+        default=5,
+        min=0,
+        help="""
+Replication lag in seconds tolerated from the replicas. Totals counted on a
+replica are cached at most this long, since they may miss the latest writes.
 """,
     ),
 ]
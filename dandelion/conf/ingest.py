@@ -0,0 +1,46 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+ingest_group = cfg.OptGroup(
+    name="ingest",
+    title="Ingest Options",
+    help="""
+Ingest related options.
+""",
+)
+
+ingest_opts = [
+    cfg.BoolOpt(
+        "enabled",
+        default=True,
+        help="""
+Whether the API server consumes the MQTT messages and runs the periodic tasks.
+Disable it when the ingest runs in dedicated dandelion-ingest processes, the
+API server then only connects to the MQTT server to publish messages.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(ingest_group)
+    conf.register_opts(ingest_opts, group=ingest_group)
+
+
+def list_opts():
+    return {ingest_group: ingest_opts}
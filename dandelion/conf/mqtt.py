@@ -48,6 +48,55 @@ Username of MQTT server.
         "password",
         help="""
 Password for username of MQTT server.
+""",
+    ),
+    cfg.IntOpt(
+        "dispatch_workers",
+        default=8,
+        min=0,
+        help="""
+Number of worker threads handling MQTT messages. Messages of the same RSU are
+always handled by the same worker, in order.
+Setting a value of 0 handles messages inline on the MQTT network thread.
+""",
+    ),
+    cfg.IntOpt(
+        "dispatch_queue_size",
+        default=10000,
+        min=1,
+        help="""
+Maximum number of MQTT messages waiting for a worker. Messages beyond this
+limit are dropped.
+""",
+    ),
+    cfg.StrOpt(
+        "subscription_mode",
+        default="shared",
+        choices=[
+            ("all", "Every worker subscribes every topic and handles every message"),
+            ("shared", "Workers share the messages through MQTT shared subscriptions"),
+            ("elected", "Only the worker elected as consumer subscribes"),
+        ],
+        help="""
+How the workers subscribe the MQTT topics. The shared mode falls back to the
+elected mode if the MQTT server does not support shared subscriptions.
+""",
+    ),
+    cfg.StrOpt(
+        "subscription_group",
+        default="dandelion",
+        help="""
+Name of the shared subscription group, and of the consumer lease in the
+elected mode. Deployments sharing a MQTT server must use different groups.
+""",
+    ),
+    cfg.IntOpt(
+        "subscription_lease_ttl",
+        default=15,
+        min=3,
+        help="""
+Seconds after which the consumer lease of the elected mode expires if not
+renewed, and another worker takes over.
 """,
     ),
 ]
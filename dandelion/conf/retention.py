@@ -0,0 +1,82 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+retention_group = cfg.OptGroup(
+    name="retention",
+    title="Retention Options",
+    help="""
+Retention of the event tables, such as rsm, rsm_participants, rsi_event, cgw...
+""",
+)
+
+retention_opts = [
+    cfg.IntOpt(
+        "event_retention",
+        default=0,
+        min=0,
+        help="""
+Days the rows of the event tables are kept. Setting a value of 0 keeps them
+forever.
+""",
+    ),
+    cfg.DictOpt(
+        "table_retention",
+        default={},
+        help="""
+Days the rows of the given event tables are kept, overriding event_retention,
+for instance `rsm_participants:7,rsi_event:90`.
+""",
+    ),
+    cfg.IntOpt(
+        "purge_batch_size",
+        default=5000,
+        min=1,
+        help="""
+Maximum number of rows deleted by one statement when purging an event table.
+""",
+    ),
+    cfg.IntOpt(
+        "purge_batch_interval",
+        default=100,
+        min=0,
+        help="""
+Time in milliseconds to wait between two purge statements, to leave room to
+the other queries and to the replication.
+""",
+    ),
+    cfg.IntOpt(
+        "partition_days_ahead",
+        default=7,
+        min=1,
+        help="""
+Number of daily partitions created ahead of time on the event tables
+partitioned by the `partition` migration, also when the retention is 0.
+Partitions entirely past the retention are dropped instead of purged row by
+row.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(retention_group)
+    conf.register_opts(retention_opts, group=retention_group)
+
+
+def list_opts():
+    return {retention_group: retention_opts}
@@ -0,0 +1,70 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from oslo_config import cfg
+
+timeseries_group = cfg.OptGroup(
+    name="timeseries",
+    title="Time Series Options",
+    help="""
+Options of the RSU running info time series.
+""",
+)
+
+timeseries_opts = [
+    cfg.IntOpt(
+        "sample_interval",
+        default=30,
+        min=1,
+        help="""
+Minimum seconds between two samples of the running info of an RSU. Running
+info reported more often only updates the latest snapshot.
+""",
+    ),
+    cfg.IntOpt(
+        "raw_retention",
+        default=2,
+        min=1,
+        help="""
+Hours the raw samples are kept.
+""",
+    ),
+    cfg.IntOpt(
+        "minute_retention",
+        default=24,
+        min=1,
+        help="""
+Hours the 1 minute averages are kept.
+""",
+    ),
+    cfg.IntOpt(
+        "hour_retention",
+        default=30,
+        min=1,
+        help="""
+Days the 1 hour averages are kept.
+""",
+    ),
+]
+
+
+def register_opts(conf):
+    conf.register_group(timeseries_group)
+    conf.register_opts(timeseries_opts, group=timeseries_group)
+
+
+def list_opts():
+    return {timeseries_group: timeseries_opts}
@@ -20,6 +20,12 @@ API_V1_STR: str = "/api/v1"
 ALGORITHM: str = "HS256"
 HTTP_REPEAT_CODE: int = 499
 BITMAP_FILE_PATH: str = "/openv2x/data/bitmap"
+RSU_ONLINE_EXPIRE: int = 15
+RSU_ONLINE_PREFIX: str = "RSU_ONLINE_"
+RSU_LAST_SEEN_KEY: str = "RSU_LAST_SEEN"
+RSU_REGISTRY_CHANNEL: str = "RSU_REGISTRY"
+RSU_REGISTRY_NEGATIVE_TTL: int = 60
+RSU_REGISTRY_NEGATIVE_SIZE: int = 10000
 DEFAULT_ALGO: str = """
 rsi_formatter:
   algos:
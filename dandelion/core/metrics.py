@@ -0,0 +1,100 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+
+_LOCK = threading.Lock()
+
+
+class Counter(object):
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with _LOCK:
+            self.value += amount
+
+    def snapshot(self) -> Union[int, float]:
+        return self.value
+
+
+class Gauge(object):
+    def __init__(self, func: Optional[Callable[[], Union[int, float]]] = None) -> None:
+        self.func = func
+        self.value: Union[int, float] = 0
+
+    def set(self, value: Union[int, float]) -> None:
+        self.value = value
+
+    def snapshot(self) -> Union[int, float]:
+        if self.func is not None:
+            return self.func()
+        return self.value
+
+
+class Timer(object):
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with _LOCK:
+            self.count += 1
+            self.sum += seconds
+            self.last = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(
+            count=self.count,
+            sum=self.sum,
+            avg=self.sum / self.count if self.count else 0.0,
+            max=self.max,
+            last=self.last,
+        )
+
+
+Metric = Union[Counter, Gauge, Timer]
+REGISTRY: Dict[str, Metric] = {}
+
+
+def _register(name: str, metric: Metric) -> Any:
+    with _LOCK:
+        return REGISTRY.setdefault(name, metric)
+
+
+def counter(name: str) -> Counter:
+    return _register(name, Counter())
+
+
+def gauge(name: str, func: Optional[Callable[[], Union[int, float]]] = None) -> Gauge:
+    metric = _register(name, Gauge(func))
+    if func is not None:
+        metric.func = func
+    return metric
+
+
+def timer(name: str) -> Timer:
+    return _register(name, Timer())
+
+
+def snapshot() -> Dict[str, Any]:
+    return {name: metric.snapshot() for name, metric in sorted(REGISTRY.items())}
@@ -14,24 +14,87 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import re
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from logging import LoggerAdapter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi.encoders import jsonable_encoder
+from oslo_config import cfg
+from oslo_log import log
 from pydantic import BaseModel
+from sqlalchemy import desc, inspect, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.util import find_tables
 from starlette import status
 
 from dandelion.api.deps import OpenV2XHTTPException
+from dandelion.core import metrics
+from dandelion.db import batch, generation, redis_pool, session
 from dandelion.db.base_class import Base
+from dandelion.schemas.utils import Sort
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+COUNT_CACHE_HITS = metrics.counter("crud.count_cache.hits")
+COUNT_CACHE_MISSES = metrics.counter("crud.count_cache.misses")
+COUNT_ESTIMATES = metrics.counter("crud.count_estimates")
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+F = TypeVar("F", bound=Callable[..., Any])
+
+# CRUD methods whose reads may be sent to a replica
+READ_METHOD = re.compile(r"get|get_multi|get_multi_with_total|get_by_\w+")
+
+
+def replica_read(func: F) -> F:
+    """Send the reads of the decorated CRUD method to a replica when allowed."""
+
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        db = kwargs["db"] if "db" in kwargs else args[0]
+        with session.replica_reads(db):
+            return func(self, *args, **kwargs)
+
+    return wrapper  # type: ignore
+
+
+def _get_cached(tables: List[str], key: str) -> List[Any]:
+    """Generations of the tables and the cached total under the key."""
+    pipe = redis_pool.REDIS_CONN.pipeline(transaction=False)
+    pipe.mget([generation.key(table) for table in tables])
+    pipe.get(key)
+    return pipe.execute()
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name, method in list(vars(cls).items()):
+            if READ_METHOD.fullmatch(name) and callable(method):
+                setattr(cls, name, replica_read(method))
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -43,9 +106,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    @replica_read
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
+    @replica_read
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
@@ -57,18 +122,48 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_deferred(self, *, obj_in: CreateSchemaType) -> None:
+        batch.add(self.model, jsonable_encoder(obj_in, by_alias=False))
+
+    @functools.cached_property
+    def columns(self) -> FrozenSet[str]:
+        """Names of the column attributes of the model."""
+        return frozenset(attr.key for attr in inspect(self.model).column_attrs)
+
     def update(
-        self, db: Session, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        refresh: bool = True,
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        """Update the columns of `db_obj` set in `obj_in`.
+
+        With `refresh` False, the columns are written by a single `UPDATE` on
+        the primary key and `db_obj` is not reloaded: only the updated columns
+        may be read from it afterwards without querying the database again.
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db_obj.update_time = datetime.utcnow()
+        values = {field: value for field, value in update_data.items() if field in self.columns}
+        values["update_time"] = datetime.utcnow()
+        if not refresh:
+            stmt = (
+                update(self.model)
+                .where(self.model.id == db_obj.id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(stmt)
+            db.commit()
+            for field, value in values.items():
+                set_committed_value(db_obj, field, value)
+            return db_obj
+        for field, value in values.items():
+            setattr(db_obj, field, value)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -86,6 +181,171 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 )
         return obj
 
+    def remove_multi(self, db: Session, *, ids: List[int]) -> int:
+        """Delete the objects with the ids, and their dependents, in one transaction.
+
+        Rows are deleted by set-based `DELETE ... WHERE` statements without
+        being loaded. Returns the number of objects deleted.
+        """
+        if not ids:
+            return 0
+        try:
+            self.remove_dependents(db, ids=ids)
+            count = (
+                db.query(self.model)
+                .filter(self.model.id.in_(ids))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise OpenV2XHTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.args[0])
+        return count
+
+    def remove_dependents(self, db: Session, *, ids: List[int]) -> None:
+        """Delete or detach the rows referencing the objects `remove_multi` deletes."""
+
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        """Loader options of the relationships serialized by the profile.
+
+        List methods apply them so that serializing a page of rows runs a fixed
+        number of queries instead of one per row.
+        """
+        return ()
+
+    def load(self, query_: Query, profile: Optional[str]) -> Query:
+        if profile is None:
+            return query_
+        return query_.options(*self.load_options(profile))
+
+    def paginate(
+        self,
+        query_: Query,
+        *,
+        skip: int,
+        limit: int,
+        sort: Sort = Sort.asc,
+        after: Optional[int] = None,
+    ) -> Tuple[Optional[int], bool, List[ModelType]]:
+        """Total of the query, whether it is exact, and page of the query ordered by ID.
+
+        With `after`, the page starts right after the row of that ID instead of
+        skipping `skip` rows, so that deep pages cost as much as the first one,
+        and the total is not counted.
+        """
+        total, exact = None, True
+        if after is None:
+            total, exact = self.count(query_)
+        elif sort == Sort.asc:
+            query_ = query_.filter(self.model.id > after)
+        else:
+            query_ = query_.filter(self.model.id < after)
+        query_ = query_.order_by(self.model.id if sort == Sort.asc else desc(self.model.id))
+        if limit != -1:
+            if after is None:
+                query_ = query_.offset(skip)
+            query_ = query_.limit(limit)
+        return total, exact, query_.all()
+
+    def stream(
+        self,
+        query_: Query,
+        *,
+        sort: Sort = Sort.desc,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Iterator[ModelType]:
+        """Rows of the query created from `start_time` to `end_time` excluded, ordered by ID.
+
+        Rows are fetched `[database] export_batch_size` at a time through a
+        server-side cursor, so that memory does not grow with the number of rows.
+        """
+        if start_time is not None:
+            query_ = query_.filter(self.model.create_time >= start_time)
+        if end_time is not None:
+            query_ = query_.filter(self.model.create_time < end_time)
+        query_ = query_.order_by(self.model.id if sort == Sort.asc else desc(self.model.id))
+        with session.replica_reads(query_.session):
+            yield from query_.yield_per(CONF.database.export_batch_size)
+
+    def count(self, query_: Query) -> Tuple[int, bool]:
+        """Total of the query and whether it is exact, cached until any of its tables is written.
+
+        The total is estimated from the table statistics if too large to count.
+        """
+        ttl = CONF.database.count_cache_ttl
+        if not ttl:
+            return self._count(query_)
+        if session.reads_from_replica(query_.session):
+            # The replica may not have the writes the generations account for yet
+            ttl = min(ttl, CONF.database.replica_max_lag)
+            if not ttl:
+                return self._count(query_)
+        statement = query_.enable_eagerloads(False).order_by(None).statement
+        compiled = statement.compile(dialect=query_.session.get_bind().dialect)
+        digest = hashlib.sha1(
+            (str(compiled) + json.dumps(compiled.params, sort_keys=True, default=str)).encode()
+        ).hexdigest()
+        key = f"COUNT_{self.model.__tablename__}_{digest}"
+        tables = sorted({table.name for table in find_tables(statement)})
+        try:
+            generations, cached = session.blocking(query_.session, _get_cached, tables, key)
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to get cached total of {self.model.__tablename__}: {ex}")
+            return self._count(query_)
+
+        stamp = ",".join(str(int(value or 0)) for value in generations)
+        if cached:
+            cached_stamp, value, exact = cached.decode("utf-8").split(":")
+            if cached_stamp == stamp:
+                COUNT_CACHE_HITS.inc()
+                return int(value), exact == "1"
+        COUNT_CACHE_MISSES.inc()
+        total, exact = self._count(query_)
+        try:
+            session.blocking(
+                query_.session,
+                redis_pool.REDIS_CONN.set,
+                key,
+                f"{stamp}:{total}:{int(exact)}",
+                ex=ttl,
+            )
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to cache total of {self.model.__tablename__}: {ex}")
+        return total, exact
+
+    def _count(self, query_: Query) -> Tuple[int, bool]:
+        threshold = CONF.database.count_estimate_threshold
+        if not threshold:
+            return query_.count(), True
+        # Counting is bounded, large totals are estimated instead
+        total = query_.order_by(None).limit(threshold + 1).count()
+        if total <= threshold:
+            return total, True
+        estimate = self._estimate(query_)
+        if estimate is None:
+            return query_.count(), True
+        COUNT_ESTIMATES.inc()
+        return max(estimate, total), False
+
+    @staticmethod
+    def _estimate(query_: Query) -> Optional[int]:
+        """Rows the query is expected to return according to the MySQL optimizer."""
+        connection = query_.session.connection()
+        if connection.dialect.name != "mysql":
+            return None
+        try:
+            statement = query_.order_by(None).statement.compile(
+                dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = connection.exec_driver_sql(f"EXPLAIN {statement}").mappings().first()
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to estimate total: {ex}")
+            return None
+        if plan is None or plan["rows"] is None:
+            return None
+        return int(plan["rows"] * (plan.get("filtered") or 100) / 100)
+
     @staticmethod
     def fuzz_filter(query, model, field):
         return (
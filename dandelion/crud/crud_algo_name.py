@@ -38,13 +38,13 @@ class CRUDAlgo(CRUDBase[AlgoName, AlgoNameCreate, AlgoNameUpdate]):
         db: Session,
         *,
         algo: Optional[str] = None,
-    ) -> Tuple[int, List[AlgoName]]:
+    ) -> Tuple[int, bool, List[AlgoName]]:
         query_ = db.query(self.model)
         if algo is not None:
             query_ = self.fuzz_filter(query_, self.model.name, algo)
-        total = query_.count()
+        total, exact = self.count(query_)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
     def get_multi_all(
         self,
@@ -37,13 +37,13 @@ class CRUDAlgo(CRUDBase[AlgoVersion, AlgoVersionCreate, AlgoVersionUpdate]):
         db: Session,
         *,
         version: Optional[str] = None,
-    ) -> Tuple[int, List[AlgoVersion]]:
+    ) -> Tuple[int, bool, List[AlgoVersion]]:
         query_ = db.query(self.model)
         if version is not None:
             query_ = self.fuzz_filter(query_, self.model.version, version)
-        total = query_.count()
+        total, exact = self.count(query_)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 algo_version = CRUDAlgo(AlgoVersion)
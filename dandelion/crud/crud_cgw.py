@@ -39,16 +39,13 @@ class CRUDCGW(CRUDBase[CGW, CGWCreate, CGWUpdate]):
         *,
         skip: int = 0,
         limit: int = 10,
+        after: Optional[int] = None,
         cgw_level: Optional[int] = None,
-    ) -> Tuple[int, List[CGW]]:
+    ) -> Tuple[Optional[int], bool, List[CGW]]:
         query_ = db.query(self.model)
         if cgw_level is not None:
             query_ = query_.filter(self.model.cgw_level == cgw_level)
-        total = query_.count()
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, after=after)
 
 
 cgw = CRUDCGW(CGW)
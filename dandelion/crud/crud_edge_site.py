@@ -14,13 +14,13 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from dandelion.crud.base import CRUDBase
-from dandelion.models import EdgeSite
+from dandelion.models import Area, City, EdgeSite, Province
 from dandelion.schemas import EdgeSiteCreate, EdgeSiteUpdate
 
 
@@ -28,6 +28,14 @@ class CRUDEdgeSite(CRUDBase[EdgeSite, EdgeSiteCreate, EdgeSiteUpdate]):
     def get_by_name(self, db: Session, name: str) -> EdgeSite:
         return db.query(self.model).filter(self.model.name == name).first()
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (
+            joinedload(self.model.area)
+            .joinedload(Area.city)
+            .joinedload(City.province)
+            .joinedload(Province.country),
+        )
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -36,17 +44,19 @@ class CRUDEdgeSite(CRUDBase[EdgeSite, EdgeSiteCreate, EdgeSiteUpdate]):
         limit: int = -1,
         name: Optional[str] = None,
         area_code: Optional[str] = None,
-    ) -> Tuple[int, List[EdgeSite]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[EdgeSite]]:
         query_ = db.query(self.model)
         if name is not None:
             query_ = self.fuzz_filter(query_, self.model.name, name)
         if area_code is not None:
             query_ = query_.filter(self.model.area_code == area_code)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
     def create(self, db: Session, *, obj_in: EdgeSiteCreate) -> EdgeSite:
         obj_in_data = jsonable_encoder(obj_in, by_alias=False)
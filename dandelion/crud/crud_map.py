@@ -14,10 +14,10 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import Map
@@ -27,6 +27,9 @@ from dandelion.schemas import MapCreate, MapUpdate
 class CRUDMap(CRUDBase[Map, MapCreate, MapUpdate]):
     """"""
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (selectinload(self.model.rsus),)
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -34,15 +37,17 @@ class CRUDMap(CRUDBase[Map, MapCreate, MapUpdate]):
         skip: int = 0,
         limit: int = 10,
         name: Optional[str] = None,
-    ) -> Tuple[int, List[Map]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[Map]]:
         query_ = db.query(self.model)
         if name is not None:
             query_ = self.fuzz_filter(query_, self.model.name, name)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
     def get_with_bitmap(
         self,
@@ -14,9 +14,9 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import MapRSU
@@ -29,6 +29,9 @@ class CRUDMapRSU(CRUDBase[MapRSU, MapRSUCreate, MapRSUUpdate]):
     def get_by_rsu_id(self, db: Session, *, rsu_id: int) -> MapRSU:
         return db.query(self.model).filter(self.model.rsu_id == rsu_id).first()
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (joinedload(self.model.rsu),)
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -36,15 +39,17 @@ class CRUDMapRSU(CRUDBase[MapRSU, MapRSUCreate, MapRSUUpdate]):
         skip: int = 0,
         limit: int = 10,
         map_id: Optional[int] = None,
-    ) -> Tuple[int, List[MapRSU]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[MapRSU]]:
         query_ = db.query(self.model)
         if map_id is not None:
             query_ = query_.filter(self.model.map_id == map_id)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
     def update_status_by_id(
         self,
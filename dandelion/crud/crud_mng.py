@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
@@ -29,9 +29,8 @@ class CRUDMNG(CRUDBase[MNG, MNGCreate, MNGUpdate]):
     """"""
 
     def update_mng(self, db: Session, *, db_obj: MNG, obj_in: MNGUpdate) -> MNG:
-        obj_data = jsonable_encoder(db_obj)
         update_data = jsonable_encoder(obj_in, by_alias=False)
-        for field in obj_data:
+        for field in self.columns:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db_obj.update_time = datetime.utcnow()
@@ -46,5 +45,8 @@ class CRUDMNG(CRUDBase[MNG, MNGCreate, MNGUpdate]):
     def remove_by_rsu_id(self, db: Session, *, rsu_id: int):
         db.query(MNG).filter(MNG.rsu_id == rsu_id).delete()
 
+    def remove_by_rsu_ids(self, db: Session, *, rsu_ids: List[int]) -> int:
+        return db.query(MNG).filter(MNG.rsu_id.in_(rsu_ids)).delete(synchronize_session=False)
+
 
 mng = CRUDMNG(MNG)
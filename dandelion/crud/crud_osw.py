@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
@@ -39,13 +39,10 @@ class CRUDOSW(CRUDBase[OSW, OSWCreate, OSWUpdate]):
         *,
         skip: int = 0,
         limit: int = 10,
-    ) -> Tuple[int, List[OSW]]:
+        after: Optional[int] = None,
+    ) -> Tuple[Optional[int], bool, List[OSW]]:
         query_ = db.query(self.model)
-        total = query_.count()
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, after=after)
 
 
 osw = CRUDOSW(OSW)
@@ -14,10 +14,10 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import RadarCamera
@@ -35,6 +35,9 @@ class CRUDRadarCamera(CRUDBase[RadarCamera, RadarCameraCreate, RadarCameraUpdate
         db.refresh(db_obj)
         return db_obj
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (joinedload(self.model.rsu),)
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -44,7 +47,8 @@ class CRUDRadarCamera(CRUDBase[RadarCamera, RadarCameraCreate, RadarCameraUpdate
         sn: Optional[str] = None,
         name: Optional[str] = None,
         rsu_id: Optional[int] = None,
-    ) -> Tuple[int, List[RadarCamera]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[RadarCamera]]:
         query_ = db.query(self.model)
         if sn is not None:
             query_ = self.fuzz_filter(query_, self.model.sn, sn)
@@ -52,11 +56,12 @@ class CRUDRadarCamera(CRUDBase[RadarCamera, RadarCameraCreate, RadarCameraUpdate
             query_ = self.fuzz_filter(query_, self.model.name, name)
         if rsu_id is not None:
             query_ = query_.filter(self.model.rsu_id == rsu_id)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 radar_camera = CRUDRadarCamera(RadarCamera)
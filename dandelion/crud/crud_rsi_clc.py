@@ -14,11 +14,11 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import RSICLC
@@ -41,21 +41,30 @@ class CRUDRSICLC(CRUDBase[RSICLC, RSICLCCreate, RSICLCCreate]):
         *,
         skip: int = 0,
         limit: int = 10,
+        after: Optional[int] = None,
         sort: Sort = Sort.desc,
         info: Optional[int] = None,
-    ) -> Tuple[int, List[RSICLC]]:
+    ) -> Tuple[Optional[int], bool, List[RSICLC]]:
+        query_ = self.query(db, info=info)
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, after=after)
+
+    def export(
+        self,
+        db: Session,
+        *,
+        sort: Sort = Sort.desc,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        info: Optional[int] = None,
+    ) -> Iterator[RSICLC]:
+        query_ = self.query(db, info=info)
+        return self.stream(query_, sort=sort, start_time=start_time, end_time=end_time)
+
+    def query(self, db: Session, *, info: Optional[int] = None) -> Query:
         query_ = db.query(self.model)
         if info is not None:
             query_ = query_.filter(self.model.info == info)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return query_
 
 
 rsi_clc = CRUDRSICLC(RSICLC)
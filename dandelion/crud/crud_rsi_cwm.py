@@ -14,11 +14,11 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import RSICWM
@@ -41,24 +41,36 @@ class CRUDRSICWM(CRUDBase[RSICWM, RSICWMCreate, RSICWMCreate]):
         *,
         skip: int = 0,
         limit: int = 10,
+        after: Optional[int] = None,
         sort: Sort = Sort.desc,
         event_type: Optional[int] = 0,
         collision_type: Optional[int],
-    ) -> Tuple[int, List[RSICWM]]:
+    ) -> Tuple[Optional[int], bool, List[RSICWM]]:
+        query_ = self.query(db, event_type=event_type, collision_type=collision_type)
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, after=after)
+
+    def export(
+        self,
+        db: Session,
+        *,
+        sort: Sort = Sort.desc,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        event_type: Optional[int] = None,
+        collision_type: Optional[int] = None,
+    ) -> Iterator[RSICWM]:
+        query_ = self.query(db, event_type=event_type, collision_type=collision_type)
+        return self.stream(query_, sort=sort, start_time=start_time, end_time=end_time)
+
+    def query(
+        self, db: Session, *, event_type: Optional[int], collision_type: Optional[int]
+    ) -> Query:
         query_ = db.query(self.model)
         if event_type is not None:
             query_ = query_.filter(self.model.event_type == event_type)
         if collision_type is not None:
             query_ = query_.filter(self.model.collision_type == collision_type)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return query_
 
 
 rsi_cwm = CRUDRSICWM(RSICWM)
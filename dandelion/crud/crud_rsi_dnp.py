@@ -17,7 +17,6 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
@@ -41,21 +40,14 @@ class CRUDRSIDNP(CRUDBase[RSIDNP, RSIDNPCreate, RSIDNPCreate]):
         *,
         skip: int = 0,
         limit: int = 10,
+        after: Optional[int] = None,
         sort: Sort = Sort.desc,
         info: Optional[int] = None,
-    ) -> Tuple[int, List[RSIDNP]]:
+    ) -> Tuple[Optional[int], bool, List[RSIDNP]]:
         query_ = db.query(self.model)
         if info is not None:
             query_ = query_.filter(self.model.info == info)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, after=after)
 
 
 rsi_dnp = CRUDRSIDNP(RSIDNP)
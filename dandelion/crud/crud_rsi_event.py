@@ -14,13 +14,14 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, joinedload
 
 from dandelion.crud.base import CRUDBase
+from dandelion.db import batch
 from dandelion.models import RSU, RSIEvent
 from dandelion.schemas import RSIEventCreate, RSIEventUpdate
 from dandelion.schemas.utils import Sort
@@ -38,30 +39,50 @@ class CRUDRSIEvent(CRUDBase[RSIEvent, RSIEventCreate, RSIEventUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_rsi_event_deferred(self, *, obj_in: RSIEventCreate, rsu: Optional[RSU]) -> None:
+        obj_in_data = jsonable_encoder(obj_in, by_alias=False)
+        obj_in_data["rsu_id"] = rsu.id if rsu else None
+        batch.add(self.model, obj_in_data)
+
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (joinedload(self.model.rsu),)
+
     def get_multi_with_total(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 10,
+        after: Optional[int] = None,
         sort: Sort = Sort.desc,
         event_type: Optional[int] = None,
         address: Optional[str] = None,
-    ) -> Tuple[int, List[RSIEvent]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[Optional[int], bool, List[RSIEvent]]:
+        query_ = self.load(self.query(db, event_type=event_type, address=address), profile)
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, after=after)
+
+    def export(
+        self,
+        db: Session,
+        *,
+        sort: Sort = Sort.desc,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        event_type: Optional[int] = None,
+    ) -> Iterator[RSIEvent]:
+        query_ = self.load(self.query(db, event_type=event_type), "list")
+        return self.stream(query_, sort=sort, start_time=start_time, end_time=end_time)
+
+    def query(
+        self, db: Session, *, event_type: Optional[int] = None, address: Optional[str] = None
+    ) -> Query:
         query_ = db.query(self.model)
         if event_type is not None:
             query_ = query_.filter(self.model.event_type == event_type)
         if address is not None:
             query_ = query_.filter(self.model.address.like(f"%{address}%"))
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return query_
 
 
 rsi_event = CRUDRSIEvent(RSIEvent)
@@ -14,12 +14,13 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List
 
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
+from dandelion.db import batch
 from dandelion.models import RSM, Participants
 from dandelion.schemas import RSMCreate, RSMUpdate
 
@@ -38,5 +39,11 @@ class CRUDRSM(CRUDBase[RSM, RSMCreate, RSMUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_rsm_deferred(
+        self, *, obj_in: RSMCreate, participants: List[Dict[str, Any]]
+    ) -> None:
+        obj_in_data = jsonable_encoder(obj_in, by_alias=False)
+        batch.add(self.model, obj_in_data, (Participants, "rsm_id", participants))
+
 
 rsm = CRUDRSM(RSM)
@@ -14,10 +14,10 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import Participants
@@ -34,21 +34,30 @@ class CRUDRSMParticipant(CRUDBase[Participants, RSMParticipantCreate, RSMPartici
         *,
         skip: int = 0,
         limit: int = 10,
+        after: Optional[int] = None,
         sort: Sort = Sort.desc,
         ptc_type: Optional[str] = None,
-    ) -> Tuple[int, List[Participants]]:
+    ) -> Tuple[Optional[int], bool, List[Participants]]:
+        query_ = self.query(db, ptc_type=ptc_type)
+        return self.paginate(query_, skip=skip, limit=limit, sort=sort, after=after)
+
+    def export(
+        self,
+        db: Session,
+        *,
+        sort: Sort = Sort.desc,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        ptc_type: Optional[str] = None,
+    ) -> Iterator[Participants]:
+        query_ = self.query(db, ptc_type=ptc_type)
+        return self.stream(query_, sort=sort, start_time=start_time, end_time=end_time)
+
+    def query(self, db: Session, *, ptc_type: Optional[str] = None) -> Query:
         query_ = db.query(self.model)
         if ptc_type is not None:
             query_ = query_.filter(self.model.ptc_type == ptc_type)
-        total = query_.count()
-        if sort == Sort.asc:
-            query_ = query_.order_by(self.model.id)
-        else:
-            query_ = query_.order_by(desc(self.model.id))
-        if limit != -1:
-            query_ = query_.offset(skip).limit(limit)
-        data = query_.all()
-        return total, data
+        return query_
 
 
 rsm_participant = CRUDRSMParticipant(Participants)
@@ -15,83 +15,106 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from dandelion.crud.base import CRUDBase
+from dandelion.crud.crud_mng import mng
+from dandelion.crud.crud_rsu_query_result import rsu_query_result
 from dandelion.crud.utils import get_mng_default
-from dandelion.models import RSU, RSUTMP
-from dandelion.schemas import (
-    RSUCreate,
-    RSUUpdate,
-    RSUUpdateWithBaseInfo,
-    RSUUpdateWithStatus,
-    RSUUpdateWithVersion,
+from dandelion.db import rsu_registry
+from dandelion.models import (
+    RSU,
+    RSUTMP,
+    Camera,
+    Lidar,
+    Radar,
+    RadarCamera,
+    RSIEvent,
+    RSUConfigRSU,
+    Spat,
 )
+from dandelion.schemas import RSUCreate, RSUUpdate
+
+# Rows of these models are detached from a deleted RSU instead of deleted with it
+DETACHED_MODELS: Tuple[Any, ...] = (
+    Camera,
+    Radar,
+    Lidar,
+    Spat,
+    RadarCamera,
+    RSIEvent,
+    RSUConfigRSU,
+)
+
+
+# Columns of the RSU cached by the registry
+REGISTRY_FIELDS = ("rsu_esn", "rsu_id", "enabled", "online_status")
 
 
 class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
     """"""
 
-    def update_online_status(
-        self, db: Session, *, db_obj: RSU, obj_in: RSUUpdateWithStatus
-    ) -> RSU:
-        obj_data = jsonable_encoder(db_obj, by_alias=False)
-        update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db_obj.update_time = datetime.utcnow()
-        db.add(db_obj)
+    def update_last_seen(self, db: Session, *, last_seen: Dict[str, datetime]) -> None:
+        # update_time is kept as is, last_seen is not a change of the RSU itself
+        stmt = (
+            update(self.model)
+            .where(self.model.rsu_esn == bindparam("esn"))
+            .values(last_seen=bindparam("seen"), update_time=self.model.update_time)
+        )
+        db.execute(stmt, [dict(esn=esn, seen=seen) for esn, seen in last_seen.items()])
         db.commit()
-        db.refresh(db_obj)
-        return db_obj
 
-    def update_with_version(
-        self, db: Session, *, db_obj: RSU, obj_in: RSUUpdateWithVersion
-    ) -> RSU:
-        obj_data = jsonable_encoder(db_obj, by_alias=False)
-        update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db_obj.update_time = datetime.utcnow()
-        db.add(db_obj)
+    def update_offline(self, db: Session, *, rsu_esns: List[str]) -> int:
+        """Mark the online RSUs among `rsu_esns` offline, return how many were."""
+        return self._update_online_status(db, rsu_esns, False)
+
+    def update_online(self, db: Session, *, rsu_esns: List[str]) -> int:
+        """Mark the offline RSUs among `rsu_esns` online, return how many were."""
+        return self._update_online_status(db, rsu_esns, True)
+
+    def _update_online_status(self, db: Session, rsu_esns: List[str], online: bool) -> int:
+        stmt = (
+            update(self.model)
+            .where(self.model.rsu_esn.in_(rsu_esns), self.model.online_status.is_(not online))
+            .values(online_status=online, update_time=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        count = db.execute(stmt).rowcount
         db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        if count:
+            rsu_registry.invalidate(*rsu_esns)
+        return count
 
-    def update_with_base_info(
-        self, db: Session, *, db_obj: RSU, obj_in: RSUUpdateWithBaseInfo
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: RSU,
+        obj_in: Union[BaseModel, Dict[str, Any]],
+        refresh: bool = True,
     ) -> RSU:
-        obj_data = jsonable_encoder(db_obj, by_alias=False)
-        update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db_obj.update_time = datetime.utcnow()
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-
-    def update_with_location(self, db: Session, *, db_obj: RSU, obj_in: RSUUpdate) -> RSU:
-        obj_data = jsonable_encoder(db_obj, by_alias=False)
-        update_data = obj_in.dict(exclude_unset=True)
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
         if update_data.get("lon") and update_data.get("lat"):
             update_data["location"] = {
                 "lon": float(update_data.pop("lon")),
                 "lat": float(update_data.pop("lat")),
             }
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db_obj.update_time = datetime.utcnow()
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        rsu_esn = db_obj.rsu_esn
+        changed = any(
+            field in update_data and update_data[field] != getattr(db_obj, field)
+            for field in REGISTRY_FIELDS
+        )
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data, refresh=refresh)
+        if changed:
+            rsu_registry.invalidate(rsu_esn, update_data.get("rsu_esn"))
         return db_obj
 
     def create_rsu(
@@ -109,14 +132,48 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        rsu_registry.invalidate(db_obj.rsu_esn)
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> RSU:
+        db_obj = super().remove(db, id=id)
+        if db_obj:
+            rsu_registry.invalidate(db_obj.rsu_esn)
+        return db_obj
+
+    def remove_multi(self, db: Session, *, ids: List[int]) -> int:
+        rsu_esns = [
+            rsu_esn for rsu_esn, in db.query(self.model.rsu_esn).filter(self.model.id.in_(ids))
+        ]
+        count = super().remove_multi(db, ids=ids)
+        rsu_registry.invalidate(*rsu_esns)
+        return count
+
+    def remove_dependents(self, db: Session, *, ids: List[int]) -> None:
+        rsu_query_result.remove_by_rsu_ids(db, rsu_ids=ids)
+        mng.remove_by_rsu_ids(db, rsu_ids=ids)
+        for model in DETACHED_MODELS:
+            db.query(model).filter(model.rsu_id.in_(ids)).update(
+                {model.rsu_id: None}, synchronize_session=False
+            )
+
     def get_first(self, db: Session) -> RSU:
         return db.query(self.model).first()
 
+    def get_rsu_esns(self, db: Session, *, online_status: Optional[bool] = None) -> List[str]:
+        query_ = db.query(self.model.rsu_esn)
+        if online_status is not None:
+            query_ = query_.filter(self.model.online_status == online_status)
+        return [rsu_esn for rsu_esn, in query_]
+
     def get_by_rsu_esn(self, db: Session, *, rsu_esn: str) -> RSU:
         return db.query(self.model).filter(self.model.rsu_esn == rsu_esn).first()
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        if profile == "mng":
+            return (selectinload(self.model.mng),)
+        return (joinedload(self.model.rsu_model),)
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -128,7 +185,8 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
         online_status: Optional[bool] = None,
         rsu_status: Optional[str] = None,
         enabled: Optional[bool] = None,
-    ) -> Tuple[int, List[RSU]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[RSU]]:
         query_ = db.query(self.model)
         if rsu_name is not None:
             query_ = self.fuzz_filter(query_, self.model.rsu_name, rsu_name)
@@ -140,11 +198,12 @@ class CRUDRSU(CRUDBase[RSU, RSUCreate, RSUUpdate]):
             query_ = query_.filter(self.model.rsu_status == rsu_status)
         if enabled is not None:
             query_ = query_.filter(self.model.enabled == enabled)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 rsu = CRUDRSU(RSU)
@@ -43,10 +43,9 @@ class CRUDRSUConfig(CRUDBase[RSUConfig, RSUConfigCreate, RSUConfigUpdate]):
     def update_rsu_config(
         self, db: Session, *, db_obj: RSUConfig, obj_in: RSUConfigUpdate, rsus: List[RSU]
     ) -> RSUConfig:
-        obj_data = jsonable_encoder(db_obj)
         del obj_in.rsus
         update_data = jsonable_encoder(obj_in, by_alias=True)
-        for field in obj_data:
+        for field in self.columns:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db_obj.rsus = [RSUConfigRSU.create(rsu_, db_obj) for rsu_ in rsus]
@@ -63,15 +62,15 @@ class CRUDRSUConfig(CRUDBase[RSUConfig, RSUConfigCreate, RSUConfigUpdate]):
         skip: int = 0,
         limit: int = 10,
         name: Optional[str] = None,
-    ) -> Tuple[int, List[RSUConfig]]:
+    ) -> Tuple[int, bool, List[RSUConfig]]:
         query_ = db.query(self.model)
         if name is not None:
             query_ = self.fuzz_filter(query_, self.model.name, name)
-        total = query_.count()
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 rsu_config = CRUDRSUConfig(RSUConfig)
@@ -15,10 +15,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Tuple
+from typing import Any, List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import RSU, RSULog
@@ -46,10 +46,9 @@ class CRUDRSULog(CRUDBase[RSULog, RSULogCreate, RSULogUpdate]):
     def update_rsu_log(
         self, db: Session, *, db_obj: RSULog, obj_in: RSULogUpdate, rsus: List[RSU]
     ) -> RSULog:
-        obj_data = jsonable_encoder(db_obj)
         del obj_in.rsus
         update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
+        for field in self.columns:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db_obj.rsus = rsus
@@ -59,19 +58,24 @@ class CRUDRSULog(CRUDBase[RSULog, RSULogCreate, RSULogUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (selectinload(self.model.rsus),)
+
     def get_multi_with_total(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 10,
-    ) -> Tuple[int, List[RSULog]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[RSULog]]:
         query_ = db.query(self.model)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 rsu_log = CRUDRSULog(RSULog)
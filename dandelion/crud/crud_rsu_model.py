@@ -34,17 +34,17 @@ class CRUDRSUModel(CRUDBase[RSUModel, RSUModelCreate, RSUModelUpdate]):
         limit: int = 10,
         name: Optional[str] = None,
         manufacturer: Optional[str] = None,
-    ) -> Tuple[int, List[RSUModel]]:
+    ) -> Tuple[int, bool, List[RSUModel]]:
         query_ = db.query(self.model)
         if name is not None:
             query_ = self.fuzz_filter(query_, self.model.name, name)
         if manufacturer is not None:
             query_ = self.fuzz_filter(query_, self.model.manufacturer, manufacturer)
-        total = query_.count()
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 rsu_model = CRUDRSUModel(RSUModel)
@@ -14,12 +14,13 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from dandelion.crud.base import CRUDBase
+from dandelion.crud.crud_rsu_query_result import rsu_query_result
 from dandelion.models import RSUQuery, RSUQueryResult
 from dandelion.schemas import RSUQueryCreate, RSUQueryUpdate
 
@@ -27,6 +28,16 @@ from dandelion.schemas import RSUQueryCreate, RSUQueryUpdate
 class CRUDRSUQuery(CRUDBase[RSUQuery, RSUQueryCreate, RSUQueryUpdate]):
     """"""
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (
+            selectinload(self.model.results).options(
+                joinedload(RSUQueryResult.rsu), selectinload(RSUQueryResult.data)
+            ),
+        )
+
+    def remove_dependents(self, db: Session, *, ids: List[int]) -> None:
+        rsu_query_result.remove_by_query_ids(db, query_ids=ids)
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -34,18 +45,20 @@ class CRUDRSUQuery(CRUDBase[RSUQuery, RSUQueryCreate, RSUQueryUpdate]):
         skip: int = 0,
         limit: int = 10,
         rsu_id: Optional[int] = None,
-    ) -> Tuple[int, List[RSUQuery]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[RSUQuery]]:
         query_ = db.query(self.model).join(
             RSUQueryResult, RSUQueryResult.query_id == self.model.id
         )
         if rsu_id is not None:
             query_ = query_.filter(RSUQueryResult.rsu_id == rsu_id)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         query_ = query_.order_by(desc(self.model.id))
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
     def create(self, db: Session, *, obj_in: RSUQueryCreate) -> RSUQuery:
         db_obj = RSUQuery()
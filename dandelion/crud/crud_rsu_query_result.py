@@ -14,12 +14,13 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, List
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
-from dandelion.models import RSUQueryResult
+from dandelion.models import RSUQueryResult, RSUQueryResultData
 from dandelion.schemas import RSUQueryResultCreate, RSUQueryResultUpdate
 
 
@@ -32,5 +33,19 @@ class CRUDRSUQueryResult(CRUDBase[RSUQueryResult, RSUQueryResultCreate, RSUQuery
     def get_multi_by_query_id(self, db: Session, *, query_id: int) -> List[RSUQueryResult]:
         return db.query(RSUQueryResult).filter(RSUQueryResult.query_id == query_id).all()
 
+    def remove_by(self, db: Session, *criteria: Any) -> int:
+        """Delete the results matching the criteria with their data, without committing."""
+        result_ids = select(self.model.id).where(*criteria)
+        db.query(RSUQueryResultData).filter(RSUQueryResultData.result_id.in_(result_ids)).delete(
+            synchronize_session=False
+        )
+        return db.query(self.model).filter(*criteria).delete(synchronize_session=False)
+
+    def remove_by_rsu_ids(self, db: Session, *, rsu_ids: List[int]) -> int:
+        return self.remove_by(db, self.model.rsu_id.in_(rsu_ids))
+
+    def remove_by_query_ids(self, db: Session, *, query_ids: List[int]) -> int:
+        return self.remove_by(db, self.model.query_id.in_(query_ids))
+
 
 rsu_query_result = CRUDRSUQueryResult(RSUQueryResult)
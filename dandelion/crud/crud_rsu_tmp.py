@@ -20,6 +20,7 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from dandelion.crud.base import CRUDBase
+from dandelion.db import rsu_registry
 from dandelion.models import RSUTMP
 from dandelion.schemas import RSUTMPCreate, RSUTMPUpdate
 
@@ -33,6 +34,13 @@ class CRUDRSUTMP(CRUDBase[RSUTMP, RSUTMPCreate, RSUTMPUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        rsu_registry.invalidate(db_obj.rsu_esn)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> RSUTMP:
+        db_obj = super().remove(db, id=id)
+        if db_obj:
+            rsu_registry.invalidate(db_obj.rsu_esn)
         return db_obj
 
     def get_multi_with_total(
@@ -43,17 +51,17 @@ class CRUDRSUTMP(CRUDBase[RSUTMP, RSUTMPCreate, RSUTMPUpdate]):
         limit: int = 10,
         rsu_name: Optional[str] = None,
         rsu_esn: Optional[str] = None,
-    ) -> Tuple[int, List[RSUTMP]]:
+    ) -> Tuple[int, bool, List[RSUTMP]]:
         query_ = db.query(self.model)
         if rsu_name is not None:
             query_ = self.fuzz_filter(query_, self.model.rsu_name, rsu_name)
         if rsu_esn is not None:
             query_ = query_.filter(self.model.rsu_esn == rsu_esn)
-        total = query_.count()
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
 
 rsu_tmp = CRUDRSUTMP(RSUTMP)
@@ -17,7 +17,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from dandelion.crud.base import CRUDBase
 from dandelion.models import Spat
@@ -35,6 +35,9 @@ class CRUDSpat(CRUDBase[Spat, SpatCreate, SpatUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def load_options(self, profile: str) -> Tuple[Any, ...]:
+        return (joinedload(self.model.rsu),)
+
     def get_multi_with_total(
         self,
         db: Session,
@@ -44,7 +47,8 @@ class CRUDSpat(CRUDBase[Spat, SpatCreate, SpatUpdate]):
         intersection_id: Optional[str] = None,
         name: Optional[str] = None,
         rsu_id: Optional[int] = None,
-    ) -> Tuple[int, List[Spat]]:
+        profile: Optional[str] = "list",
+    ) -> Tuple[int, bool, List[Spat]]:
         query_ = db.query(self.model)
         if intersection_id is not None:
             query_ = self.fuzz_filter(query_, self.model.intersection_id, intersection_id)
@@ -52,11 +56,12 @@ class CRUDSpat(CRUDBase[Spat, SpatCreate, SpatUpdate]):
             query_ = self.fuzz_filter(query_, self.model.name, name)
         if rsu_id is not None:
             query_ = query_.filter(self.model.rsu_id == rsu_id)
-        total = query_.count()
+        query_ = self.load(query_, profile)
+        total, exact = self.count(query_)
         if limit != -1:
             query_ = query_.offset(skip).limit(limit)
         data = query_.all()
-        return total, data
+        return total, exact, data
 
     def filter(self, db: Session, intersection_id, phase_id) -> Spat:
         return (
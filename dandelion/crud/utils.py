@@ -14,17 +14,28 @@
 
 from __future__ import annotations
 
+import gzip
 import json
-from typing import Dict
+from typing import Dict, NamedTuple
 
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
 from dandelion.api.deps import get_redis_conn
+from dandelion.db import generation, session
 from dandelion.models import MNG
 from dandelion.models.mng import Reboot
 from dandelion.util import ALGO_CONFIG
 
+PCD_KEY = "PCD_DATA"
+PCD_TABLES = ("country", "province", "city", "area")
+
+
+class PCD(NamedTuple):
+    version: str
+    data: bytes
+    gzip: bytes
+
 
 def get_mng_default() -> MNG:
     mng = MNG()
@@ -55,24 +66,38 @@ def pca_data_deal(data_all, code, next_=None):
     return data_
 
 
-def pca_data(db: Session):
-    # 获取 省市区三级数据
+def pca_data(db: Session) -> PCD:
+    """Tree of the countries, provinces, cities and areas, encoded as JSON and gzip.
+
+    The tree is built and encoded once per version of its tables, the version
+    being their generations, and then stored in Redis until they change.
+    """
     redis_conn = get_redis_conn()
-    redis_data = redis_conn.get("PCD_DATA")
-    if not redis_data:
-        countries = crud.country.get_multi(db)
-        provinces = crud.province.get_multi(db)
-        citys = crud.city.get_multi_with_total(db)
-        areas = crud.area.get_multi_with_total(db)
-        area_ = pca_data_deal(areas, "city_code")
-        city_ = pca_data_deal(citys, "province_code", area_)
-        province_ = pca_data_deal(provinces, "country_code", city_)
-        redis_data = json.dumps(
-            [{**co.to_dict(), "children": province_.get(co.code, [])} for co in countries]
-        )
-        redis_conn.set("PCD_DATA", redis_data)
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.mget([generation.key(table) for table in PCD_TABLES])
+    pipe.hmget(PCD_KEY, "version", "data", "gzip")
+    generations, (cached_version, data, gzip_data) = pipe.execute()
+    version = ",".join(str(int(value or 0)) for value in generations)
+    if cached_version is not None and cached_version.decode("utf-8") == version:
+        return PCD(version, data, gzip_data)
 
-    return json.loads(redis_data)
+    # Kept until the tables change, so it must not be built from a lagging replica
+    session.stick_to_primary(db)
+    countries = crud.country.get_multi(db)
+    provinces = crud.province.get_multi(db)
+    citys = crud.city.get_multi_with_total(db)
+    areas = crud.area.get_multi_with_total(db)
+    area_ = pca_data_deal(areas, "city_code")
+    city_ = pca_data_deal(citys, "province_code", area_)
+    province_ = pca_data_deal(provinces, "country_code", city_)
+    data = json.dumps(
+        [{**co.to_dict(), "children": province_.get(co.code, [])} for co in countries],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    gzip_data = gzip.compress(data, mtime=0)
+    redis_conn.hset(PCD_KEY, mapping={"version": version, "data": data, "gzip": gzip_data})
+    return PCD(version, data, gzip_data)
 
 
 def algo_module_name(db, algo_version_in, update=False):
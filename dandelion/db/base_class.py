@@ -31,3 +31,9 @@ class DandelionBase:
         default=lambda: datetime.utcnow(),
         onupdate=lambda: datetime.utcnow(),
     )
+
+
+class EventBase(DandelionBase):
+    """Base of the event tables, whose rows are purged and exported by create time."""
+
+    create_time = Column(DateTime, nullable=False, index=True, default=lambda: datetime.utcnow())
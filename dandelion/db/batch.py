@@ -0,0 +1,218 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from logging import LoggerAdapter
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from oslo_config import cfg
+from oslo_log import log
+from sqlalchemy.orm import Session
+
+from dandelion.core import metrics
+from dandelion.db import session
+from dandelion.db.base_class import Base
+
+CONF: cfg = cfg.CONF
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+# (child model, foreign key column, child rows)
+Children = Tuple[Type[Base], str, List[Dict[str, Any]]]
+Item = Tuple[Dict[str, Any], Optional[Children]]
+
+WRITER: Optional[BulkWriter] = None
+
+BATCH_FLUSHES = metrics.counter("db.batch.flushes")
+BATCH_ROWS = metrics.counter("db.batch.rows")
+BATCH_FAILED_ROWS = metrics.counter("db.batch.failed_rows")
+BATCH_FLUSH_TIME = metrics.timer("db.batch.flush_seconds")
+BATCH_BLOCKED_TIME = metrics.timer("db.batch.blocked_seconds")
+
+
+def write_rows(db: Session, items: Dict[Type[Base], List[Item]]) -> int:
+    total = 0
+    child_rows: Dict[Type[Base], List[Dict[str, Any]]] = defaultdict(list)
+    for model, model_items in items.items():
+        # Rows of one executemany must share the same columns
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+        for row, children in model_items:
+            if children is None:
+                groups[tuple(sorted(row))].append(row)
+                continue
+            # The parent id is needed by the children, so parents go one by one
+            result = db.execute(model.__table__.insert(), row)
+            child_model, foreign_key, rows_ = children
+            parent_id = result.inserted_primary_key[0]
+            child_rows[child_model].extend({**r, foreign_key: parent_id} for r in rows_)
+            total += 1
+        for rows in groups.values():
+            db.execute(model.__table__.insert(), rows)
+            total += len(rows)
+    for child_model, rows_ in child_rows.items():
+        groups = defaultdict(list)
+        for row in rows_:
+            groups[tuple(sorted(row))].append(row)
+        for rows in groups.values():
+            db.execute(child_model.__table__.insert(), rows)
+            total += len(rows)
+    db.commit()
+    return total
+
+
+class BulkWriter(object):
+    """Write-behind buffer turning single row inserts into multi-row INSERTs.
+
+    Rows are flushed when ``batch_size`` rows are pending or the oldest
+    pending row waited ``flush_interval`` seconds. Producers block once
+    ``max_pending`` rows are buffered. A failing flush is retried by halves,
+    so that only the failing rows are skipped.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, batch_size)
+        self.pending: Dict[Type[Base], List[Item]] = defaultdict(list)
+        self.count = 0
+        self.oldest = 0.0
+        self.running = False
+        self.cond = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+        metrics.gauge("db.batch.pending", lambda: self.count)
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="db-bulk-writer", daemon=True)
+        self.thread.start()
+        LOG.info(
+            f"Bulk writer started [batch_size: {self.batch_size}, "
+            f"flush_interval: {self.flush_interval}s]"
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def add(self, model: Type[Base], row: Dict[str, Any], children: Optional[Children] = None):
+        size = 1 + (len(children[2]) if children else 0)
+        with self.cond:
+            if self.count >= self.max_pending:
+                started = time.monotonic()
+                while self.count >= self.max_pending and self.running:
+                    self.cond.wait()
+                BATCH_BLOCKED_TIME.observe(time.monotonic() - started)
+            if not self.count:
+                self.oldest = time.monotonic()
+            self.pending[model].append((row, children))
+            self.count += size
+            if self.count >= self.batch_size:
+                self.cond.notify_all()
+
+    def _take(self) -> Tuple[Dict[Type[Base], List[Item]], int]:
+        with self.cond:
+            while self.running:
+                if self.count >= self.batch_size:
+                    break
+                if self.count:
+                    remaining = self.oldest + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                else:
+                    self.cond.wait()
+            items, count = self.pending, self.count
+            self.pending, self.count = defaultdict(list), 0
+            self.cond.notify_all()
+            return items, count
+
+    def _run(self) -> None:
+        while True:
+            items, count = self._take()
+            if count:
+                self.flush(items)
+            if not self.running:
+                return
+
+    @classmethod
+    def flush(cls, items: Dict[Type[Base], List[Item]]) -> None:
+        started = time.monotonic()
+        try:
+            cls._write(
+                [(model, item) for model, model_items in items.items() for item in model_items]
+            )
+        finally:
+            BATCH_FLUSHES.inc()
+            BATCH_FLUSH_TIME.observe(time.monotonic() - started)
+
+    @classmethod
+    def _write(cls, items: List[Tuple[Type[Base], Item]]) -> None:
+        """Write the items in one transaction, or by halves if it fails.
+
+        The halves are split again until the failing items are written alone,
+        so that only them are skipped.
+        """
+        grouped: Dict[Type[Base], List[Item]] = defaultdict(list)
+        for model, item in items:
+            grouped[model].append(item)
+        try:
+            with session.session_scope() as db:
+                BATCH_ROWS.inc(write_rows(db, grouped))
+            return
+        except Exception as ex:
+            if len(items) == 1:
+                model, (row, children) = items[0]
+                BATCH_FAILED_ROWS.inc(1 + (len(children[2]) if children else 0))
+                LOG.error(f"Bulk write of {model.__tablename__} row skipped: {ex} [row: {row}]")
+                return
+            LOG.debug(f"Bulk write of {len(items)} rows failed, retrying by halves: {ex}")
+        middle = len(items) // 2
+        cls._write(items[:middle])
+        cls._write(items[middle:])
+
+
+def setup_writer() -> None:
+    global WRITER
+    database_conf = CONF.database
+    if WRITER is not None or database_conf.write_batch_size <= 0:
+        return
+    WRITER = BulkWriter(
+        database_conf.write_batch_size,
+        database_conf.write_batch_interval / 1000.0,
+        database_conf.write_batch_max_pending,
+    )
+    WRITER.start()
+
+
+def stop_writer() -> None:
+    global WRITER
+    if WRITER is not None:
+        WRITER.stop()
+        WRITER = None
+
+
+def add(model: Type[Base], row: Dict[str, Any], children: Optional[Children] = None) -> None:
+    if WRITER is not None:
+        WRITER.add(model, row, children)
+        return
+    with session.session_scope() as db:
+        write_rows(db, {model: [(row, children)]})
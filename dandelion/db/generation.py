@@ -0,0 +1,93 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import uuid
+from itertools import chain
+from logging import LoggerAdapter
+from typing import Any, Iterable, Set
+
+from oslo_log import log
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+from dandelion.db import redis_pool
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+GENERATION_PREFIX = "TABLE_GEN_"
+# Random value telling apart the generations of a Redis from those it had before a flush
+EPOCH_KEY = "TABLE_GEN_EPOCH"
+
+
+def key(table: str) -> str:
+    return f"{GENERATION_PREFIX}{table}"
+
+
+def stamp(tables: Iterable[str]) -> str:
+    """Epoch and current generations of the tables, changed by any committed write.
+
+    Generations start over from 0 when Redis loses its keys, the epoch is
+    renewed then, so that a stamp taken before is never seen again.
+    """
+    pipe = redis_pool.REDIS_CONN.pipeline(transaction=False)
+    pipe.set(EPOCH_KEY, uuid.uuid4().hex, nx=True)
+    pipe.get(EPOCH_KEY)
+    pipe.mget([key(table) for table in tables])
+    _, epoch, values = pipe.execute()
+    generations = ",".join(str(int(value or 0)) for value in values)
+    return f"{epoch.decode('utf-8')}:{generations}"
+
+
+def bump(tables: Iterable[str]) -> None:
+    pipe = redis_pool.REDIS_CONN.pipeline(transaction=False)
+    for table in tables:
+        pipe.incr(key(table))
+    pipe.execute()
+
+
+def _written_tables(db: Session) -> Set[str]:
+    return db.info.setdefault("written_tables", set())
+
+
+def setup_listeners(session_factory: sessionmaker) -> None:
+    """Bump the generation of the tables written by a session once it commits."""
+
+    @event.listens_for(session_factory, "after_flush")
+    def _after_flush(db: Session, flush_context: Any) -> None:
+        for obj in chain(db.new, db.dirty, db.deleted):
+            _written_tables(db).add(obj.__table__.name)
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+        if not orm_execute_state.is_select:
+            table = getattr(orm_execute_state.statement, "table", None)
+            if table is not None:
+                _written_tables(orm_execute_state.session).add(table.name)
+
+    @event.listens_for(session_factory, "after_commit")
+    def _after_commit(db: Session) -> None:
+        tables = db.info.pop("written_tables", None)
+        if not tables:
+            return
+        try:
+            bump(tables)
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to bump generation of tables {sorted(tables)}: {ex}")
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _after_rollback(db: Session) -> None:
+        db.info.pop("written_tables", None)
@@ -0,0 +1,190 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import functools
+import threading
+import uuid
+from logging import LoggerAdapter
+from typing import Any, Callable, Optional, TypeVar
+
+import redis
+from oslo_log import log
+
+from dandelion.core import metrics
+from dandelion.db import redis_pool
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Take the lease if free, with a fencing token greater than any before
+ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+local fence = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return fence
+"""
+# Extend the lease only if it is still held by the caller
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+# Delete the lease only if it is still held by the caller
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseLost(Exception):
+    """The lease was acquired by another process since, the write is rejected."""
+
+
+class Lease(object):
+    """Lease on a name held in Redis by at most one process at a time.
+
+    The holder has to call `acquire` again within `ttl` seconds to keep the
+    lease, otherwise it expires and any other process may acquire it.
+    Every acquisition gets a fencing token `fence` greater than the previous
+    ones. The writes made through `fenced_pipeline` are rejected once the
+    token is no longer the last one, so that a holder superseded after
+    missing a renewal cannot overwrite the writes of the new one.
+    """
+
+    def __init__(self, name: str, ttl: float) -> None:
+        self.key = f"LEASE_{name}"
+        self.fence_key = f"LEASE_FENCE_{name}"
+        self.ttl_ms = int(ttl * 1000)
+        self.holder = uuid.uuid4().hex
+        self.fence = 0
+
+    @property
+    def held(self) -> bool:
+        return self.fence > 0
+
+    def acquire(self) -> bool:
+        """Acquire the lease, or renew it if already held."""
+        redis_conn = redis_pool.REDIS_CONN
+        if self.held:
+            if not redis_conn.eval(RENEW_SCRIPT, 1, self.key, self.holder, self.ttl_ms):
+                LOG.warn(f"Lease {self.key} lost [fence: {self.fence}]")
+                self.fence = 0
+        else:
+            self.fence = int(
+                redis_conn.eval(
+                    ACQUIRE_SCRIPT, 2, self.key, self.fence_key, self.holder, self.ttl_ms
+                )
+            )
+            if self.held:
+                LOG.info(f"Lease {self.key} acquired [fence: {self.fence}]")
+        return self.held
+
+    def check(self) -> bool:
+        """Whether the lease is still held, as seen by Redis."""
+        value = redis_pool.REDIS_CONN.get(self.key)
+        return self.held and value is not None and value.decode("utf-8") == self.holder
+
+    def fenced_pipeline(self) -> redis.client.Pipeline:
+        """Transaction applied only if no other process acquired the lease since.
+
+        The fencing counter is watched, `execute` raises `redis.WatchError` if
+        it changes before. Raises `LeaseLost` if it already did.
+        """
+        redis_conn = redis_pool.REDIS_CONN
+        pipe = redis_conn.pipeline()
+        pipe.watch(self.fence_key)
+        if not self.held or int(redis_conn.get(self.fence_key) or 0) != self.fence:
+            pipe.reset()
+            raise LeaseLost(f"Lease {self.key} lost [fence: {self.fence}]")
+        pipe.multi()
+        return pipe
+
+    def release(self) -> None:
+        if self.held:
+            redis_pool.REDIS_CONN.eval(RELEASE_SCRIPT, 1, self.key, self.holder)
+            LOG.info(f"Lease {self.key} released [fence: {self.fence}]")
+            self.fence = 0
+
+
+def leader_only(
+    name: str, ttl: float, fenced: bool = False
+) -> Callable[[Callable[..., T]], Callable[..., Optional[T]]]:
+    """Run the decorated periodic task only in the process holding its lease.
+
+    Every task has its own lease, so the tasks spread over the members of the
+    cluster. The lease is kept between two runs as long as the task is run
+    again within `ttl` seconds, and is renewed while the task is running.
+
+    If `fenced`, the lease is passed to the task as first argument, for its
+    Redis writes to go through `Lease.fenced_pipeline`. A task superseded
+    meanwhile is stopped at its first rejected write. The tasks which are not
+    fenced have to make idempotent writes only.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., Optional[T]]:
+        lease = Lease(f"TASK_{name}", ttl)
+        runs = metrics.counter(f"tasks.{name}.runs")
+        skips = metrics.counter(f"tasks.{name}.skips")
+        metrics.gauge(f"tasks.{name}.leader", lambda: int(lease.held))
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Optional[T]:
+            try:
+                acquired = lease.acquire()
+            except Exception as ex:  # noqa
+                LOG.warn(f"Failed to acquire lease of task {name}: {ex}")
+                acquired = False
+            if not acquired:
+                skips.inc()
+                return None
+            runs.inc()
+            stopped = threading.Event()
+            renewer = threading.Thread(
+                target=_renew, args=(lease, stopped), name=f"lease-{name}", daemon=True
+            )
+            renewer.start()
+            try:
+                if fenced:
+                    return func(lease, *args, **kwargs)
+                return func(*args, **kwargs)
+            except (LeaseLost, redis.WatchError):
+                LOG.warn(f"Task {name} superseded by another process, its writes were rejected")
+                return None
+            finally:
+                stopped.set()
+                renewer.join()
+                if not lease.held:
+                    LOG.warn(f"Task {name} outlived its lease, it may have run concurrently")
+
+        return wrapper
+
+    return decorator
+
+
+def _renew(lease: Lease, stopped: threading.Event) -> None:
+    interval = lease.ttl_ms / 3000
+    while not stopped.wait(interval) and lease.held:
+        try:
+            lease.acquire()
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to renew lease {lease.key}: {ex}")
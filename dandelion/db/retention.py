@@ -0,0 +1,185 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+from logging import LoggerAdapter
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from oslo_config import cfg
+from oslo_log import log
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+
+from dandelion.core import metrics
+from dandelion.db import session
+from dandelion.db.base_class import Base
+from dandelion.models import (
+    CGW,
+    OSW,
+    RDW,
+    RSICLC,
+    RSICWM,
+    RSIDNP,
+    RSISDS,
+    RSM,
+    SSW,
+    Participants,
+    RSIEvent,
+)
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = cfg.CONF
+
+EVENT_MODELS: Tuple[Type[Base], ...] = (
+    Participants,
+    RSM,
+    RSIEvent,
+    RSICWM,
+    RSICLC,
+    RSISDS,
+    RSIDNP,
+    CGW,
+    OSW,
+    SSW,
+    RDW,
+)
+# Rows referencing the purged rows, deleted along with them
+CHILDREN: Dict[Type[Base], Tuple[Tuple[Type[Base], Any], ...]] = {
+    RSM: ((Participants, Participants.rsm_id),),
+}
+MAX_PARTITION = "pmax"
+
+PURGED_ROWS = metrics.counter("retention.purged_rows")
+DROPPED_PARTITIONS = metrics.counter("retention.dropped_partitions")
+
+
+def retention_days(table: str) -> int:
+    """Days the rows of the table are kept, 0 to keep them forever."""
+    return int(CONF.retention.table_retention.get(table, CONF.retention.event_retention))
+
+
+def to_days(day: date) -> int:
+    """Day number as computed by MySQL TO_DAYS()."""
+    return day.toordinal() + 365
+
+
+def from_days(days: int) -> date:
+    return date.fromordinal(days - 365)
+
+
+def purge(db: Session, model: Type[Base], cutoff: datetime, batch_size: int) -> int:
+    """Delete the rows created before `cutoff` by batches, return how many were."""
+    interval = CONF.retention.purge_batch_interval / 1000
+    count = 0
+    while True:
+        # Expired rows are read in the order of the create_time index, so that
+        # the scan stops after the batch even once they have all been purged.
+        ids = [
+            id_
+            for id_, in db.query(model.id)
+            .filter(model.create_time < cutoff)
+            .order_by(model.create_time)
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+        for child, column in CHILDREN.get(model, ()):
+            db.execute(
+                delete(child).where(column.in_(ids)).execution_options(synchronize_session=False)
+            )
+        db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        count += len(ids)
+        if len(ids) < batch_size:
+            break
+        time.sleep(interval)
+    PURGED_ROWS.inc(count)
+    return count
+
+
+def partitions(db: Session, table: str) -> List[Tuple[str, Optional[int]]]:
+    """Name and TO_DAYS() upper bound of the partitions of the table, None for MAXVALUE."""
+    rows = db.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table": table},
+    )
+    return [(name, None if bound == "MAXVALUE" else int(bound)) for name, bound in rows]
+
+
+def maintain_partitions(db: Session, table: str, cutoff: Optional[datetime], today: date) -> int:
+    """Drop the daily partitions past the retention and create the next ones.
+
+    Return how many partitions were dropped, none without `cutoff`. Tables
+    that are not partitioned are left as is.
+    """
+    parts = partitions(db, table)
+    if not parts:
+        return 0
+    # A partition only holds rows created before the day of its bound
+    expired = [
+        name
+        for name, bound in parts
+        if cutoff is not None
+        and bound is not None
+        and datetime.combine(from_days(bound), datetime.min.time()) <= cutoff
+    ]
+    if expired:
+        db.execute(text(f"ALTER TABLE {table} DROP PARTITION {', '.join(expired)}"))
+        DROPPED_PARTITIONS.inc(len(expired))
+        LOG.info(f"Dropped partitions {', '.join(expired)} of {table}")
+
+    bounds = [bound for name, bound in parts if bound is not None and name not in expired]
+    last = max(bounds) if bounds else to_days(today)
+    target = to_days(today + timedelta(days=CONF.retention.partition_days_ahead + 1))
+    if last < target:
+        created = [
+            f"PARTITION p{from_days(bound - 1):%Y%m%d} VALUES LESS THAN ({bound})"
+            for bound in range(last + 1, target + 1)
+        ]
+        db.execute(
+            text(
+                f"ALTER TABLE {table} REORGANIZE PARTITION {MAX_PARTITION} INTO "
+                f"({', '.join(created)}, PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE)"
+            )
+        )
+    db.commit()
+    return len(expired)
+
+
+def purge_expired() -> None:
+    now = datetime.utcnow()
+    for model in EVENT_MODELS:
+        table = model.__tablename__
+        days = retention_days(table)
+        cutoff = now - timedelta(days=days) if days else None
+        with session.session_scope() as db:
+            # Partitions are created ahead even if kept forever, so that rows
+            # do not pile up in the last one.
+            if db.get_bind().dialect.name == "mysql":
+                maintain_partitions(db, table, cutoff, now.date())
+            if cutoff is None:
+                continue
+            count = purge(db, model, cutoff, CONF.retention.purge_batch_size)
+        if count:
+            LOG.info(f"Purged {count} rows of {table} created before {cutoff}")
@@ -0,0 +1,166 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import threading
+import time
+from logging import LoggerAdapter
+from typing import List, Optional
+
+import redis
+from oslo_log import log
+
+from dandelion import constants, crud
+from dandelion.core import metrics
+from dandelion.db import lease, redis_pool, session
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+WATCHER: Optional[OfflineWatcher] = None
+
+LEASE_TTL: int = 15
+BATCH_SIZE: int = 1000
+
+OFFLINE_EVENTS = metrics.counter("rsu_online.expired_events")
+OFFLINE_UPDATES = metrics.counter("rsu_online.offline_updates")
+OFFLINE_REVERTS = metrics.counter("rsu_online.offline_reverts")
+
+
+def _offline_esns(redis_conn: redis.Redis, rsu_esns: List[str]) -> List[str]:
+    onlines = redis_conn.mget([f"{constants.RSU_ONLINE_PREFIX}{rsu_esn}" for rsu_esn in rsu_esns])
+    return [rsu_esn for rsu_esn, online in zip(rsu_esns, onlines) if online is None]
+
+
+def mark_offline(redis_conn: redis.Redis, rsu_esns: List[str]) -> int:
+    """Mark offline the RSUs whose online key is gone, return how many were online."""
+    if not rsu_esns:
+        return 0
+    # The RSU may have sent a heartbeat again since
+    offline_esns = _offline_esns(redis_conn, rsu_esns)
+    if not offline_esns:
+        return 0
+    with session.session_scope() as db:
+        count = crud.rsu.update_offline(db, rsu_esns=offline_esns)
+        if count:
+            # A heartbeat sent meanwhile found the RSU still online in the database,
+            # so it did not bring it back online. The later ones see it offline.
+            still_offline = set(_offline_esns(redis_conn, offline_esns))
+            back_esns = [rsu_esn for rsu_esn in offline_esns if rsu_esn not in still_offline]
+            if back_esns:
+                OFFLINE_REVERTS.inc(crud.rsu.update_online(db, rsu_esns=back_esns))
+    OFFLINE_UPDATES.inc(count)
+    if count:
+        LOG.info(f"{count} RSUs went offline")
+    return count
+
+
+def enable_notifications(redis_conn: redis.Redis) -> None:
+    """Enable the keyevent notifications of expired keys if they are not."""
+    flags = redis_conn.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+    if "E" in flags and ("x" in flags or "A" in flags):
+        return
+    redis_conn.config_set("notify-keyspace-events", "".join(sorted(set(flags) | {"E", "x"})))
+    LOG.info("Redis keyevent notifications of expired keys enabled")
+
+
+class OfflineWatcher(object):
+    """Marks RSUs offline as soon as their online key expires.
+
+    Expirations are published by Redis as keyevent notifications. Only the
+    worker holding the watcher lease handles them, the others stand by to
+    take over. Notifications are not delivered while nobody is subscribed,
+    the periodic reconciliation catches the RSUs missed meanwhile.
+    """
+
+    def __init__(self, lease_ttl: int) -> None:
+        self.lease = lease.Lease("RSU_OFFLINE_WATCHER", lease_ttl)
+        self.interval = lease_ttl / 3
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        metrics.gauge("rsu_online.watching", lambda: int(self.lease.held))
+
+    def start(self) -> None:
+        try:
+            enable_notifications(redis_pool.REDIS_CONN)
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to enable Redis keyevent notifications: {ex}")
+        self.thread = threading.Thread(target=self._run, name="rsu-offline", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        try:
+            self.lease.release()
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to release RSU offline watcher lease: {ex}")
+
+    def _acquire(self) -> bool:
+        try:
+            return self.lease.acquire()
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to acquire RSU offline watcher lease: {ex}")
+            return False
+
+    def _run(self) -> None:
+        while not self.stopped.is_set():
+            if self._acquire():
+                self._watch()
+            else:
+                self.stopped.wait(self.interval)
+
+    def _watch(self) -> None:
+        redis_conn: redis.Redis = redis_pool.REDIS_CONN
+        db = redis_conn.connection_pool.connection_kwargs.get("db", 0)
+        pubsub = redis_conn.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(f"__keyevent@{db}__:expired")
+            LOG.info("Watching RSU online keys expiration")
+            renew_at = time.monotonic() + self.interval
+            while not self.stopped.is_set():
+                rsu_esns = []
+                message = pubsub.get_message(timeout=1.0)
+                while message is not None:
+                    key = message["data"].decode("utf-8")
+                    if key.startswith(constants.RSU_ONLINE_PREFIX):
+                        rsu_esns.append(key[len(constants.RSU_ONLINE_PREFIX) :])
+                    if len(rsu_esns) >= BATCH_SIZE:
+                        break
+                    message = pubsub.get_message(timeout=0.0)
+                OFFLINE_EVENTS.inc(len(rsu_esns))
+                mark_offline(redis_conn, rsu_esns)
+                if time.monotonic() >= renew_at:
+                    if not self._acquire():
+                        LOG.warn("No longer watching RSU online keys expiration")
+                        return
+                    renew_at = time.monotonic() + self.interval
+        except Exception as ex:  # noqa
+            LOG.warn(f"RSU online keys expiration watch lost: {ex}")
+            self.stopped.wait(1.0)
+        finally:
+            pubsub.close()
+
+
+def setup_watcher() -> None:
+    global WATCHER
+    WATCHER = OfflineWatcher(LEASE_TTL)
+    WATCHER.start()
+
+
+def stop_watcher() -> None:
+    if WATCHER is not None:
+        WATCHER.stop()
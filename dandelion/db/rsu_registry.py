@@ -0,0 +1,233 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from logging import LoggerAdapter
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+
+from oslo_log import log
+
+from dandelion import constants
+from dandelion.core import metrics
+from dandelion.db import redis_pool, session
+from dandelion.models import RSU, RSUTMP
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+REGISTRY: Optional[RSURegistry] = None
+
+REGISTRY_HITS = metrics.counter("rsu_registry.hits")
+REGISTRY_NEGATIVE_HITS = metrics.counter("rsu_registry.negative_hits")
+REGISTRY_MISSES = metrics.counter("rsu_registry.misses")
+REGISTRY_INVALIDATIONS = metrics.counter("rsu_registry.invalidations")
+
+RSU_LOOKUP = "rsu"
+TMP_LOOKUP = "tmp"
+
+
+class RSUEntry(NamedTuple):
+    id: int
+    rsu_id: str
+    enabled: bool
+    online: bool
+
+
+def _query_rsu(rsu_esn: str) -> Optional[RSUEntry]:
+    with session.session_scope() as db:
+        row = (
+            db.query(RSU.id, RSU.rsu_id, RSU.enabled, RSU.online_status)
+            .filter(RSU.rsu_esn == rsu_esn)
+            .first()
+        )
+    return None if row is None else RSUEntry(*row)
+
+
+def _query_tmp(rsu_esn: str) -> bool:
+    with session.session_scope() as db:
+        return db.query(RSUTMP.id).filter(RSUTMP.rsu_esn == rsu_esn).first() is not None
+
+
+class RSURegistry(object):
+    """In-process view of the registered RSUs keyed by ESN.
+
+    Unknown ESNs are cached as well for `negative_ttl` seconds, so that
+    messages from unregistered devices do not reach the database. At most
+    `negative_size` of them are kept, the least recently seen are dropped
+    first. Entries are dropped when any worker publishes an invalidation and
+    are loaded again on the next lookup.
+    """
+
+    def __init__(self, negative_ttl: float, negative_size: int) -> None:
+        self.negative_ttl = negative_ttl
+        self.negative_size = negative_size
+        self.lock = threading.Lock()
+        self.rsus: Dict[str, RSUEntry] = {}
+        self.tmps: Set[str] = set()
+        # Expiry of the unknown ESNs, by lookup (RSU or TMP RSU) and ESN, oldest first
+        self.missing: OrderedDict[Tuple[str, str], float] = OrderedDict()
+        self.generation = 0
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        metrics.gauge("rsu_registry.size", lambda: len(self.rsus))
+        metrics.gauge("rsu_registry.negative_size", lambda: len(self.missing))
+
+    def load(self) -> None:
+        with session.session_scope() as db:
+            rsus = db.query(RSU.rsu_esn, RSU.id, RSU.rsu_id, RSU.enabled, RSU.online_status)
+            tmps = db.query(RSUTMP.rsu_esn)
+            with self.lock:
+                self.rsus = {row[0]: RSUEntry(*row[1:]) for row in rsus}
+                self.tmps = {row[0] for row in tmps}
+                self.missing = OrderedDict()
+                self.generation += 1
+        LOG.info(f"RSU registry loaded with {len(self.rsus)} RSUs, {len(self.tmps)} TMP RSUs")
+
+    def get(self, rsu_esn: str) -> Optional[RSUEntry]:
+        with self.lock:
+            entry = self.rsus.get(rsu_esn)
+            if entry is not None:
+                REGISTRY_HITS.inc()
+                return entry
+            if self._is_missing(RSU_LOOKUP, rsu_esn):
+                REGISTRY_NEGATIVE_HITS.inc()
+                return None
+            generation = self.generation
+        REGISTRY_MISSES.inc()
+        entry = _query_rsu(rsu_esn)
+        with self.lock:
+            # Do not cache what has been invalidated while querying
+            if generation == self.generation:
+                if entry is None:
+                    self._add_missing(RSU_LOOKUP, rsu_esn)
+                else:
+                    self.rsus[rsu_esn] = entry
+        return entry
+
+    def is_tmp(self, rsu_esn: str) -> bool:
+        with self.lock:
+            if rsu_esn in self.tmps:
+                return True
+            if self._is_missing(TMP_LOOKUP, rsu_esn):
+                return False
+            generation = self.generation
+        found = _query_tmp(rsu_esn)
+        with self.lock:
+            if generation == self.generation:
+                if found:
+                    self.tmps.add(rsu_esn)
+                else:
+                    self._add_missing(TMP_LOOKUP, rsu_esn)
+        return found
+
+    def forget(self, rsu_esn: str) -> None:
+        with self.lock:
+            self.rsus.pop(rsu_esn, None)
+            self.tmps.discard(rsu_esn)
+            self.missing.pop((RSU_LOOKUP, rsu_esn), None)
+            self.missing.pop((TMP_LOOKUP, rsu_esn), None)
+            self.generation += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.rsus = {}
+            self.tmps = set()
+            self.missing = OrderedDict()
+            self.generation += 1
+
+    def _is_missing(self, lookup: str, rsu_esn: str) -> bool:
+        """Whether the ESN is cached as unknown, to be called with the lock held."""
+        expires = self.missing.get((lookup, rsu_esn))
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self.missing[(lookup, rsu_esn)]
+            return False
+        self.missing.move_to_end((lookup, rsu_esn))
+        return True
+
+    def _add_missing(self, lookup: str, rsu_esn: str) -> None:
+        """Cache the ESN as unknown, to be called with the lock held."""
+        self.missing[(lookup, rsu_esn)] = time.monotonic() + self.negative_ttl
+        self.missing.move_to_end((lookup, rsu_esn))
+        while len(self.missing) > self.negative_size:
+            self.missing.popitem(last=False)
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._listen, name="rsu-registry", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def _listen(self) -> None:
+        while not self.stopped.is_set():
+            pubsub = redis_pool.REDIS_CONN.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(constants.RSU_REGISTRY_CHANNEL)
+                # Invalidations might have been missed while not subscribed
+                self.clear()
+                while not self.stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.forget(message["data"].decode("utf-8"))
+            except Exception as ex:  # noqa
+                LOG.warn(f"RSU registry subscription lost: {ex}")
+                self.stopped.wait(1.0)
+            finally:
+                pubsub.close()
+
+
+def setup_registry() -> None:
+    global REGISTRY
+    REGISTRY = RSURegistry(
+        constants.RSU_REGISTRY_NEGATIVE_TTL, constants.RSU_REGISTRY_NEGATIVE_SIZE
+    )
+    REGISTRY.load()
+    REGISTRY.start()
+
+
+def stop_registry() -> None:
+    if REGISTRY is not None:
+        REGISTRY.stop()
+
+
+def get(rsu_esn: str) -> Optional[RSUEntry]:
+    if REGISTRY is None:
+        return _query_rsu(rsu_esn)
+    return REGISTRY.get(rsu_esn)
+
+
+def is_tmp(rsu_esn: str) -> bool:
+    if REGISTRY is None:
+        return _query_tmp(rsu_esn)
+    return REGISTRY.is_tmp(rsu_esn)
+
+
+def invalidate(*rsu_esns: Optional[str]) -> None:
+    """Drop the ESNs from the registry of every worker."""
+    for rsu_esn in set(rsu_esns):
+        if not rsu_esn:
+            continue
+        REGISTRY_INVALIDATIONS.inc()
+        if REGISTRY is not None:
+            REGISTRY.forget(rsu_esn)
+        try:
+            redis_pool.REDIS_CONN.publish(constants.RSU_REGISTRY_CHANNEL, rsu_esn)
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to publish RSU registry invalidation [rsu_esn: {rsu_esn}]: {ex}")
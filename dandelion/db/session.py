@@ -14,19 +14,100 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import random
+import threading
+import time
 import urllib
+from contextlib import contextmanager
 from logging import LoggerAdapter
-from typing import Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
 
 from oslo_config import cfg
 from oslo_log import log
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util.concurrency import await_only
+
+from dandelion.core import metrics
+from dandelion.db import generation
 
 CONF = cfg.CONF
 LOG: LoggerAdapter = log.getLogger(__name__)
 
-DB_SESSION_LOCAL: Session
+T = TypeVar("T")
+
+DB_SESSION_LOCAL: sessionmaker
+DB_SCOPED_SESSION: scoped_session
+ASYNC_SESSION_LOCAL: sessionmaker
+
+# Drivers of the async engine by driver of the connection
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_SCOPE = threading.local()
+
+# Keys of Session.info: the session may read from replicas, how deep it is in
+# CRUD read methods, whether it has to stick to the primary, and whether it is
+# run by an async session
+REPLICA_READS = "replica_reads"
+READING = "reading"
+PRIMARY = "primary"
+ASYNC = "async"
+
+# Replica engines by primary engine
+REPLICAS: Dict[Engine, List[Engine]] = {}
+
+POOL_CHECKOUTS = metrics.counter("db.pool.checkouts")
+POOL_TIMEOUTS = metrics.counter("db.pool.timeouts")
+POOL_WAIT = metrics.timer("db.pool.wait_seconds")
+POOL_HOLD = metrics.timer("db.pool.hold_seconds")
+
+
+class MeteredQueuePool(QueuePool):
+    def _do_get(self) -> Any:
+        started = time.monotonic()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.monotonic() - started)
+
+
+class RoutingSession(Session):
+    """Session sending the reads of the CRUD read methods to a replica.
+
+    Only the sessions opened with `REPLICA_READS` in their info read from
+    replicas. Once such a session has written, it sticks to the primary so
+    that it reads its own writes.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:
+        bind = super().get_bind(mapper, clause, **kw)
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[PRIMARY] = True
+            return bind
+        if self.reads_from_replica and REPLICAS.get(bind):
+            return random.choice(REPLICAS[bind])
+        return bind
+
+    @property
+    def reads_from_replica(self) -> bool:
+        return (
+            self.info.get(REPLICA_READS, False)
+            and self.info.get(READING, 0) > 0
+            and not self.info.get(PRIMARY, False)
+            and bool(REPLICAS.get(self.bind))
+        )
 
 
 def setup_db() -> None:
@@ -43,16 +124,151 @@ def setup_db() -> None:
 
         connection = connection_database()
 
-        engine = create_engine(connection, pool_pre_ping=True, **engine_cfg)
+        engine = create_engine(
+            connection, pool_pre_ping=True, poolclass=MeteredQueuePool, **engine_cfg
+        )
+        REPLICAS[engine] = [
+            create_engine(
+                connection_database(replica),
+                pool_pre_ping=True,
+                poolclass=MeteredQueuePool,
+                **engine_cfg,
+            )
+            for replica in CONF.database.replica_connections
+        ]
+    setup_pool_metrics(engine)
 
-    global DB_SESSION_LOCAL
-    DB_SESSION_LOCAL = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    global DB_SESSION_LOCAL, DB_SCOPED_SESSION
+    DB_SESSION_LOCAL = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, class_=RoutingSession
+    )
+    DB_SCOPED_SESSION = scoped_session(DB_SESSION_LOCAL)
+    generation.setup_listeners(DB_SESSION_LOCAL)
 
     LOG.info("DB setup complete")
 
 
-def connection_database() -> str:
-    connection = CONF.database.connection
+def setup_async_db() -> None:
+    """Set up the async sessions of the `async def` endpoints.
+
+    They run the sync CRUD code through `AsyncSession.run_sync`, so that the
+    endpoints wait for the database without holding a threadpool thread.
+    """
+    if CONF.database.connection.startswith("sqlite"):
+        engine = create_async_engine(async_connection(CONF.database.connection))
+    else:
+        engine_cfg = dict(
+            pool_pre_ping=True,
+            pool_size=CONF.database.max_pool_size,
+            max_overflow=CONF.database.max_overflow,
+        )
+        engine = create_async_engine(async_connection(connection_database()), **engine_cfg)
+        REPLICAS[engine.sync_engine] = [
+            create_async_engine(
+                async_connection(connection_database(replica)), **engine_cfg
+            ).sync_engine
+            for replica in CONF.database.replica_connections
+        ]
+
+    global ASYNC_SESSION_LOCAL
+    # The sync sessions run by the async ones share the listeners of the sync sessions
+    ASYNC_SESSION_LOCAL = sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=DB_SESSION_LOCAL.class_,
+        autoflush=False,
+        expire_on_commit=False,
+        info={ASYNC: True},
+    )
+
+    LOG.info("Async DB setup complete")
+
+
+def async_connection(connection: str) -> str:
+    driver, separator, rest = connection.partition("://")
+    return ASYNC_DRIVERS.get(driver, driver) + separator + rest
+
+
+def setup_pool_metrics(engine: Engine) -> None:
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, connection_record: Any, proxy: Any) -> None:
+        POOL_CHECKOUTS.inc()
+        connection_record.info["checkout_time"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        checkout_time = connection_record.info.pop("checkout_time", None)
+        if checkout_time is not None:
+            POOL_HOLD.observe(time.monotonic() - checkout_time)
+
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        metrics.gauge("db.pool.size", pool.size)
+        metrics.gauge("db.pool.checked_out", pool.checkedout)
+        metrics.gauge("db.pool.overflow", pool.overflow)
+
+
+def get_session() -> Session:
+    """Session of the current thread, released by the enclosing session_scope()."""
+    return DB_SCOPED_SESSION()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Provide the thread-scoped session and release it when the outermost scope exits."""
+    depth = getattr(_SCOPE, "depth", 0)
+    _SCOPE.depth = depth + 1
+    db: Session = DB_SCOPED_SESSION()
+    try:
+        yield db
+    except Exception:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        _SCOPE.depth = depth
+        if depth == 0:
+            DB_SCOPED_SESSION.remove()
+
+
+@contextmanager
+def replica_reads(db: Session) -> Iterator[Session]:
+    """Send the reads of the block to a replica if the session may read from one."""
+    db.info[READING] = db.info.get(READING, 0) + 1
+    try:
+        yield db
+    finally:
+        db.info[READING] -= 1
+
+
+def blocking(db: Session, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call a blocking function, such as a Redis command, from the CRUD code.
+
+    Within `AsyncSession.run_sync`, the CRUD code runs on the thread of the
+    event loop, the function is then run in the default executor instead, so
+    that it does not hold up the other requests of the worker.
+    """
+    if not db.info.get(ASYNC):
+        return func(*args, **kwargs)
+
+    async def _run() -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    return await_only(_run())
+
+
+def stick_to_primary(db: Session) -> None:
+    """Send all the reads of the session to the primary from now on."""
+    db.info[PRIMARY] = True
+
+
+def reads_from_replica(db: Session) -> bool:
+    return isinstance(db, RoutingSession) and db.reads_from_replica
+
+
+def connection_database(connection: Optional[str] = None) -> str:
+    connection = connection or CONF.database.connection
     right = connection.rfind("@", 1)
     left = connection.find(":", connection.find(":") + 1)
     connection = (
@@ -0,0 +1,349 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import functools
+import struct
+from collections import defaultdict
+from logging import LoggerAdapter
+from typing import Any, Callable, DefaultDict, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import redis
+from oslo_config import cfg
+from oslo_log import log
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = cfg.CONF
+
+CHUNK_SIZE: int = 200
+
+# time, cpu uti, cpu load, mem total, mem used, net rx, net tx, disk read, disk write
+RECORD = struct.Struct("<I2f6d")
+RECORD_DTYPE = np.dtype(
+    [
+        ("time", "<u4"),
+        ("cpu_uti", "<f4"),
+        ("cpu_load", "<f4"),
+        ("mem_total", "<f8"),
+        ("mem_used", "<f8"),
+        ("net_rx", "<f8"),
+        ("net_tx", "<f8"),
+        ("disk_read", "<f8"),
+        ("disk_write", "<f8"),
+    ]
+)
+
+
+class Sample(NamedTuple):
+    time: int
+    cpu_uti: float
+    cpu_load: float
+    mem_total: float
+    mem_used: float
+    net_rx: float
+    net_tx: float
+    disk_read: float
+    disk_write: float
+
+
+METRICS = Sample._fields[1:]
+
+
+class Tier(NamedTuple):
+    name: str
+    # Seconds between two samples, 0 for the raw samples
+    step: int
+    # Seconds covered by one chunk key
+    span: int
+
+
+RAW = Tier("RAW", 0, 60 * 60)
+MINUTE = Tier("1M", 60, 60 * 60)
+HOUR = Tier("1H", 60 * 60, 60 * 60 * 24)
+TIERS = (RAW, MINUTE, HOUR)
+
+
+def retention(tier: Tier) -> int:
+    """Seconds the samples of the tier are kept."""
+    timeseries_conf = CONF.timeseries
+    if tier is RAW:
+        return timeseries_conf.raw_retention * 60 * 60
+    if tier is MINUTE:
+        return timeseries_conf.minute_retention * 60 * 60
+    return timeseries_conf.hour_retention * 60 * 60 * 24
+
+
+def chunk_key(tier: Tier, rsu_esn: str, timestamp: int) -> str:
+    return f"RSU_TS_{tier.name}_{rsu_esn}_{timestamp - timestamp % tier.span}"
+
+
+def chunk_keys(tier: Tier, rsu_esn: str, start: int, end: int) -> List[str]:
+    """Keys of the chunks holding the samples from `start` to `end` excluded."""
+    first = start - start % tier.span
+    return [chunk_key(tier, rsu_esn, timestamp) for timestamp in range(first, end, tier.span)]
+
+
+def window(tier: Tier, start: int, end: int, now: int) -> Tuple[int, int]:
+    """Part of the window from `start` to `end` excluded the tier may still hold samples of."""
+    return max(start, now - retention(tier) - tier.span), min(end, now + 1)
+
+
+def chunk_count(tier: Tier, start: int, end: int) -> int:
+    """Number of the chunks holding the samples from `start` to `end` excluded."""
+    if end <= start:
+        return 0
+    return (end - 1) // tier.span - start // tier.span + 1
+
+
+def expire_at(tier: Tier, timestamp: int) -> int:
+    """Time the chunk holding `timestamp` expires at."""
+    return timestamp - timestamp % tier.span + tier.span + retention(tier)
+
+
+def append(pipe: redis.client.Pipeline, tier: Tier, rsu_esn: str, samples: Iterable[Sample]):
+    """Queue the samples on the pipeline, appending them to their chunks."""
+    chunks: DefaultDict[int, List[bytes]] = defaultdict(list)
+    for sample in samples:
+        chunks[sample.time - sample.time % tier.span].append(RECORD.pack(*sample))
+    for timestamp, records in chunks.items():
+        key = chunk_key(tier, rsu_esn, timestamp)
+        pipe.append(key, b"".join(records))
+        pipe.expireat(key, expire_at(tier, timestamp))
+
+
+def unpack(chunks: Iterable[Optional[bytes]], start: int, end: int) -> List[Sample]:
+    samples = [
+        Sample(*record)
+        for chunk in chunks
+        if chunk
+        for record in RECORD.iter_unpack(chunk)
+        if start <= record[0] < end
+    ]
+    samples.sort(key=lambda sample: sample.time)
+    return samples
+
+
+def read(redis_conn: redis.Redis, tier: Tier, rsu_esn: str, start: int, end: int) -> List[Sample]:
+    """Samples of the tier from `start` to `end` excluded, oldest first."""
+    keys = chunk_keys(tier, rsu_esn, start, end)
+    if not keys:
+        return []
+    return unpack(redis_conn.mget(keys), start, end)
+
+
+def latest(
+    redis_conn: redis.Redis, tier: Tier, rsu_esn: str, now: int, count: int
+) -> List[Sample]:
+    """The latest `count` samples of the tier, oldest first."""
+    samples: List[Sample] = []
+    timestamp = now - now % tier.span
+    while len(samples) < count and timestamp > now - retention(tier) - tier.span:
+        chunk = redis_conn.get(chunk_key(tier, rsu_esn, timestamp))
+        samples = unpack([chunk], 0, now + 1) + samples
+        timestamp -= tier.span
+    return samples[-count:]
+
+
+def pick_tier(start: int, step: int, now: int) -> Tier:
+    """The coarsest tier finer than `step` still holding the samples since `start`."""
+    for tier in reversed(TIERS):
+        if tier.step <= step and now - retention(tier) <= start:
+            return tier
+    for tier in TIERS:
+        if now - retention(tier) <= start:
+            return tier
+    return HOUR
+
+
+def read_array(
+    redis_conn: redis.Redis, tier: Tier, rsu_esn: str, start: int, end: int
+) -> np.ndarray:
+    """Samples of the tier from `start` to `end` excluded as a structured array."""
+    keys = chunk_keys(tier, rsu_esn, start, end)
+    if not keys:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    chunks = redis_conn.mget(keys)
+    samples = np.frombuffer(b"".join(chunk for chunk in chunks if chunk), dtype=RECORD_DTYPE)
+    return samples[(samples["time"] >= start) & (samples["time"] < end)]
+
+
+def aggregate(samples: np.ndarray, start: int, step: int) -> List[Dict[str, Any]]:
+    """Min, max, average and 95th percentile of every metric over buckets of `step` seconds.
+
+    Buckets without samples are left out.
+    """
+    if not len(samples):
+        return []
+    buckets = (samples["time"] - start) // step
+    order = np.argsort(buckets, kind="stable")
+    buckets = buckets[order]
+    bucket_ids, offsets, counts = np.unique(buckets, return_index=True, return_counts=True)
+    # Position of the percentile within every bucket, interpolated linearly
+    rank = (counts - 1) * 0.95
+    lower = offsets + np.floor(rank).astype(np.int64)
+    upper = offsets + np.ceil(rank).astype(np.int64)
+    weight = rank - np.floor(rank)
+
+    stats = {}
+    for metric in METRICS:
+        values = samples[metric][order].astype(np.float64)
+        # Sort the values within every bucket for the percentile
+        ranked = values[np.lexsort((values, buckets))]
+        stats[metric] = dict(
+            min=np.minimum.reduceat(values, offsets),
+            max=np.maximum.reduceat(values, offsets),
+            avg=np.add.reduceat(values, offsets) / counts,
+            p95=ranked[lower] + (ranked[upper] - ranked[lower]) * weight,
+        )
+    return [
+        dict(
+            time=int(start + bucket_id * step),
+            count=int(counts[index]),
+            **{
+                metric: {name: float(value[index]) for name, value in stat.items()}
+                for metric, stat in stats.items()
+            },
+        )
+        for index, bucket_id in enumerate(bucket_ids)
+    ]
+
+
+def downsample(samples: Iterable[Sample], step: int) -> List[Sample]:
+    """Average the samples over buckets of `step` seconds."""
+    buckets: Dict[int, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        buckets[sample.time - sample.time % step].append(sample)
+    return [
+        Sample(timestamp, *(sum(column) / len(bucket) for column in list(zip(*bucket))[1:]))
+        for timestamp, bucket in sorted(buckets.items())
+    ]
+
+
+def backfill(pipe: redis.client.Pipeline, rsu_esn: str, samples: List[Sample], now: int):
+    """Queue the samples on the pipeline into every tier still holding their time.
+
+    Samples are averaged over the step of every tier but the raw one.
+    """
+    for tier in TIERS:
+        kept = [sample for sample in samples if sample.time >= now - retention(tier)]
+        append(pipe, tier, rsu_esn, downsample(kept, tier.step) if tier.step else kept)
+
+
+def watermark_key(tier: Tier) -> str:
+    return f"RSU_TS_WATERMARK_{tier.name}"
+
+
+def compact(
+    redis_conn: redis.Redis,
+    rsu_esns: List[str],
+    source: Tier,
+    target: Tier,
+    start: int,
+    end: int,
+    writer: Callable[[], redis.client.Pipeline],
+) -> None:
+    """Downsample the samples of the source tier into the target tier."""
+    for index in range(0, len(rsu_esns), CHUNK_SIZE):
+        chunk = rsu_esns[index : index + CHUNK_SIZE]
+        pipe = redis_conn.pipeline(transaction=False)
+        for rsu_esn in chunk:
+            pipe.mget(chunk_keys(source, rsu_esn, start, end))
+        values = pipe.execute()
+        with writer() as pipe:
+            for rsu_esn, chunks in zip(chunk, values):
+                append(pipe, target, rsu_esn, downsample(unpack(chunks, start, end), target.step))
+            pipe.execute()
+
+
+def compact_tiers(
+    redis_conn: redis.Redis,
+    rsu_esns: List[str],
+    now: int,
+    writer: Optional[Callable[[], redis.client.Pipeline]] = None,
+) -> None:
+    """Roll up the completed buckets of every tier since the last compaction.
+
+    The writes go through the pipelines returned by `writer`, by default
+    plain ones.
+    """
+    if writer is None:
+        writer = functools.partial(redis_conn.pipeline, transaction=False)
+    for source, target in zip(TIERS, TIERS[1:]):
+        end = now - now % target.step
+        if source.step:
+            source_watermark = int(redis_conn.get(watermark_key(source)) or 0)
+            end = min(end, source_watermark - source_watermark % target.step)
+        watermark = redis_conn.get(watermark_key(target))
+        start = int(watermark) if watermark else end - target.step
+        start = max(start, end - retention(source))
+        if start >= end:
+            continue
+        compact(redis_conn, rsu_esns, source, target, start, end, writer)
+        with writer() as pipe:
+            pipe.set(watermark_key(target), end)
+            pipe.execute()
+        LOG.info(f"Compacted {len(rsu_esns)} RSUs from {source.name} to {target.name}")
+
+
+def fleet_averages(
+    redis_conn: redis.Redis, tier: Tier, rsu_esns: List[str], start: int, end: int
+) -> np.ndarray:
+    """Average of every metric of every RSU from `start` to `end` excluded.
+
+    Returns an array of one row per RSU and one column per metric, NaN for the
+    RSUs without samples.
+    """
+    averages = np.full((len(rsu_esns), len(METRICS)), np.nan)
+    if not chunk_count(tier, start, end):
+        return averages
+    for index in range(0, len(rsu_esns), CHUNK_SIZE):
+        chunk = rsu_esns[index : index + CHUNK_SIZE]
+        pipe = redis_conn.pipeline(transaction=False)
+        for rsu_esn in chunk:
+            pipe.mget(chunk_keys(tier, rsu_esn, start, end))
+        values = pipe.execute()
+        buffers = [b"".join(chunk_ for chunk_ in chunks if chunk_) for chunks in values]
+        samples = np.frombuffer(b"".join(buffers), dtype=RECORD_DTYPE)
+        owners = np.repeat(
+            np.arange(index, index + len(chunk)),
+            [len(buffer) // RECORD_DTYPE.itemsize for buffer in buffers],
+        )
+        selected = (samples["time"] >= start) & (samples["time"] < end)
+        samples, owners = samples[selected], owners[selected]
+        if not len(samples):
+            continue
+        rsus, offsets, counts = np.unique(owners, return_index=True, return_counts=True)
+        for column, metric in enumerate(METRICS):
+            sums = np.add.reduceat(samples[metric].astype(np.float64), offsets)
+            averages[rsus, column] = sums / counts
+    return averages
+
+
+def fleet_stats(values: np.ndarray, limit: int) -> Dict[str, Any]:
+    """Percentiles of the values of the RSUs, and the RSUs beyond 1.5 IQR above Q3."""
+    p25, p50, p75, p95 = np.percentile(values, [25, 50, 75, 95])
+    threshold = p75 + 1.5 * (p75 - p25)
+    outliers = np.flatnonzero(values > threshold)
+    outliers = outliers[np.argsort(values[outliers])[::-1][:limit]]
+    return dict(
+        min=float(values.min()),
+        max=float(values.max()),
+        avg=float(values.mean()),
+        p50=float(p50),
+        p95=float(p95),
+        outliers=outliers,
+    )
@@ -0,0 +1,91 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from datetime import datetime
+from logging import LoggerAdapter
+from typing import Optional
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from oslo_log import log
+from pytz import utc
+
+from dandelion import periodic_tasks
+from dandelion.db import batch as db_batch, rsu_online, rsu_registry
+from dandelion.mqtt import server as mqtt_server
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+
+SCHEDULER: Optional[BackgroundScheduler] = None
+
+
+def start() -> None:
+    """Start the MQTT consumers, the write batching and the periodic tasks.
+
+    Database and Redis have to be set up before.
+    """
+    db_batch.setup_writer()
+    rsu_registry.setup_registry()
+    rsu_online.setup_watcher()
+    mqtt_server.connect()
+    setup_scheduler()
+    LOG.info("Ingest started")
+
+
+def stop() -> None:
+    if SCHEDULER is not None:
+        SCHEDULER.shutdown(wait=False)
+    mqtt_server.disconnect()
+    db_batch.stop_writer()
+    rsu_online.stop_watcher()
+    rsu_registry.stop_registry()
+    LOG.info("Ingest stopped")
+
+
+def setup_scheduler() -> None:
+    global SCHEDULER
+    job_stores = {"default": MemoryJobStore()}
+    executors = {"default": ThreadPoolExecutor(5)}
+    job_defaults = {"coalesce": False, "max_instances": 3}
+    SCHEDULER = BackgroundScheduler(
+        jobstores=job_stores, executors=executors, job_defaults=job_defaults, timezone=utc
+    )
+    now = datetime.now(utc)
+    SCHEDULER.add_job(periodic_tasks.compact_rsu_running, trigger="interval", seconds=60)
+    # Retried until done in case the process migrating is stopped
+    SCHEDULER.add_job(
+        periodic_tasks.migrate_legacy_rsu_running,
+        trigger="interval",
+        seconds=60 * 60,
+        next_run_time=now,
+    )
+    SCHEDULER.add_job(
+        periodic_tasks.update_rsu_online_status,
+        trigger="interval",
+        seconds=60,
+        next_run_time=now,
+    )
+    SCHEDULER.add_job(
+        periodic_tasks.flush_rsu_last_seen, trigger="interval", seconds=60, next_run_time=now
+    )
+    SCHEDULER.add_job(
+        periodic_tasks.purge_expired_events,
+        trigger="interval",
+        seconds=60 * 60,
+        next_run_time=now,
+    )
+    SCHEDULER.start()
@@ -16,19 +16,21 @@ from __future__ import annotations
 
 import time
 import uuid
+from datetime import datetime
 from logging import LoggerAdapter
+from typing import Optional
 
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import FastAPI, Request
-from fastapi_utils.tasks import repeat_every
+from fastapi import FastAPI, Request, Response, status
 from oslo_config import cfg
 from oslo_log import log
 from pytz import utc
 from starlette.middleware.cors import CORSMiddleware
 
-from dandelion import constants, periodic_tasks, version
+from dandelion import constants, ingest, periodic_tasks, version
+from dandelion.api import deps
 from dandelion.api.api_v1.api import api_router
 from dandelion.db import redis_pool, session as db_session
 from dandelion.mqtt import cloud_server as mqtt_cloud_server, server as mqtt_server
@@ -36,6 +38,8 @@ from dandelion.mqtt import cloud_server as mqtt_cloud_server, server as mqtt_ser
 CONF: cfg = cfg.CONF
 LOG: LoggerAdapter = log.getLogger(__name__)
 
+SCHEDULER: Optional[BackgroundScheduler] = None
+
 app = FastAPI(
     title="Dandelion - OpenV2X Device Management - APIServer",
     openapi_url=f"{constants.API_V1_STR}/openapi.json",
@@ -65,14 +69,10 @@ def prepare() -> None:
     log.setup(CONF, constants.PROJECT_NAME)
 
 
-@app.on_event("startup")
-def setup_mqtt() -> None:
-    mqtt_server.connect()
-
-
 @app.on_event("startup")
 def setup_db() -> None:
     db_session.setup_db()
+    db_session.setup_async_db()
 
 
 @app.on_event("startup")
@@ -87,30 +87,53 @@ def setup_redis() -> None:
 
 
 @app.on_event("startup")
-def setup_rsu_running():
-    job_stores = {"default": MemoryJobStore()}
-    executors = {"default": ThreadPoolExecutor(5)}
-    job_defaults = {"coalesce": False, "max_instances": 3}
-    scheduler = BackgroundScheduler(
-        jobstores=job_stores, executors=executors, job_defaults=job_defaults, timezone=utc
-    )
-    scheduler.add_job(periodic_tasks.rsu_info, trigger="cron", minute="00,10,20,30,40,50")
-    scheduler.start()
+def setup_mqtt() -> None:
+    if CONF.ingest.enabled:
+        ingest.start()
+    else:
+        mqtt_server.connect(consume=False)
 
 
 @app.on_event("startup")
-@repeat_every(seconds=60)
-def update_rsu_online_status() -> None:
-    periodic_tasks.update_rsu_online_status()
+def setup_scheduler() -> None:
+    """Schedule the tasks of the API process, whether ingest runs in it or not."""
+    global SCHEDULER
+    SCHEDULER = BackgroundScheduler(
+        jobstores={"default": MemoryJobStore()},
+        executors={"default": ThreadPoolExecutor(1)},
+        timezone=utc,
+    )
+    # Bitmaps are uploaded to the local file system of the API hosts
+    SCHEDULER.add_job(
+        periodic_tasks.delete_unused_bitmap,
+        trigger="interval",
+        seconds=60 * 60 * 24,
+        next_run_time=datetime.now(utc),
+    )
+    SCHEDULER.start()
 
 
-@app.on_event("startup")
-@repeat_every(seconds=60 * 60 * 24)
-def delete_unused_bitmap() -> None:
-    periodic_tasks.delete_unused_bitmap()
+# Shutdown
+@app.on_event("shutdown")
+def stop_mqtt() -> None:
+    if CONF.ingest.enabled:
+        ingest.stop()
+    else:
+        mqtt_server.disconnect()
+
+
+@app.on_event("shutdown")
+def stop_scheduler() -> None:
+    if SCHEDULER is not None:
+        SCHEDULER.shutdown(wait=False)
 
 
 # Middleware
+@app.exception_handler(deps.NotModified)
+async def not_modified_handler(request: Request, exc: deps.NotModified) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=exc.headers)
+
+
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
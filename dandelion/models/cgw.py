@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Integer
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class CGW(Base, DandelionBase):
+class CGW(Base, EventBase):
     __tablename__ = "cgw"
 
     cgw_level = Column(Integer, nullable=False, index=True)
@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class OSW(Base, DandelionBase):
+class OSW(Base, EventBase):
     __tablename__ = "osw"
 
     sensor_pos = Column(JSON, nullable=False)
@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class RSICLC(Base, DandelionBase):
+class RSICLC(Base, EventBase):
     __tablename__ = "rsi_clc"
 
     msg_id = Column(String(length=255), nullable=False, default="")
@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Float, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class RSICWM(Base, DandelionBase):
+class RSICWM(Base, EventBase):
     __tablename__ = "rsi_cwm"
 
     sensor_pos = Column(JSON, nullable=True)
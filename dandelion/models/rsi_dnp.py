@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class RSIDNP(Base, DandelionBase):
+class RSIDNP(Base, EventBase):
     __tablename__ = "rsi_dnp"
 
     msg_id = Column(String(length=255), nullable=False, default="")
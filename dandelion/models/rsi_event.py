@@ -19,7 +19,7 @@ import enum
 from sqlalchemy import JSON, Boolean, Column, Enum, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 from dandelion.util import Optional as Optional_util
 
 
@@ -43,7 +43,7 @@ class EventSource(enum.Enum):
     detection = 6
 
 
-class RSIEvent(Base, DandelionBase):
+class RSIEvent(Base, EventBase):
     __tablename__ = "rsi_event"
 
     rsu_id = Column(Integer, ForeignKey("rsu.id"))
@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class RSISDS(Base, DandelionBase):
+class RSISDS(Base, EventBase):
     __tablename__ = "rsi_sds"
 
     msg_id = Column(String(length=255), nullable=False, default="")
@@ -17,10 +17,10 @@ from __future__ import annotations
 from sqlalchemy import JSON, Column
 from sqlalchemy.orm import relationship
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class RSM(Base, DandelionBase):
+class RSM(Base, EventBase):
     __tablename__ = "rsm"
 
     ref_pos = Column(JSON, nullable=False)
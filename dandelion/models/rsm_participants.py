@@ -18,7 +18,7 @@ from enum import Enum
 
 from sqlalchemy import JSON, Column, Enum as db_Enum, ForeignKey, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 from dandelion.util import Optional as Optional_util
 
 
@@ -31,7 +31,7 @@ class PtcType(Enum):
     rsu = "RSU设备"
 
 
-class Participants(Base, DandelionBase):
+class Participants(Base, EventBase):
     __tablename__ = "rsm_participants"
 
     rsm_id = Column(Integer, ForeignKey("rsm.id"))
@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from sqlalchemy import JSON, Boolean, Column, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from dandelion.db.base_class import Base, DandelionBase
@@ -33,6 +33,7 @@ class RSU(Base, DandelionBase):
     location = Column(JSON, nullable=False)
     config = Column(JSON, nullable=False)
     online_status = Column(Boolean, index=True, nullable=False, default=False)
+    last_seen = Column(DateTime, nullable=True)
     rsu_model_id = Column(Integer, ForeignKey("rsu_model.id"))
     desc = Column(String(255), nullable=True, default="")
     log_id = Column(Integer, ForeignKey("rsu_log.id"))
@@ -16,10 +16,10 @@ from __future__ import annotations
 
 from sqlalchemy import JSON, Column, Integer, String
 
-from dandelion.db.base_class import Base, DandelionBase
+from dandelion.db.base_class import Base, EventBase
 
 
-class SSW(Base, DandelionBase):
+class SSW(Base, EventBase):
     __tablename__ = "ssw"
 
     sensor_pos = Column(JSON, nullable=False)
@@ -21,7 +21,6 @@ from typing import Any
 import paho.mqtt.client as mqtt
 from oslo_config import cfg
 from oslo_log import log
-from sqlalchemy.orm import Session
 
 from dandelion import conf, crud
 
@@ -79,8 +78,8 @@ def _on_disconnect(client: mqtt.Client, userdata: Any, rc: int) -> None:
 def connect() -> None:
     from dandelion.db import session
 
-    db: Session = session.DB_SESSION_LOCAL()
-    config = crud.system_config.get(db, 1)
+    with session.session_scope() as db:
+        config = crud.system_config.get(db, 1)
 
     if config and config.mqtt_config:
         LOG.info("Starting Cloud MQTT...")
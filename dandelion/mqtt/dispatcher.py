@@ -0,0 +1,128 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import zlib
+from logging import LoggerAdapter
+from typing import Any, Callable, List, Optional
+
+from oslo_config import cfg
+from oslo_log import log
+
+from dandelion.core import metrics
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = cfg.CONF
+
+DISPATCHER: Optional[Dispatcher] = None
+
+DISPATCH_DROPPED = metrics.counter("mqtt.dispatch.dropped")
+DISPATCH_PROCESSED = metrics.counter("mqtt.dispatch.processed")
+DISPATCH_FAILED = metrics.counter("mqtt.dispatch.failed")
+DISPATCH_WAIT = metrics.timer("mqtt.dispatch.wait_seconds")
+DISPATCH_HANDLE = metrics.timer("mqtt.dispatch.handle_seconds")
+
+
+class Dispatcher(object):
+    """Bounded worker pool for MQTT messages.
+
+    Every worker drains its own queue and a message is always routed to the
+    same worker by its key, so messages sharing a key are handled in order.
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        shard_size = max(1, queue_size // workers)
+        self.queues: List[queue.Queue] = [queue.Queue(maxsize=shard_size) for _ in range(workers)]
+        self.threads: List[threading.Thread] = []
+        metrics.gauge("mqtt.dispatch.queue_depth", self.depth)
+        metrics.gauge("mqtt.dispatch.workers", lambda: len(self.threads))
+
+    def start(self) -> None:
+        for index, queue_ in enumerate(self.queues):
+            thread = threading.Thread(
+                target=self._run, args=(queue_,), name=f"mqtt-dispatch-{index}", daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+        LOG.info(f"MQTT dispatcher started with {len(self.threads)} workers")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for queue_ in self.queues:
+            queue_.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def depth(self) -> int:
+        return sum(queue_.qsize() for queue_ in self.queues)
+
+    def submit(self, key: str, func: Callable[..., Any], *args: Any) -> bool:
+        queue_ = self.queues[zlib.crc32(key.encode("utf-8")) % len(self.queues)]
+        try:
+            queue_.put_nowait((time.monotonic(), func, args))
+        except queue.Full:
+            DISPATCH_DROPPED.inc()
+            LOG.warning(f"MQTT dispatch queue is full, message [key: {key}] dropped")
+            return False
+        return True
+
+    @staticmethod
+    def _run(queue_: queue.Queue) -> None:
+        while True:
+            item = queue_.get()
+            if item is None:
+                return
+            enqueued, func, args = item
+            DISPATCH_WAIT.observe(time.monotonic() - enqueued)
+            handle(func, *args)
+
+
+def handle(func: Callable[..., Any], *args: Any) -> None:
+    """Handle a message, failures are logged and counted."""
+    started = time.monotonic()
+    try:
+        func(*args)
+    except Exception as ex:
+        DISPATCH_FAILED.inc()
+        LOG.error(ex)
+    finally:
+        DISPATCH_HANDLE.observe(time.monotonic() - started)
+        DISPATCH_PROCESSED.inc()
+
+
+def setup_dispatcher() -> None:
+    global DISPATCHER
+    if DISPATCHER is not None or CONF.mqtt.dispatch_workers <= 0:
+        return
+    DISPATCHER = Dispatcher(CONF.mqtt.dispatch_workers, CONF.mqtt.dispatch_queue_size)
+    DISPATCHER.start()
+
+
+def stop_dispatcher() -> None:
+    global DISPATCHER
+    if DISPATCHER is not None:
+        DISPATCHER.stop()
+        DISPATCHER = None
+
+
+def dispatch(key: str, func: Callable[..., Any], *args: Any) -> bool:
+    if DISPATCHER is None:
+        handle(func, *args)
+        return True
+    return DISPATCHER.submit(key, func, *args)
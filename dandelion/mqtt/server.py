@@ -16,14 +16,14 @@ from __future__ import annotations
 
 import uuid
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
 from oslo_config import cfg
 from oslo_log import log
 
 from dandelion import conf
-from dandelion.mqtt import topic
+from dandelion.mqtt import dispatcher, subscription, topic
 from dandelion.mqtt.service import RouterHandler
 from dandelion.mqtt.service.algorithm.cgw import CGWRouterHandler
 from dandelion.mqtt.service.algorithm.osw import OSWRouterHandler
@@ -71,6 +71,7 @@ topic_router: Dict[str, RouterHandler] = {
     topic.V2X_RSU_PLUS_SSW_DOWN: SSWRouterHandler(),
 }
 MQTT_CLIENT: mqtt.Client = None
+SUBSCRIPTION: Optional[subscription.Subscription] = None
 
 
 def get_mqtt_client() -> mqtt.Client:
@@ -90,7 +91,13 @@ def _on_connect(client: mqtt.Client, userdata: Any, flags: Any, rc: int) -> None
 
     for route in topic_router:
         client.message_callback_add(route, topic_router[route].request)
-        client.subscribe(topic=route, qos=0)
+    if SUBSCRIPTION is not None:
+        SUBSCRIPTION.on_connect(client)
+
+
+def _on_subscribe(client: mqtt.Client, userdata: Any, mid: int, granted_qos: Any) -> None:
+    if SUBSCRIPTION is not None:
+        SUBSCRIPTION.on_subscribe(client, mid, granted_qos)
 
 
 def _on_message(client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> None:
@@ -101,13 +108,33 @@ def _on_disconnect(client: mqtt.Client, userdata: Any, rc: int) -> None:
     LOG.error(f"MQTT Connection disconnected, rc: {rc}")
 
 
-def connect() -> None:
+def connect(consume: bool = True) -> None:
+    """Connect to the MQTT server, subscribing the topics only if `consume`."""
     mqtt_conf = CONF.mqtt
 
+    global SUBSCRIPTION
+    if consume:
+        SUBSCRIPTION = subscription.Subscription(
+            list(topic_router),
+            mqtt_conf.subscription_mode,
+            mqtt_conf.subscription_group,
+            mqtt_conf.subscription_lease_ttl,
+        )
+        dispatcher.setup_dispatcher()
     _client = mqtt.Client(client_id=uuid.uuid4().hex)
     _client.username_pw_set(mqtt_conf.username, mqtt_conf.password)
     _client.on_connect = _on_connect
     _client.on_message = _on_message
     _client.on_disconnect = _on_disconnect
+    _client.on_subscribe = _on_subscribe
     _client.connect(mqtt_conf.host, mqtt_conf.port, 60)
     _client.loop_start()
+
+
+def disconnect() -> None:
+    if SUBSCRIPTION is not None:
+        SUBSCRIPTION.stop()
+    if MQTT_CLIENT is not None:
+        MQTT_CLIENT.disconnect()
+        MQTT_CLIENT.loop_stop()
+    dispatcher.stop_dispatcher()
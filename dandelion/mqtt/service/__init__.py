@@ -21,6 +21,9 @@ from typing import Any, Dict
 import paho.mqtt.client as mqtt
 from oslo_log import log
 
+from dandelion.db import session
+from dandelion.mqtt import dispatcher
+
 LOG: LoggerAdapter = log.getLogger(__name__)
 
 
@@ -33,9 +36,22 @@ class RouterHandler(object):
             msg_ = _msg.payload.decode("utf-8")
             LOG.info(f"{topic_} => {msg_}")
             data_ = json.loads(msg_)
-            self.handler(_client, topic_, data_)
         except Exception as ex:
             LOG.error(ex)
+            return None
+        dispatcher.dispatch(self.routing_key(topic_, data_), self.process, _client, topic_, data_)
+
+    def process(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+        # Errors are rolled back by the scope, then logged and counted by the dispatcher
+        with session.session_scope():
+            self.handler(client, topic, data)
+
+    @staticmethod
+    def routing_key(topic: str, data: Any) -> str:
+        # Messages of the same RSU share a key, so they are handled in order
+        if isinstance(data, dict) and data.get("rsuEsn"):
+            return str(data.get("rsuEsn"))
+        return topic
 
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
         """"""
@@ -19,10 +19,8 @@ from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
-from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -30,8 +28,6 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RDWRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
         sensor_pos = data.get("sensorPos", {})
         contents = data.get("content", [])
         for content in contents:
@@ -48,5 +44,5 @@ class RDWRouterHandler(RouterHandler):
             rdw.height = ego_info.get("height")
             rdw.sec_mark = sec_mark
 
-            crud.rdw.create(db=db, obj_in=rdw)
-        LOG.info(f"{topic} => RDW created")
+            crud.rdw.create_deferred(obj_in=rdw)
+        LOG.info(f"{topic} => RDW queued")
@@ -30,7 +30,7 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RSIRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+        db: Session = session.get_session()
 
         rsis = data.get("rsiDatas")
         if not rsis:
@@ -53,5 +53,5 @@ class RSIRouterHandler(RouterHandler):
                 eventPriority=rsi.get("eventPriority"),
                 referencePaths=rsi.get("referencePaths"),
             )
-            crud.rsi_event.create_rsi_event(db, obj_in=rsi_event_in, rsu=rsu)
-            LOG.info(f"{topic} => RSIEvent [alert_id: {rsi_event_in.alert_id}] created")
+            crud.rsi_event.create_rsi_event_deferred(obj_in=rsi_event_in, rsu=rsu)
+            LOG.info(f"{topic} => RSIEvent [alert_id: {rsi_event_in.alert_id}] queued")
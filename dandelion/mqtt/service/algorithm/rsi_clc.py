@@ -19,10 +19,8 @@ from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
-from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -30,8 +28,6 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RSICLCRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
         clc = schemas.RSICLCCreate()
         clc.msg_id = data.get("id")
         if not clc.msg_id:
@@ -45,5 +41,5 @@ class RSICLCRouterHandler(RouterHandler):
             clc.drive_suggestion = coordinates.get("driveSuggestion", {})
             clc.info = coordinates.get("info", 0)
 
-        crud.rsi_clc.create(db, obj_in=clc)
-        LOG.info(f"{topic} => RSI CLC created")
+        crud.rsi_clc.create_deferred(obj_in=clc)
+        LOG.info(f"{topic} => RSI CLC queued")
@@ -19,10 +19,8 @@ from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
-from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -30,8 +28,6 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RSICWMRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
         for content in data.get("content", []):
             cwm = schemas.RSICWMCreate()
             cwm.sensor_pos = data.get("sensorPos", {})
@@ -57,6 +53,6 @@ class RSICWMRouterHandler(RouterHandler):
             cwm.other_width = other.get("size", {}).get("width", 0.0)
             cwm.other_kinematics_info = other.get("kinematicsInfo", {})
 
-            crud.rsi_cwm.create(db, obj_in=cwm)
+            crud.rsi_cwm.create_deferred(obj_in=cwm)
 
-        LOG.info(f"{topic} => RSI CWM created")
+        LOG.info(f"{topic} => RSI CWM queued")
@@ -19,10 +19,8 @@ from typing import Any, Dict
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
-from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -30,8 +28,6 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RSISDSRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
         sds = schemas.RSISDSCreate()
 
         sds.msg_id = data.get("id")
@@ -43,5 +39,5 @@ class RSISDSRouterHandler(RouterHandler):
         sds.sensor_pos = data.get("sensorPos", {})
         sds.ego_id = data.get("egoId", "0")
         sds.ego_pos = data.get("egoPos", {})
-        crud.rsi_sds.create(db, obj_in=sds)
-        LOG.info(f"{topic} => RSI SDS created")
+        crud.rsi_sds.create_deferred(obj_in=sds)
+        LOG.info(f"{topic} => RSI SDS queued")
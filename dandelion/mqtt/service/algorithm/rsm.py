@@ -19,10 +19,8 @@ from typing import Any, Dict, List
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
-from sqlalchemy.orm import Session
 
-from dandelion import crud, models, schemas
-from dandelion.db import session
+from dandelion import crud, schemas
 from dandelion.mqtt.service import RouterHandler
 from dandelion.util import Optional as Optional_util
 
@@ -31,8 +29,6 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RSMRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
         rsms = Optional_util.none(data.get("content")).map(lambda v: v.get("rsms")).get()
         for rsm_ in rsms:
             rsm = schemas.RSMCreate()
@@ -42,18 +38,20 @@ class RSMRouterHandler(RouterHandler):
             if not ps:
                 LOG.info(f"{topic} => RSM has no participants")
                 return None
-            participants: List[models.Participants] = []
+            participants: List[Dict[str, Any]] = []
             for p_ in ps:
-                p = models.Participants()
-                p.ptc_id = p_.get("ptcId")
-                p.ptc_type = p_.get("ptcType")
-                p.source = p_.get("source")
-                p.sec_mark = p_.get("secMark")
-                p.pos = p_.get("pos")
-                p.accuracy = p_.get("accuracy")
-                p.speed = p_.get("speed")
-                p.heading = p_.get("heading")
-                p.size = p_.get("size", {})
-                participants.append(p)
-            crud.rsm.create_rsm(db, obj_in=rsm, participants=participants)
-            LOG.info(f"{topic} => RSM created")
+                participants.append(
+                    dict(
+                        ptc_id=p_.get("ptcId"),
+                        ptc_type=p_.get("ptcType"),
+                        source=p_.get("source"),
+                        sec_mark=p_.get("secMark"),
+                        pos=p_.get("pos"),
+                        accuracy=p_.get("accuracy"),
+                        speed=p_.get("speed"),
+                        heading=p_.get("heading"),
+                        size=p_.get("size", {}),
+                    )
+                )
+            crud.rsm.create_rsm_deferred(obj_in=rsm, participants=participants)
+            LOG.info(f"{topic} => RSM queued")
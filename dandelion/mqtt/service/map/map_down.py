@@ -44,7 +44,7 @@ def map_down(
 
 class MapDownACKRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+        db: Session = session.get_session()
 
         _id = int(data.get("seqNum", 0))
         if _id > 0:
@@ -31,7 +31,7 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class MapRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+        db: Session = session.get_session()
         rsu_esn = re.findall("V2X/RSU/(.*)/MAP/UP", topic)[0]
         # rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=rsu_esn)
         map_in_db = crud.map.get(db, id=1)
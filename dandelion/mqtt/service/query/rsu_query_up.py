@@ -30,7 +30,7 @@ LOG: LoggerAdapter = log.getLogger(__name__)
 
 class RSUQueryUPRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+        db: Session = session.get_session()
         esn = data.get("rsuEsn")
         if not esn:
             return
@@ -22,7 +22,7 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
+from dandelion.db import rsu_registry, session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
@@ -33,6 +33,10 @@ class RSUBaseINFORouterHandler(RouterHandler):
         esn = data.get("rsuEsn")
         if not esn:
             return
+        entry = rsu_registry.get(esn)
+        if entry is None:
+            LOG.info(f"{topic} => RSU [rsu_esn: {esn}] not found")
+            return
         base_info = schemas.RSUUpdateWithBaseInfo()
         base_info.rsu_id = data.get("rsuId")
         base_info.version = data.get("protocolVersion")
@@ -46,8 +50,8 @@ class RSUBaseINFORouterHandler(RouterHandler):
         base_info.software_version = data.get("SoftwareVersion")
         base_info.hardware_version = data.get("hardwareVersion")
         base_info.depart = data.get("depart")
-        db: Session = session.DB_SESSION_LOCAL()
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=esn)
+        db: Session = session.get_session()
+        rsu = crud.rsu.get(db, id=entry.id)
         if rsu:
-            crud.rsu.update_with_base_info(db, db_obj=rsu, obj_in=base_info)
+            crud.rsu.update(db, db_obj=rsu, obj_in=base_info, refresh=False)
         LOG.info(f"{topic} => Processed RSU Base Info successfully")
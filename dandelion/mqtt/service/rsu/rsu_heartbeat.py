@@ -14,36 +14,68 @@
 
 from __future__ import annotations
 
+import time
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
 from oslo_log import log
+from redis.commands.core import Script
 from sqlalchemy.orm import Session
 
-from dandelion import crud, schemas
+from dandelion import constants, crud, schemas
 from dandelion.api.deps import get_redis_conn
-from dandelion.db import session
+from dandelion.db import rsu_registry, session
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
+# Refresh the online key and the last seen time, return whether the RSU was
+# already online.
+HEARTBEAT_SCRIPT = """
+local online = redis.call('EXISTS', KEYS[1])
+redis.call('SET', KEYS[1], 1, 'EX', ARGV[1])
+redis.call('HSET', KEYS[2], ARGV[2], ARGV[3])
+return online
+"""
+_heartbeat_script: Optional[Script] = None
+
+
+def heartbeat(rsu_esn: str) -> bool:
+    global _heartbeat_script
+    if _heartbeat_script is None:
+        _heartbeat_script = get_redis_conn().register_script(HEARTBEAT_SCRIPT)
+    online = _heartbeat_script(
+        keys=[f"RSU_ONLINE_{rsu_esn}", constants.RSU_LAST_SEEN_KEY],
+        args=[constants.RSU_ONLINE_EXPIRE, rsu_esn, time.time()],
+    )
+    return bool(online)
+
 
 class RSUHeartbeatRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-        redis_conn = get_redis_conn()
-
         rsu_esn = data.get("rsuEsn")
         if not rsu_esn:
             LOG.warn(f"{topic} => rsu_esn is None")
             return None
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=rsu_esn)
-        if not rsu:
+        if heartbeat(rsu_esn):
+            return None
+
+        entry = rsu_registry.get(rsu_esn)
+        if entry is None:
+            # Forget the heartbeat so that the RSU comes online once registered
+            get_redis_conn().delete(f"RSU_ONLINE_{rsu_esn}")
             LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] not found")
             return None
-        crud.rsu.update_online_status(
-            db, db_obj=rsu, obj_in=schemas.RSUUpdateWithStatus(onlineStatus=True)
-        )
-        redis_conn.set(f"RSU_ONLINE_{rsu_esn}", 1, ex=15)
+
+        # The cached status may lag behind an offline update, check the database
+        db: Session = session.get_session()
+        rsu = crud.rsu.get(db, id=entry.id)
+        if rsu and not rsu.online_status:
+            crud.rsu.update(
+                db,
+                db_obj=rsu,
+                obj_in=schemas.RSUUpdateWithStatus(onlineStatus=True),
+                refresh=False,
+            )
         LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] onlineStatus updated")
@@ -22,7 +22,7 @@ from oslo_log import log
 from sqlalchemy.orm import Session
 
 from dandelion import crud, schemas
-from dandelion.db import session
+from dandelion.db import rsu_registry, session
 from dandelion.mqtt import server, topic
 from dandelion.mqtt.service import RouterHandler
 
@@ -40,21 +40,19 @@ def rsu_info_publish():
 
 class RSUInfoRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
-
         rsu_esn = data.get("rsuEsn")
         if not rsu_esn:
             LOG.warn(f"{topic} => rsu_esn is None")
             return None
 
-        rsu = crud.rsu.get_by_rsu_esn(db, rsu_esn=rsu_esn)
+        db: Session = session.get_session()
+        entry = rsu_registry.get(rsu_esn)
+        rsu = None if entry is None else crud.rsu.get(db, id=entry.id)
         if not rsu:
             LOG.info(f"{topic} => RSU not found: {rsu_esn}")
-            total, _ = crud.rsu_tmp.get_multi_with_total(db, rsu_esn=rsu_esn)
-            if total > 0:
+            if rsu_registry.is_tmp(rsu_esn):
                 LOG.info(
-                    f"{topic} => RSU Tmp [rsu_esn: {rsu_esn}] total: {total}, "
-                    "ignore to create RSU Tmp"
+                    f"{topic} => RSU Tmp [rsu_esn: {rsu_esn}] exists, ignore to create RSU Tmp"
                 )
                 return None
             rsu_tmp = schemas.RSUTMPCreate(**data)
@@ -68,5 +66,5 @@ class RSUInfoRouterHandler(RouterHandler):
                 location=data.get("location"),
                 config=data.get("config"),
             )
-            crud.rsu.update_with_version(db, db_obj=rsu, obj_in=rsu_in)
+            crud.rsu.update(db, db_obj=rsu, obj_in=rsu_in, refresh=False)
             LOG.info(f"{topic} => RSU [rsu_esn: {rsu_esn}] updated")
@@ -15,28 +15,99 @@
 from __future__ import annotations
 
 import json
+import time
 from logging import LoggerAdapter
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
+from oslo_config import cfg
 from oslo_log import log
+from redis.commands.core import Script
 
 from dandelion.api.deps import get_redis_conn
+from dandelion.core import metrics
+from dandelion.db import rsu_registry, timeseries
 from dandelion.mqtt.service import RouterHandler
 
 LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = cfg.CONF
+
+RUNNING_INFO_EXPIRE: int = 60 * 60 * 24
+
+# Store the latest running info, then append the sample to the time series
+# unless the RSU has been sampled within the minimum interval. Return whether
+# the sample has been appended.
+RUNNING_INFO_SCRIPT = """
+redis.call('HSET', KEYS[1], 'cpu', ARGV[1], 'mem', ARGV[2], 'disk', ARGV[3], 'net', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+if not redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[6]) then
+    return 0
+end
+redis.call('APPEND', KEYS[3], ARGV[7])
+redis.call('EXPIREAT', KEYS[3], ARGV[8])
+return 1
+"""
+_running_info_script: Optional[Script] = None
+
+RUNNING_INFO_SAMPLES = metrics.counter("rsu_running_info.samples")
+RUNNING_INFO_THROTTLED = metrics.counter("rsu_running_info.throttled")
+
+
+def running_sample(c_time: int, info: Dict[str, Any]) -> timeseries.Sample:
+    cpu_data = info.get("cpu") or {}
+    mem_data = info.get("mem") or {}
+    net_data = info.get("net") or {}
+    disk_data = info.get("disk") or {}
+    uti = cpu_data.get("uti")
+    return timeseries.Sample(
+        time=c_time,
+        cpu_uti=len(uti.split(",")) if uti else 0,
+        cpu_load=cpu_data.get("load", 0),
+        mem_total=mem_data.get("total", 0),
+        mem_used=mem_data.get("used", 0),
+        net_rx=net_data.get("rxByte", 0),
+        net_tx=net_data.get("wxByte", 0),
+        disk_read=disk_data.get("read", 0),
+        disk_write=disk_data.get("write", 0),
+    )
+
+
+def store_running_info(rsu_esn: str, info: Dict[str, Any]) -> bool:
+    global _running_info_script
+    if _running_info_script is None:
+        _running_info_script = get_redis_conn().register_script(RUNNING_INFO_SCRIPT)
+    c_time = int(time.time())
+    sample = running_sample(c_time, info)
+    sampled = _running_info_script(
+        keys=[
+            f"RSU_RUNNING_INFO_{rsu_esn}",
+            f"RSU_RUNNING_SAMPLED_{rsu_esn}",
+            timeseries.chunk_key(timeseries.RAW, rsu_esn, c_time),
+        ],
+        args=[
+            json.dumps(info.get("cpu", {})),
+            json.dumps(info.get("mem", {})),
+            json.dumps(info.get("disk", {})),
+            json.dumps(info.get("net", {})),
+            RUNNING_INFO_EXPIRE,
+            CONF.timeseries.sample_interval,
+            timeseries.RECORD.pack(*sample),
+            timeseries.expire_at(timeseries.RAW, c_time),
+        ],
+    )
+    return bool(sampled)
 
 
 class RSURunningInfoRouterHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        LOG.info(f"{topic} => Not implemented yet")
-        redis_conn = get_redis_conn()
         rsu_esn = data.get("rsuEsn")
         info = data.get("runningInfo")
-        if rsu_esn and info:
-            key = f"RSU_RUNNING_INFO_{rsu_esn}"
-            redis_conn.hset(key, "cpu", json.dumps(info.get("cpu", {})))
-            redis_conn.hset(key, "mem", json.dumps(info.get("mem", {})))
-            redis_conn.hset(key, "disk", json.dumps(info.get("disk", {})))
-            redis_conn.hset(key, "net", json.dumps(info.get("net", {})))
-            redis_conn.expire(name=key, time=60 * 60 * 24)
+        if not rsu_esn or not info:
+            return None
+        if rsu_registry.get(rsu_esn) is None:
+            LOG.debug(f"{topic} => RSU [rsu_esn: {rsu_esn}] not found")
+            return None
+        if store_running_info(rsu_esn, info):
+            RUNNING_INFO_SAMPLES.inc()
+        else:
+            RUNNING_INFO_THROTTLED.inc()
@@ -64,7 +64,7 @@ def spat_publish(spat_in_db):
 
 class RSUSpatHandler(RouterHandler):
     def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
-        db: Session = session.DB_SESSION_LOCAL()
+        db: Session = session.get_session()
         intersections_list: list = data["intersections"]
         for intersections in intersections_list:
             intersection_id = intersections.get("intersectionId")
@@ -84,7 +84,7 @@ class RSUSpatHandler(RouterHandler):
                     "rsu_id": rsu_id,
                 }
                 if spat_in_db:
-                    crud.spat.update(db, db_obj=spat_in_db, obj_in=spat_in)
+                    crud.spat.update(db, db_obj=spat_in_db, obj_in=spat_in, refresh=False)
                     LOG.info(f"{topic} => update spat successfully")
                 else:
                     crud.spat.create(db, obj_in=spat_in)
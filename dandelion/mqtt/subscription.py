@@ -0,0 +1,125 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import threading
+from logging import LoggerAdapter
+from typing import Any, List, Optional, Set
+
+import paho.mqtt.client as mqtt
+from oslo_config import cfg
+from oslo_log import log
+
+from dandelion.core import metrics
+from dandelion.db import lease
+
+LOG: LoggerAdapter = log.getLogger(__name__)
+CONF: cfg = cfg.CONF
+
+MODE_ALL = "all"
+MODE_SHARED = "shared"
+MODE_ELECTED = "elected"
+
+SUBACK_FAILURE = 128
+
+
+class Subscription(object):
+    """Subscribes the consumer topics according to `[mqtt] subscription_mode`.
+
+    * `all`: every worker subscribes every topic and handles every message.
+    * `shared`: topics are subscribed as `$share/<group>/<topic>`, so that the
+      broker hands each message to one worker of the group. Falls back to
+      `elected` if the broker rejects shared subscriptions.
+    * `elected`: only the worker holding the consumer lease subscribes.
+    """
+
+    def __init__(self, routes: List[str], mode: str, group: str, lease_ttl: int) -> None:
+        self.routes = routes
+        self.mode = mode
+        self.group = group
+        self.lease = lease.Lease(f"MQTT_CONSUMER_{group}", lease_ttl)
+        self.interval = lease_ttl / 3
+        self.client: Optional[mqtt.Client] = None
+        self.shared_mids: Set[int] = set()
+        self.subscribed = False
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        metrics.gauge("mqtt.subscription.consuming", lambda: int(self.subscribed))
+
+    def on_connect(self, client: mqtt.Client) -> None:
+        with self.lock:
+            self.client = client
+            # A clean session starts without subscriptions
+            self.subscribed = False
+            if self.mode == MODE_ALL:
+                self._subscribe(self.routes)
+            elif self.mode == MODE_SHARED:
+                _, mid = self._subscribe([f"$share/{self.group}/{route}" for route in self.routes])
+                self.shared_mids.add(mid)
+            elif self.lease.held:
+                self._subscribe(self.routes)
+        if self.mode == MODE_ELECTED:
+            self._start_election()
+
+    def on_subscribe(self, client: mqtt.Client, mid: int, granted_qos: Any) -> None:
+        if mid not in self.shared_mids:
+            return
+        self.shared_mids.discard(mid)
+        if SUBACK_FAILURE not in granted_qos:
+            LOG.info(f"MQTT shared subscription of group {self.group} succeeded")
+            return
+        LOG.warn("MQTT shared subscription is not supported by broker, fallback to elected")
+        with self.lock:
+            client.unsubscribe([f"$share/{self.group}/{route}" for route in self.routes])
+            self.subscribed = False
+            self.mode = MODE_ELECTED
+        self._start_election()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        try:
+            self.lease.release()
+        except Exception as ex:  # noqa
+            LOG.warn(f"Failed to release MQTT consumer lease: {ex}")
+
+    def _subscribe(self, topics: List[str]) -> Any:
+        assert self.client is not None
+        self.subscribed = True
+        return self.client.subscribe([(topic_, 0) for topic_ in topics])
+
+    def _start_election(self) -> None:
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._elect, name="mqtt-election", daemon=True)
+        self.thread.start()
+
+    def _elect(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                held = self.lease.acquire()
+            except Exception as ex:  # noqa
+                LOG.warn(f"Failed to acquire MQTT consumer lease: {ex}")
+                held = False
+            with self.lock:
+                if self.client is not None and held and not self.subscribed:
+                    LOG.info("Elected as MQTT consumer")
+                    self._subscribe(self.routes)
+                elif self.client is not None and not held and self.subscribed:
+                    LOG.warn("No longer the MQTT consumer")
+                    self.client.unsubscribe(self.routes)
+                    self.subscribed = False
+            self.stopped.wait(self.interval)
@@ -16,82 +16,151 @@ from __future__ import annotations
 
 import json
 import os
+import socket
 import time
+from collections import defaultdict
+from datetime import datetime
 from logging import LoggerAdapter
+from typing import Any, DefaultDict, Dict, List
 
 import redis
 from oslo_log import log
-from sqlalchemy.orm import Session
 
-from dandelion import constants, crud, schemas
-from dandelion.db import redis_pool, session
-from dandelion.util import Optional
+from dandelion import constants, crud
+from dandelion.db import lease, redis_pool, retention, rsu_online, session, timeseries
 
 LOG: LoggerAdapter = log.getLogger(__name__)
 
+RSU_ONLINE_CHUNK_SIZE: int = 200
+COMPACT_GRACE: int = 10
+LEGACY_RUNNING_PREFIX: str = "RSU_RUNNING_"
+LEGACY_RUNNING_MIGRATED_KEY: str = "RSU_RUNNING_LEGACY_MIGRATED"
 
+
+@lease.leader_only("update_rsu_online_status", ttl=90)
 def update_rsu_online_status() -> None:
+    """Reconcile the online status with the online keys.
+
+    RSUs are marked offline as soon as their online key expires, this catches
+    the expirations missed while no worker was watching.
+    """
     LOG.info("Updating RSU online status...")
-    db: Session = session.DB_SESSION_LOCAL()
     redis_conn: redis.Redis = redis_pool.REDIS_CONN
-
-    _, online_rsus = crud.rsu.get_multi_with_total(db, online_status=True)
-    LOG.debug(f"Found {len(online_rsus)} online RSUs")
-    for rsu in online_rsus:
-        if redis_conn.get(f"RSU_ONLINE_{rsu.rsu_esn}"):
-            continue
+    with session.session_scope() as db:
+        online_esns = crud.rsu.get_rsu_esns(db, online_status=True)
+    LOG.debug(f"Found {len(online_esns)} online RSUs")
+    count = 0
+    for index in range(0, len(online_esns), RSU_ONLINE_CHUNK_SIZE):
         try:
-            crud.rsu.update_online_status(
-                db, db_obj=rsu, obj_in=schemas.RSUUpdateWithStatus(onlineStatus=False)
+            count += rsu_online.mark_offline(
+                redis_conn, online_esns[index : index + RSU_ONLINE_CHUNK_SIZE]
             )
         except Exception as ex:
-            LOG.warn(f"Failed to update RSU [rsu_esn: {rsu.rsu_esn}] online status: {ex}")
+            LOG.warn(f"Failed to update RSU online status: {ex}")
+    if count:
+        LOG.warn(f"{count} offline RSUs missed by the online keys expiration watch")
+
+
+@lease.leader_only("flush_rsu_last_seen", ttl=90, fenced=True)
+def flush_rsu_last_seen(lease_: lease.Lease) -> None:
+    # A superseded holder cannot drain the last seen times, nor write them
+    with lease_.fenced_pipeline() as pipe:
+        pipe.hgetall(constants.RSU_LAST_SEEN_KEY)
+        pipe.delete(constants.RSU_LAST_SEEN_KEY)
+        last_seen, _ = pipe.execute()
+    if not last_seen:
+        return
+    LOG.info(f"Flushing last seen time of {len(last_seen)} RSUs...")
+    with session.session_scope() as db:
+        crud.rsu.update_last_seen(
+            db,
+            last_seen={
+                esn.decode("utf-8"): datetime.utcfromtimestamp(float(seen))
+                for esn, seen in last_seen.items()
+            },
+        )
+
+
+@lease.leader_only("compact_rsu_running", ttl=60 * 3, fenced=True)
+def compact_rsu_running(lease_: lease.Lease) -> None:
+    redis_conn: redis.Redis = redis_pool.REDIS_CONN
+    with session.session_scope() as db:
+        rsu_esns = crud.rsu.get_rsu_esns(db)
+    # Leave time to the samples of the last bucket to be written
+    now = int(time.time()) - COMPACT_GRACE
+    timeseries.compact_tiers(redis_conn, rsu_esns, now, lease_.fenced_pipeline)
 
 
-def rsu_info():
-    LOG.info("RSU Running Info...")
-    db: Session = session.DB_SESSION_LOCAL()
+@lease.leader_only("migrate_legacy_rsu_running", ttl=60 * 10, fenced=True)
+def migrate_legacy_rsu_running(lease_: lease.Lease) -> None:
+    """Convert the sorted sets the RSU running info was sampled into before.
+
+    Their samples are written into the tiers still holding their time, then
+    the sets are deleted. Done once, a marker key records the migration.
+    """
     redis_conn: redis.Redis = redis_pool.REDIS_CONN
-    _, rsus = crud.rsu.get_multi_with_total(db, limit=-1)
-    for rsu in rsus:
-        get_key = f"RSU_RUNNING_INFO_{rsu.rsu_esn}"
-        c_time = int(time.time())
-        cpu_data = json.loads(Optional.none(redis_conn.hget(get_key, "cpu")).orElse("{}"))
-        cpu = dict(
-            time=c_time,
-            uti=Optional.none(cpu_data.get("uti")).map(lambda s: len(s.split(","))).orElse(0),
-            load=cpu_data.get("load", 0),
+    if redis_conn.exists(LEGACY_RUNNING_MIGRATED_KEY):
+        return
+    LOG.info("Migrating legacy RSU running info...")
+    now = int(time.time())
+    prefix = f"{LEGACY_RUNNING_PREFIX}CPU_"
+    count = 0
+    for key in redis_conn.scan_iter(match=f"{prefix}*", count=1000):
+        rsu_esn = key.decode("utf-8")[len(prefix) :]
+        keys = [
+            f"{LEGACY_RUNNING_PREFIX}{name}_{rsu_esn}" for name in ("CPU", "MEM", "DISK", "NET")
+        ]
+        pipe = redis_conn.pipeline(transaction=False)
+        for key_ in keys:
+            pipe.zrange(key_, 0, -1)
+        samples = _legacy_samples(*pipe.execute())
+        with lease_.fenced_pipeline() as pipe:
+            timeseries.backfill(pipe, rsu_esn, samples, now)
+            pipe.unlink(*keys)
+            pipe.execute()
+        count += 1
+    with lease_.fenced_pipeline() as pipe:
+        pipe.set(LEGACY_RUNNING_MIGRATED_KEY, now)
+        pipe.execute()
+    LOG.info(f"Migrated legacy running info of {count} RSUs")
+
+
+def _legacy_samples(
+    cpus: List[bytes], mems: List[bytes], disks: List[bytes], nets: List[bytes]
+) -> List[timeseries.Sample]:
+    """Samples of the legacy sorted sets, by time."""
+    fields: DefaultDict[int, Dict[str, Any]] = defaultdict(dict)
+    for values, names in (
+        (cpus, dict(uti="cpu_uti", load="cpu_load")),
+        (mems, dict(total="mem_total", used="mem_used")),
+        (disks, dict(read="disk_read", write="disk_write")),
+        (nets, dict(rxByte="net_rx", wxByte="net_tx")),
+    ):
+        for value in values:
+            data = json.loads(value)
+            sample = fields[int(data["time"])]
+            for legacy, name in names.items():
+                sample[name] = float(data.get(legacy) or 0)
+    return [
+        timeseries.Sample(
+            time=c_time, **{metric: sample.get(metric, 0.0) for metric in timeseries.METRICS}
         )
-        mem_data = json.loads(Optional.none(redis_conn.hget(get_key, "mem")).orElse("{}"))
-        mem = dict(time=c_time, total=mem_data.get("total", 0), used=mem_data.get("used", 0))
-        net_data = json.loads(Optional.none(redis_conn.hget(get_key, "net")).orElse("{}"))
-        net = dict(time=c_time, rxByte=net_data.get("rxByte", 0), wxByte=net_data.get("wxByte", 0))
-        disk_data = json.loads(Optional.none(redis_conn.hget(get_key, "disk")).orElse("{}"))
-        disk = dict(time=c_time, read=disk_data.get("read", 0), write=disk_data.get("write", 0))
-
-        cpu_key = f"RSU_RUNNING_CPU_{rsu.rsu_esn}"
-        redis_conn.zadd(cpu_key, {json.dumps(cpu): c_time})
-        mem_key = f"RSU_RUNNING_MEM_{rsu.rsu_esn}"
-        redis_conn.zadd(mem_key, {json.dumps(mem): c_time})
-        disk_key = f"RSU_RUNNING_DISK_{rsu.rsu_esn}"
-        redis_conn.zadd(disk_key, {json.dumps(disk): c_time})
-        net_key = f"RSU_RUNNING_NET_{rsu.rsu_esn}"
-        redis_conn.zadd(net_key, {json.dumps(net): c_time})
-
-        if redis_conn.zcard(cpu_key) > 1000:
-            redis_conn.zremrangebyrank(cpu_key, min=1, max=1)
-        if redis_conn.zcard(mem_key) > 1000:
-            redis_conn.zremrangebyrank(mem_key, min=1, max=1)
-        if redis_conn.zcard(disk_key) > 1000:
-            redis_conn.zremrangebyrank(disk_key, min=1, max=1)
-        if redis_conn.zcard(net_key) > 1000:
-            redis_conn.zremrangebyrank(net_key, min=1, max=1)
+        for c_time, sample in sorted(fields.items())
+    ]
+
+
+@lease.leader_only("purge_expired_events", ttl=60 * 5)
+def purge_expired_events() -> None:
+    LOG.info("Purging expired events...")
+    retention.purge_expired()
 
 
+# Bitmaps are stored on the local file system, elect one process per host
+@lease.leader_only(f"delete_unused_bitmap_{socket.gethostname()}", ttl=60 * 60 * 36)
 def delete_unused_bitmap() -> None:
     LOG.info("Bitmap delete...")
-    db: Session = session.DB_SESSION_LOCAL()
-    bitmaps = crud.map.get_list_bitmap(db)
+    with session.session_scope() as db:
+        bitmaps = crud.map.get_list_bitmap(db)
     bitmaps_set = {bitmap.bitmap_filename for bitmap in bitmaps}
     for filename in os.listdir(constants.BITMAP_FILE_PATH):
         if filename != "map_bg.jpg" and filename not in bitmaps_set:
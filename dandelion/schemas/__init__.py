@@ -52,6 +52,7 @@ from .lidar import Lidar, LidarCreate, Lidars, LidarUpdate
 from .map import Map, MapCreate, Maps, MapUpdate
 from .map_rsu import MapRSU, MapRSUCreate, MapRSUs, MapRSUUpdate
 from .message import ErrorMessage, Message
+from .metric import Metrics
 from .mng import MNG, MNGCopy, MNGCreate, MNGs, MNGUpdate
 from .osw import OSW, OSWCreate, OSWs, OSWUpdate
 from .province import Province, ProvinceCreate, ProvinceUpdate
@@ -72,8 +73,11 @@ from .rsm_participant import (
 )
 from .rsu import (
     RSU,
+    FleetOutlier,
+    FleetStats,
     RSUCreate,
     RSUDetail,
+    RSUFleetRunning,
     RSULocation,
     RSURunning,
     RSUs,
@@ -81,10 +85,12 @@ from .rsu import (
     RSUUpdateWithBaseInfo,
     RSUUpdateWithStatus,
     RSUUpdateWithVersion,
+    RunningBucket,
     RunningCPU,
     RunningDisk,
     RunningMEM,
     RunningNet,
+    RunningStats,
 )
 from .rsu_config import RSUConfig, RSUConfigCreate, RSUConfigs, RSUConfigUpdate, RSUConfigWithRSUs
 from .rsu_config_rsu import RSUConfigRSU, RSUConfigRSUCreate, RSUConfigRSUs, RSUConfigRSUUpdate
@@ -77,4 +77,7 @@ class Camera(CameraInDBBase):
 
 class Cameras(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[Camera] = Field(..., alias="data", description="Data")
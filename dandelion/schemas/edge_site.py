@@ -79,4 +79,7 @@ class EdgeSite(EdgeSiteInDBBase):
 
 class EdgeSites(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[EdgeSite] = Field(..., alias="data", description="Data")
@@ -87,4 +87,7 @@ class Lidar(LidarInDBBase):
 
 class Lidars(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[Lidar] = Field(..., alias="data", description="Data")
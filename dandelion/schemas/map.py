@@ -60,4 +60,7 @@ class Map(MapInDBBase):
 
 class Maps(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[Map] = Field(..., alias="data", description="Data")
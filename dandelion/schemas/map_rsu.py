@@ -66,4 +66,7 @@ class MapRSUsBase(MapRSUInDBBase):
 
 class MapRSUs(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[MapRSUsBase] = Field(..., alias="data", description="Data")
@@ -0,0 +1,25 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class Metrics(BaseModel):
+    pid: int = Field(..., alias="pid", description="Process ID")
+    metrics: Dict[str, Any] = Field(..., alias="metrics", description="Metrics")
@@ -81,6 +81,9 @@ class MNG(MNGInDBBase):
 
 class MNGs(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[MNG] = Field(..., alias="data", description="Data")
 
 
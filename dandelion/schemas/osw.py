@@ -56,5 +56,13 @@ class OSW(OSWInDBBase):
 
 
 class OSWs(BaseModel):
-    total: int = Field(..., alias="total", description="Total")
+    total: Optional[int] = Field(
+        None, alias="total", description="Total, not counted when paging with a cursor"
+    )
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[OSW] = Field(..., alias="data", description="Data")
+    next_cursor: Optional[str] = Field(
+        None, alias="nextCursor", description="Cursor of the next page"
+    )
@@ -78,4 +78,7 @@ class Radar(RadarInDBBase):
 
 class Radars(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[Radar] = Field(..., alias="data", description="Data")
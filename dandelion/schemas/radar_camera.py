@@ -83,4 +83,7 @@ class RadarCamera(RadarCameraInDBBase):
 
 class RadarCameras(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RadarCamera] = Field(..., alias="data", description="Data")
@@ -77,5 +77,13 @@ class RSICWM(RSICWMInDBBase):
 
 
 class RSICWMs(BaseModel):
-    total: int = Field(..., alias="total", description="Total")
+    total: Optional[int] = Field(
+        None, alias="total", description="Total, not counted when paging with a cursor"
+    )
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSICWM] = Field(..., alias="data", description="Data")
+    next_cursor: Optional[str] = Field(
+        None, alias="nextCursor", description="Cursor of the next page"
+    )
@@ -187,13 +187,68 @@ class RunningNet(BaseModel):
     write: Optional[float] = Field(None, alias="write", description="Net Write")
 
 
+class RunningStats(BaseModel):
+    min: float = Field(..., alias="min", description="Minimum")
+    max: float = Field(..., alias="max", description="Maximum")
+    avg: float = Field(..., alias="avg", description="Average")
+    p95: float = Field(..., alias="p95", description="95th percentile")
+
+
+class RunningBucket(BaseModel):
+    time: int = Field(..., alias="time", description="Start time of the bucket")
+    count: int = Field(..., alias="count", description="Number of samples in the bucket")
+    cpu_uti: RunningStats = Field(..., alias="cpuUti", description="CPU UTI")
+    cpu_load: RunningStats = Field(..., alias="cpuLoad", description="CPU Load")
+    mem_total: RunningStats = Field(..., alias="memTotal", description="MEM Total")
+    mem_used: RunningStats = Field(..., alias="memUsed", description="MEM Used")
+    net_rx: RunningStats = Field(..., alias="netRx", description="Net RXByte")
+    net_tx: RunningStats = Field(..., alias="netTx", description="Net WXByte")
+    disk_read: RunningStats = Field(..., alias="diskRead", description="Disk Read")
+    disk_write: RunningStats = Field(..., alias="diskWrite", description="Disk Write")
+
+
 class RSURunning(BaseModel):
     cpu: Optional[List[RunningCPU]] = Field(None, alias="cpu", description="CPU Info")
     mem: Optional[List[RunningMEM]] = Field(None, alias="mem", description="MEM Info")
     disk: Optional[List[RunningDisk]] = Field(None, alias="disk", description="Disk Info")
     net: Optional[List[RunningNet]] = Field(None, alias="net", description="NET Info")
+    step: Optional[int] = Field(None, alias="step", description="Seconds of every bucket")
+    buckets: Optional[List[RunningBucket]] = Field(
+        None, alias="buckets", description="Statistics of every bucket"
+    )
+
+
+class FleetOutlier(BaseModel):
+    id: int = Field(..., alias="id", description="RSU ID")
+    rsu_esn: str = Field(..., alias="rsuEsn", description="RSU ESN")
+    rsu_name: str = Field(..., alias="rsuName", description="RSU Name")
+    value: float = Field(..., alias="value", description="Average over the window")
+
+
+class FleetStats(BaseModel):
+    min: float = Field(..., alias="min", description="Minimum")
+    max: float = Field(..., alias="max", description="Maximum")
+    avg: float = Field(..., alias="avg", description="Average")
+    p50: float = Field(..., alias="p50", description="Median")
+    p95: float = Field(..., alias="p95", description="95th percentile")
+    outliers: List[FleetOutlier] = Field(
+        ..., alias="outliers", description="RSUs beyond 1.5 IQR above the third quartile"
+    )
+
+
+class RSUFleetRunning(BaseModel):
+    start: int = Field(..., alias="start", description="Start timestamp")
+    end: int = Field(..., alias="end", description="End timestamp")
+    total: int = Field(..., alias="total", description="Number of RSUs matching the filters")
+    sampled: int = Field(..., alias="sampled", description="Number of RSUs with samples")
+    stats: Dict[str, FleetStats] = Field(
+        ..., alias="stats", description="Statistics of the RSU averages of every metric"
+    )
 
 
 class RSUs(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSU] = Field(..., alias="data", description="Data")
@@ -127,4 +127,7 @@ class RSUConfigWithRSUs(RSUConfig):
 
 class RSUConfigs(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSUConfig] = Field(..., alias="data", description="Data")
@@ -77,4 +77,7 @@ class RSULog(RSULogInDBBase):
 
 class RSULogs(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSULog] = Field(..., alias="data", description="Data")
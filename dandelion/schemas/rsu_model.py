@@ -56,4 +56,7 @@ class RSUModel(RSUModelInDBBase):
 
 class RSUModels(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSUModel] = Field(..., alias="data", description="Data")
@@ -75,4 +75,7 @@ class RSUQuery(RSUQueryInDBBase):
 
 class RSUQueries(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSUQuery] = Field(..., alias="data", description="Data")
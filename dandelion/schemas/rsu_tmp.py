@@ -59,4 +59,7 @@ class RSUTMP(RSUTMPInDBBase):
 
 class RSUTMPs(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[RSUTMP] = Field(..., alias="data", description="Data")
@@ -78,4 +78,7 @@ class Spat(SpatInDBBase):
 
 class Spats(BaseModel):
     total: int = Field(..., alias="total", description="Total")
+    total_exact: bool = Field(
+        True, alias="totalExact", description="Whether total is exact rather than estimated"
+    )
     data: List[Spat] = Field(..., alias="data", description="Data")
@@ -4,3 +4,8 @@ from enum import Enum
 class Sort(str, Enum):
     asc = "asc"
     desc = "desc"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
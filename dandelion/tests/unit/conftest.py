@@ -0,0 +1,60 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import fakeredis
+import pytest
+from oslo_config import cfg
+from sqlalchemy.orm import Session
+
+import dandelion.models  # noqa
+from dandelion import conf
+from dandelion.db import redis_pool, session
+from dandelion.db.base_class import Base
+
+CONF: cfg = conf.CONF
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_conf(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    CONF([], project="dandelion")
+    database = tmp_path_factory.mktemp("db") / "dandelion.db"
+    CONF.set_override("connection", f"sqlite:///{database}", group="database")
+    # Totals are counted on every call, so that query counts do not depend on the cache
+    CONF.set_override("count_cache_ttl", 0, group="database")
+    session.setup_db()
+    session.setup_async_db()
+    yield
+    CONF.reset()
+
+
+@pytest.fixture
+def redis_conn() -> Iterator[fakeredis.FakeStrictRedis]:
+    redis_pool.REDIS_CONN = fakeredis.FakeStrictRedis()
+    yield redis_pool.REDIS_CONN
+    redis_pool.REDIS_CONN.flushall()
+
+
+@pytest.fixture
+def db(redis_conn: fakeredis.FakeStrictRedis) -> Iterator[Session]:
+    engine = session.DB_SESSION_LOCAL.kw["bind"]
+    Base.metadata.create_all(engine)
+    db_ = session.DB_SESSION_LOCAL()
+    yield db_
+    db_.close()
+    Base.metadata.drop_all(engine)
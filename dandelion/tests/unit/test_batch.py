@@ -0,0 +1,39 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from dandelion import models
+from dandelion.db import batch
+
+
+def test_flush_skips_failing_rows(db: Session) -> None:
+    db.add(models.RSUModel(name="model_3", manufacturer="", desc=""))
+    db.commit()
+    failed_rows = batch.BATCH_FAILED_ROWS.value
+
+    # model_3 already exists, and model_7 is duplicated within the batch
+    names = ["model_0", "model_1", "model_2", "model_3", "model_4", "model_5", "model_6"]
+    names += ["model_7", "model_7"]
+    batch.BulkWriter.flush(
+        {models.RSUModel: [(dict(name=name, manufacturer="", desc=""), None) for name in names]}
+    )
+
+    assert sorted(name for name, in db.query(models.RSUModel.name)) == [
+        f"model_{index}" for index in range(8)
+    ]
+    assert batch.BATCH_FAILED_ROWS.value == failed_rows + 2
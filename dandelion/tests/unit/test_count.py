@@ -0,0 +1,56 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import fakeredis
+import pytest
+from oslo_config import cfg
+from sqlalchemy.orm import Session
+
+from dandelion import crud, models
+
+CONF: cfg = cfg.CONF
+
+
+@pytest.fixture
+def count_cache() -> Iterator[None]:
+    CONF.set_override("count_cache_ttl", 60, group="database")
+    yield
+    CONF.clear_override("count_cache_ttl", group="database")
+
+
+def test_count(db: Session) -> None:
+    db.add_all(
+        models.RSUModel(name=f"model_{index}", manufacturer="", desc="") for index in range(3)
+    )
+    db.commit()
+    assert crud.rsu_model.get_multi_with_total(db, limit=2)[:2] == (3, True)
+
+
+def test_count_cached(
+    db: Session, redis_conn: fakeredis.FakeStrictRedis, count_cache: None
+) -> None:
+    query_ = db.query(models.RSUModel)
+    assert crud.rsu_model.count(query_) == (0, True)
+    # Estimated totals are cached with their exactness
+    (key,) = redis_conn.keys("COUNT_rsu_model_*")
+    cached = redis_conn.get(key)
+    assert cached is not None
+    stamp = cached.decode("utf-8").split(":")[0]
+    redis_conn.set(key, f"{stamp}:1000:0")
+    assert crud.rsu_model.count(query_) == (1000, False)
@@ -0,0 +1,80 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from dandelion import crud, models
+from dandelion.api import deps
+from dandelion.core import security
+from dandelion.db import session
+from dandelion.db.base_class import Base
+from dandelion.tests.utils import count_queries
+
+
+@pytest.fixture
+def stale_replica(db: Session, tmp_path: Path) -> Iterator[None]:
+    """Replica which has not replicated any row yet."""
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(replica)
+    primary = session.DB_SESSION_LOCAL.kw["bind"]
+    session.REPLICAS[primary] = [replica]
+    yield
+    del session.REPLICAS[primary]
+    replica.dispose()
+
+
+def _request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+@pytest.mark.parametrize("method, found", [("GET", False), ("PATCH", True), ("DELETE", True)])
+def test_crud_get(db: Session, stale_replica: None, method: str, found: bool) -> None:
+    rsu_model = models.RSUModel(name="model", manufacturer="", desc="")
+    db.add(rsu_model)
+    db.commit()
+
+    request_db = next(deps.get_db(_request(method)))
+    try:
+        if found:
+            assert deps.crud_get(request_db, rsu_model.id, crud.rsu_model, "RSU Model")
+        else:
+            with pytest.raises(deps.OpenV2XHTTPException):
+                deps.crud_get(request_db, rsu_model.id, crud.rsu_model, "RSU Model")
+    finally:
+        request_db.close()
+
+
+def test_get_async_current_user(db: Session) -> None:
+    user = models.User(username="user", hashed_password="", is_active=True)
+    db.add(user)
+    db.commit()
+    token = security.create_access_token(user.id)
+
+    async def _get_user() -> models.User:
+        async with session.ASYNC_SESSION_LOCAL() as async_db:
+            return await deps.get_async_current_user(db=async_db, token=token)
+
+    # Read on the async session only
+    with count_queries(maximum=0):
+        assert asyncio.run(_get_user()).id == user.id
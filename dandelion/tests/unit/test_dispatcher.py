@@ -0,0 +1,58 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, Optional
+
+import paho.mqtt.client as mqtt
+import pytest
+
+from dandelion.mqtt import dispatcher
+from dandelion.mqtt.service import RouterHandler
+
+
+class FailingRouterHandler(RouterHandler):
+    def handler(self, client: mqtt.MQTT_CLIENT, topic: str, data: Dict[str, Any]) -> None:
+        raise ValueError(f"Invalid message of RSU {data['rsuEsn']}")
+
+
+def _message() -> mqtt.MQTTMessage:
+    message = mqtt.MQTTMessage(topic=b"V2X/RSU/INFO/UP")
+    message.payload = json.dumps(dict(rsuEsn="esn")).encode("utf-8")
+    return message
+
+
+@pytest.fixture(params=[None, 2], ids=["inline", "workers"])
+def workers(request: Any) -> Iterator[Optional[int]]:
+    if request.param is not None:
+        dispatcher.DISPATCHER = dispatcher.Dispatcher(request.param, 10)
+        dispatcher.DISPATCHER.start()
+    yield request.param
+    dispatcher.stop_dispatcher()
+
+
+def test_failing_handler(workers: Optional[int]) -> None:
+    failed = dispatcher.DISPATCH_FAILED.value
+    processed = dispatcher.DISPATCH_PROCESSED.value
+
+    FailingRouterHandler().request(None, {}, _message())
+    if dispatcher.DISPATCHER is not None:
+        # Handled before the workers stop
+        dispatcher.stop_dispatcher()
+
+    assert dispatcher.DISPATCH_FAILED.value == failed + 1
+    assert dispatcher.DISPATCH_PROCESSED.value == processed + 1
@@ -0,0 +1,71 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import List
+
+import fakeredis
+import pytest
+import redis
+
+from dandelion.db import lease
+
+
+def test_fenced_pipeline(redis_conn: fakeredis.FakeStrictRedis) -> None:
+    old = lease.Lease("test", ttl=10)
+    assert old.acquire()
+    with old.fenced_pipeline() as pipe:
+        pipe.set("key", "old")
+        pipe.execute()
+    assert redis_conn.get("key") == b"old"
+
+    # Superseded after missing a renewal
+    redis_conn.delete(old.key)
+    new = lease.Lease("test", ttl=10)
+    assert new.acquire()
+    assert new.fence > old.fence
+    with pytest.raises(lease.LeaseLost):
+        old.fenced_pipeline()
+
+    # Superseded between the watch and the write
+    pipe = new.fenced_pipeline()
+    pipe.set("key", "new")
+    redis_conn.incr(new.fence_key)
+    with pytest.raises(redis.WatchError):
+        pipe.execute()
+    assert redis_conn.get("key") == b"old"
+
+
+def test_leader_only_fenced(redis_conn: fakeredis.FakeStrictRedis) -> None:
+    writes: List[int] = []
+
+    @lease.leader_only("test_fenced", ttl=10, fenced=True)
+    def task(lease_: lease.Lease, value: int) -> int:
+        with lease_.fenced_pipeline() as pipe:
+            pipe.set("key", value)
+            pipe.execute()
+        writes.append(value)
+        # Another process takes over
+        redis_conn.incr(lease_.fence_key)
+        with lease_.fenced_pipeline() as pipe:
+            pipe.set("key", value + 1)
+            pipe.execute()
+        writes.append(value + 1)
+        return value
+
+    assert task(1) is None
+    assert writes == [1]
+    assert redis_conn.get("key") == b"1"
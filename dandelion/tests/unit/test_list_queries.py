@@ -0,0 +1,287 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy.orm import Session
+
+from dandelion import models
+from dandelion.api.api_v1.endpoints import (
+    cameras,
+    edge_site,
+    lidars,
+    map_rsus,
+    maps,
+    mngs,
+    radar_cameras,
+    radars,
+    rsi_events,
+    rsm_participants,
+    rsu_logs,
+    rsu_queries,
+    rsus,
+    spats,
+)
+from dandelion.schemas.utils import Sort
+from dandelion.tests.utils import count_queries
+
+PAGE_SIZE = 20
+
+
+def _create_rsus(db: Session, count: int) -> None:
+    rsu_model = models.RSUModel(name="model", manufacturer="manufacturer", desc="")
+    for index in range(count):
+        rsu = models.RSU(
+            rsu_id=f"rsu_id_{index}",
+            rsu_esn=f"rsu_esn_{index}",
+            rsu_name=f"rsu_name_{index}",
+            rsu_ip="127.0.0.1",
+            version="v1",
+            rsu_status="Normal",
+            location={"lon": 0, "lat": 0},
+            config={},
+            rsu_model=rsu_model,
+        )
+        db.add(rsu)
+        db.add(
+            models.MNG(
+                rsu=rsu,
+                address_change={"cssUrl": "", "time": 0},
+                log_level="INFO",
+                reboot=models.mng.Reboot.not_reboot,
+                extend_config="",
+            )
+        )
+    db.commit()
+
+
+def test_rsi_events(db: Session) -> None:
+    _create_rsus(db, PAGE_SIZE)
+    for rsu in db.query(models.RSU):
+        db.add(
+            models.RSIEvent(
+                rsu=rsu,
+                event_class=models.rsi_event.EventClass.AbnormalTraffic,
+                event_type=1,
+                event_source=models.rsi_event.EventSource.detection,
+            )
+        )
+    db.commit()
+    db.expunge_all()
+    # The total and the page joined with the RSUs
+    with count_queries(maximum=2):
+        events = rsi_events._get_all(db, skip=0, limit=PAGE_SIZE, after=None, sort=Sort.desc)
+    assert len(events.data) == PAGE_SIZE
+    assert all(event.rsu_name for event in events.data)
+
+
+def test_rsus(db: Session) -> None:
+    _create_rsus(db, PAGE_SIZE)
+    db.expunge_all()
+    # The total and the page joined with the RSU models
+    with count_queries(maximum=2):
+        rsus_ = rsus._get_all(db, skip=0, limit=PAGE_SIZE)
+    assert len(rsus_.data) == PAGE_SIZE
+
+
+def test_mngs(db: Session) -> None:
+    _create_rsus(db, PAGE_SIZE)
+    db.expunge_all()
+    # The total, the page of RSUs and their MNGs
+    with count_queries(maximum=3):
+        mngs_ = mngs.get_all(
+            rsu_name=None,
+            rsu_esn=None,
+            page_num=1,
+            page_size=PAGE_SIZE,
+            db=db,
+            current_user=models.User(),
+        )
+    assert len(mngs_.data) == PAGE_SIZE
+
+
+def test_rsm_participants(db: Session) -> None:
+    for index in range(PAGE_SIZE):
+        db.add(
+            models.Participants(
+                ptc_type=models.rsm_participants.PtcType.motor,
+                ptc_id=index,
+                source=1,
+                sec_mark=0,
+                pos={"lon": 0, "lat": 0},
+                speed=0,
+                heading=0,
+                size={},
+            )
+        )
+    db.commit()
+    db.expunge_all()
+    # The total and the page
+    with count_queries(maximum=2):
+        participants = rsm_participants._get_all(
+            db, skip=0, limit=PAGE_SIZE, after=None, sort=Sort.desc
+        )
+    assert len(participants.data) == PAGE_SIZE
+
+
+def test_maps(db: Session) -> None:
+    _create_rsus(db, 2)
+    for index in range(PAGE_SIZE):
+        db.add(
+            models.Map(
+                name=f"map_{index}",
+                rsus=[models.MapRSU(rsu=rsu) for rsu in db.query(models.RSU)],
+            )
+        )
+    db.commit()
+    db.expunge_all()
+    # The total, the page and the RSUs of the maps
+    with count_queries(maximum=3):
+        maps_ = maps._get_all(db, skip=0, limit=PAGE_SIZE, name=None)
+    assert len(maps_.data) == PAGE_SIZE
+    assert all(map_.amount == 2 for map_ in maps_.data)
+
+
+def test_map_rsus(db: Session) -> None:
+    _create_rsus(db, PAGE_SIZE)
+    map_ = models.Map(name="map", rsus=[models.MapRSU(rsu=rsu) for rsu in db.query(models.RSU)])
+    db.add(map_)
+    db.commit()
+    map_id = map_.id
+    db.expunge_all()
+    # The total and the page joined with the RSUs
+    with count_queries(maximum=2):
+        map_rsus_ = map_rsus.get_all(
+            map_id=map_id, page_num=1, page_size=PAGE_SIZE, db=db, current_user=models.User()
+        )
+    assert len(map_rsus_.data) == PAGE_SIZE
+
+
+def _create_devices(db: Session) -> None:
+    _create_rsus(db, PAGE_SIZE)
+    for index, rsu in enumerate(db.query(models.RSU)):
+        location = dict(lng=0, lat=0, elevation=0, towards=0)
+        db.add(models.Camera(sn=f"sn_{index}", name=f"name_{index}", rsu=rsu, **location))
+        db.add(models.Radar(sn=f"sn_{index}", name=f"name_{index}", rsu=rsu, **location))
+        db.add(
+            models.Lidar(
+                sn=f"sn_{index}", name=f"name_{index}", point="", pole="", rsu=rsu, **location
+            )
+        )
+        db.add(
+            models.RadarCamera(
+                sn=f"sn_{index}",
+                name=f"name_{index}",
+                point="",
+                pole="",
+                video_stream_address="",
+                rsu=rsu,
+                **location,
+            )
+        )
+        db.add(models.Spat(intersection_id="", name=f"name_{index}", phase_id=f"{index}", rsu=rsu))
+    db.commit()
+    db.expunge_all()
+
+
+def test_devices(db: Session) -> None:
+    _create_devices(db)
+    filters: Dict[str, Any] = dict(name=None, rsu_id=None, page_num=1, page_size=PAGE_SIZE)
+    # The total and the page joined with the RSUs
+    extras: Tuple[Tuple[Callable[..., Any], Dict[str, Any]], ...] = (
+        (cameras.get_all, dict(sn=None)),
+        (radars.get_all, dict(sn=None)),
+        (lidars.get_all, dict(sn=None)),
+        (radar_cameras.get_all, dict(sn=None)),
+        (spats.get_all, dict(intersection_id=None)),
+    )
+    for get_all, extra in extras:
+        with count_queries(maximum=2):
+            devices = get_all(**filters, **extra, db=db, current_user=models.User())
+        assert len(devices.data) == PAGE_SIZE
+
+
+def test_rsu_logs(db: Session) -> None:
+    _create_rsus(db, 2)
+    for index in range(PAGE_SIZE):
+        db.add(
+            models.RSULog(
+                upload_url="",
+                user_id="",
+                password="",
+                transprotocal="http",
+                rsus=db.query(models.RSU).all(),
+            )
+        )
+        db.flush()
+    db.commit()
+    db.expunge_all()
+    # The total, the page and the RSUs of the logs
+    with count_queries(maximum=3):
+        rsu_logs_ = rsu_logs.get_all(
+            page_num=1, page_size=PAGE_SIZE, db=db, current_user=models.User()
+        )
+    assert len(rsu_logs_.data) == PAGE_SIZE
+
+
+def test_rsu_queries(db: Session) -> None:
+    # The list joins the results, one per query so that the page holds every query
+    _create_rsus(db, 1)
+    for index in range(PAGE_SIZE):
+        db.add(
+            models.RSUQuery(
+                query_type=0,
+                time_type=0,
+                results=[
+                    models.RSUQueryResult(rsu=rsu, data=[models.RSUQueryResultData(data={})])
+                    for rsu in db.query(models.RSU)
+                ],
+            )
+        )
+    db.commit()
+    db.expunge_all()
+    # The total, the page, the results joined with their RSUs, and their data
+    with count_queries(maximum=4):
+        rsu_queries_ = rsu_queries.get_all(
+            rsu_id=None, page_num=1, page_size=PAGE_SIZE, db=db, current_user=models.User()
+        )
+    assert len(rsu_queries_.data) == PAGE_SIZE
+
+
+def test_edge_sites(db: Session) -> None:
+    country = models.Country(code="country", name="country")
+    province = models.Province(code="province", name="province", country=country)
+    city = models.City(code="city", name="city", province=province)
+    area = models.Area(code="area", name="area", city=city)
+    for index in range(PAGE_SIZE):
+        db.add(
+            models.EdgeSite(
+                name=f"name_{index}",
+                edge_site_dandelion_endpoint=f"http://127.0.0.{index}:28300",
+                area=area,
+            )
+        )
+    db.commit()
+    db.expunge_all()
+    filters: Dict[str, Any] = dict(name=None, area_code=None)
+    # The total and the page joined with the areas up to the countries
+    with count_queries(maximum=2):
+        edge_sites = edge_site.get_all(
+            **filters, page_num=1, page_size=PAGE_SIZE, db=db, current_user=models.User()
+        )
+    assert len(edge_sites.data) == PAGE_SIZE
+    assert all(site.country_name == "country" for site in edge_sites.data)
@@ -0,0 +1,60 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import json
+import time
+
+import fakeredis
+
+from dandelion import periodic_tasks
+from dandelion.db import timeseries
+
+
+def test_migrate_legacy_rsu_running(redis_conn: fakeredis.FakeStrictRedis) -> None:
+    now = int(time.time())
+    times = [now - 60 * 60 * 48, now - 60 * 60 * 3, now - 60 * 10]
+    for c_time in times:
+        redis_conn.zadd(
+            "RSU_RUNNING_CPU_esn", {json.dumps(dict(time=c_time, uti=2, load=0.5)): c_time}
+        )
+        redis_conn.zadd(
+            "RSU_RUNNING_MEM_esn", {json.dumps(dict(time=c_time, total=8, used=4)): c_time}
+        )
+        redis_conn.zadd(
+            "RSU_RUNNING_DISK_esn", {json.dumps(dict(time=c_time, read=3, write=4)): c_time}
+        )
+        redis_conn.zadd(
+            "RSU_RUNNING_NET_esn", {json.dumps(dict(time=c_time, rxByte=1, wxByte=2)): c_time}
+        )
+
+    periodic_tasks.migrate_legacy_rsu_running()
+
+    assert not redis_conn.keys("RSU_RUNNING_[CMDN]*_esn")
+    assert redis_conn.exists(periodic_tasks.LEGACY_RUNNING_MIGRATED_KEY)
+    raw = timeseries.read(redis_conn, timeseries.RAW, "esn", times[0] - 60 * 60 * 24, now + 1)
+    assert raw == [timeseries.Sample(times[2], 2, 0.5, 8, 4, 1, 2, 3, 4)]
+    minute = timeseries.read(
+        redis_conn, timeseries.MINUTE, "esn", times[0] - 60 * 60 * 24, now + 1
+    )
+    assert [sample.time for sample in minute] == [c_time - c_time % 60 for c_time in times[1:]]
+    hour = timeseries.read(redis_conn, timeseries.HOUR, "esn", times[0] - 60 * 60 * 24, now + 1)
+    assert [sample.time for sample in hour] == [c_time - c_time % 3600 for c_time in times]
+
+    # Done once
+    redis_conn.zadd("RSU_RUNNING_CPU_esn", {json.dumps(dict(time=now)): now})
+    periodic_tasks.migrate_legacy_rsu_running()
+    assert redis_conn.exists("RSU_RUNNING_CPU_esn")
@@ -0,0 +1,83 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any, List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from dandelion import models
+from dandelion.db import retention
+
+
+def test_purge(db: Session) -> None:
+    now = datetime.utcnow()
+    for days in range(10):
+        db.add(
+            models.RSICLC(
+                msg_id="",
+                sec_mark=0,
+                veh_id="",
+                ref_pos={},
+                drive_suggestion={},
+                info=1,
+                create_time=now - timedelta(days=days),
+            )
+        )
+    db.commit()
+    assert retention.purge(db, models.RSICLC, now - timedelta(days=4, hours=12), 2) == 5
+    assert db.query(models.RSICLC).count() == 5
+
+
+class RecordingSession(object):
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def execute(self, statement: Any) -> None:
+        self.statements.append(str(statement))
+
+    def commit(self) -> None:
+        pass
+
+
+@pytest.fixture
+def today(monkeypatch: pytest.MonkeyPatch) -> date:
+    today_ = date(2022, 6, 10)
+    parts = [
+        (f"p{day:%Y%m%d}", retention.to_days(day + timedelta(days=1)))
+        for day in (today_ - timedelta(days=2), today_ - timedelta(days=1), today_)
+    ]
+    monkeypatch.setattr(retention, "partitions", lambda db, table: parts + [("pmax", None)])
+    return today_
+
+
+def test_maintain_partitions(today: date) -> None:
+    db = RecordingSession()
+    cutoff = datetime.combine(today - timedelta(days=1), datetime.min.time())
+    assert retention.maintain_partitions(db, "rsi_clc", cutoff, today) == 1
+    assert db.statements[0] == "ALTER TABLE rsi_clc DROP PARTITION p20220608"
+    assert db.statements[1].startswith("ALTER TABLE rsi_clc REORGANIZE PARTITION pmax INTO")
+
+
+def test_maintain_partitions_without_retention(today: date) -> None:
+    db = RecordingSession()
+    assert retention.maintain_partitions(db, "rsi_clc", None, today) == 0
+    # Partitions are still created ahead
+    assert len(db.statements) == 1
+    assert db.statements[0].startswith("ALTER TABLE rsi_clc REORGANIZE PARTITION pmax INTO")
+    assert "p20220611" in db.statements[0]
@@ -0,0 +1,73 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import Any, List
+
+import fakeredis
+import pytest
+from sqlalchemy.orm import Session
+
+from dandelion import constants, crud, models
+from dandelion.db import rsu_online
+
+
+def _create_rsu(db: Session, rsu_esn: str) -> None:
+    db.add(
+        models.RSU(
+            rsu_id=rsu_esn,
+            rsu_esn=rsu_esn,
+            rsu_name=rsu_esn,
+            rsu_ip="127.0.0.1",
+            version="v1",
+            rsu_status="Normal",
+            online_status=True,
+            location={"lon": 0, "lat": 0},
+            config={},
+        )
+    )
+    db.commit()
+
+
+def _online_status(db: Session, rsu_esn: str) -> bool:
+    db.expire_all()
+    return db.query(models.RSU.online_status).filter(models.RSU.rsu_esn == rsu_esn).scalar()
+
+
+def test_mark_offline(db: Session, redis_conn: fakeredis.FakeStrictRedis) -> None:
+    _create_rsu(db, "expired")
+    _create_rsu(db, "online")
+    redis_conn.set(f"{constants.RSU_ONLINE_PREFIX}online", 1)
+
+    assert rsu_online.mark_offline(redis_conn, ["expired", "online"]) == 1
+    assert not _online_status(db, "expired")
+    assert _online_status(db, "online")
+
+
+def test_mark_offline_heartbeat_meanwhile(
+    db: Session, redis_conn: fakeredis.FakeStrictRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_rsu(db, "esn")
+    update_offline = crud.rsu.update_offline
+
+    def heartbeat_then_update_offline(db_: Session, *, rsu_esns: List[str]) -> Any:
+        # The heartbeat finds the RSU online in the database, it does not update it
+        redis_conn.set(f"{constants.RSU_ONLINE_PREFIX}esn", 1)
+        return update_offline(db_, rsu_esns=rsu_esns)
+
+    monkeypatch.setattr(crud.rsu, "update_offline", heartbeat_then_update_offline)
+    rsu_online.mark_offline(redis_conn, ["esn"])
+    assert _online_status(db, "esn")
@@ -0,0 +1,88 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import pytest
+
+from dandelion.db import rsu_registry
+from dandelion.db.rsu_registry import RSUEntry, RSURegistry
+
+ENTRY = RSUEntry(1, "rsu_id", True, True)
+
+
+@pytest.fixture
+def queries(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    queried: List[str] = []
+
+    def _query_rsu(rsu_esn: str) -> Optional[RSUEntry]:
+        queried.append(rsu_esn)
+        return ENTRY if rsu_esn == "known" else None
+
+    def _query_tmp(rsu_esn: str) -> bool:
+        queried.append(rsu_esn)
+        return rsu_esn == "tmp"
+
+    monkeypatch.setattr(rsu_registry, "_query_rsu", _query_rsu)
+    monkeypatch.setattr(rsu_registry, "_query_tmp", _query_tmp)
+    return queried
+
+
+def test_get(queries: List[str]) -> None:
+    registry = RSURegistry(negative_ttl=60, negative_size=10)
+    assert registry.get("known") == ENTRY
+    assert registry.get("known") == ENTRY
+    assert registry.get("unknown") is None
+    assert registry.get("unknown") is None
+    assert queries == ["known", "unknown"]
+
+
+def test_negative_ttl(queries: List[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(rsu_registry.time, "monotonic", lambda: now[0])
+    registry = RSURegistry(negative_ttl=60, negative_size=10)
+    assert registry.get("unknown") is None
+    assert registry.is_tmp("unknown") is False
+    now[0] += 61
+    assert registry.get("unknown") is None
+    assert registry.is_tmp("unknown") is False
+    assert queries == ["unknown"] * 4
+
+
+def test_negative_size(queries: List[str]) -> None:
+    registry = RSURegistry(negative_ttl=60, negative_size=10)
+    for index in range(100):
+        registry.get(f"unknown_{index}")
+        registry.is_tmp(f"unknown_{index}")
+    assert len(registry.missing) == 10
+    # The least recently seen are dropped first
+    count = len(queries)
+    registry.get("unknown_99")
+    assert len(queries) == count
+    registry.get("unknown_0")
+    assert len(queries) == count + 1
+
+
+def test_forget(queries: List[str]) -> None:
+    registry = RSURegistry(negative_ttl=60, negative_size=10)
+    assert registry.is_tmp("tmp") is True
+    assert registry.get("unknown") is None
+    registry.forget("tmp")
+    registry.forget("unknown")
+    assert registry.is_tmp("tmp") is True
+    assert registry.get("unknown") is None
+    assert queries == ["tmp", "unknown", "tmp", "unknown"]
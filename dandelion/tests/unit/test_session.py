@@ -0,0 +1,38 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from sqlalchemy.orm import Session
+
+from dandelion.db import session
+
+
+def test_blocking(db: Session) -> None:
+    assert session.blocking(db, threading.get_ident) == threading.get_ident()
+
+
+def test_blocking_async() -> None:
+    async def _run() -> bool:
+        loop_thread = threading.get_ident()
+        async with session.ASYNC_SESSION_LOCAL() as db:
+            thread = await db.run_sync(session.blocking, threading.get_ident)
+        return thread != loop_thread
+
+    # Not run on the thread of the event loop
+    assert asyncio.run(_run())
@@ -0,0 +1,47 @@
+# Copyright 2022 99Cloud, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import event
+
+from dandelion.db import session
+
+
+@contextmanager
+def count_queries(maximum: Optional[int] = None) -> Iterator[List[str]]:
+    """Record the statements run on the database within the block.
+
+    With `maximum`, fail if more statements have been run, so that tests can
+    check the number of queries of a list endpoint does not grow with the page.
+    """
+    statements: List[str] = []
+    engine = session.DB_SESSION_LOCAL.kw["bind"]
+
+    def _record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    if maximum is not None and len(statements) > maximum:
+        raise AssertionError(
+            f"{len(statements)} queries run, expected at most {maximum}:\n" + "\n".join(statements)
+        )
@@ -15,6 +15,8 @@
 from __future__ import annotations
 
 import copy
+import hashlib
+import json
 import re
 from typing import List
 
@@ -102,6 +104,11 @@ def get_version_config():
 
 DEFAULT_VERSION_DATA = get_version_config()
 
+# Changes whenever the algos loaded from the configuration files change
+ALGO_CONFIG_DIGEST = hashlib.sha1(
+    json.dumps([ALGO_CONFIG, DEFAULT_VERSION_DATA], sort_keys=True, default=str).encode("utf-8")
+).hexdigest()
+
 
 def get_all_algo_config(data: List[AlgoName]):
     response_data = copy.deepcopy(ALGO_CONFIG)